@@ -1,8 +1,12 @@
 
 import os
 import re
+import sys
 import glob
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+from file_cache import FileCache
+
 # Patterns from apply_theme_tokens.py
 COLOR_PATTERNS = [
     r'\bbg-white\b',
@@ -17,8 +21,9 @@ COLOR_PATTERNS = [
 
 def analyze_file(filepath):
     with open(filepath, 'r') as f:
-        content = f.read()
+        return analyze_content(f.read())
 
+def analyze_content(content):
     score = 0
     issues = []
 
@@ -48,13 +53,16 @@ def main():
     root_dir = '/workspaces/lexiflow-premium/frontend/src'
     results = []
 
-    for filepath in glob.glob(f'{root_dir}/**/*.tsx', recursive=True):
-        if 'node_modules' in filepath:
-            continue
+    # Per-file results are cached by content hash; unchanged files are not re-read
+    with FileCache() as cache:
+        version = cache.source_version(__file__)
+        for filepath in glob.glob(f'{root_dir}/**/*.tsx', recursive=True):
+            if 'node_modules' in filepath:
+                continue
 
-        score, issues = analyze_file(filepath)
-        if score > 0:
-            results.append((score, filepath, issues))
+            score, issues = cache.cached('migration-targets', version, filepath, analyze_content)
+            if score > 0:
+                results.append((score, filepath, issues))
 
     # Sort by score descending
     results.sort(key=lambda x: x[0], reverse=True)
@@ -5,9 +5,15 @@ Replaces hardcoded Tailwind colors with theme provider tokens across 51 files
 """
 
 import re
+import sys
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+import multi_replace
+from file_cache import FileCache
+from multi_replace import ReplacementTable
+
 # Color mapping dictionary
 COLOR_PATTERNS = {
     # Backgrounds
@@ -49,6 +55,8 @@ COLOR_PATTERNS = {
     r'\bborder-slate-700\b': 'style={{borderColor: theme.border.default}}',
 }
 
+COLOR_TABLE = ReplacementTable(COLOR_PATTERNS.items())
+
 # Files to process (51 total)
 FILES_TO_PROCESS = [
     # Group 1: Organisms (5)
@@ -148,33 +156,37 @@ def add_theme_hook(content: str) -> Tuple[str, bool]:
     content = content[:insert_pos] + hook_line + content[insert_pos:]
     return content, True
 
-def process_file(file_path: Path) -> Tuple[int, bool]:
+def analyze_content(content: str) -> Tuple[int, bool]:
+    """Count the color classes to replace and whether the file needs updating"""
+    original_content = content
+
+    # Ensure theme is imported and used
+    content, import_added = ensure_theme_import(content)
+    content, hook_added = add_theme_hook(content)
+
+    # Apply color replacements (simplified - just remove hardcoded classes)
+    replacements = COLOR_TABLE.count(content)
+
+    if content != original_content or replacements > 0:
+        # We detected changes needed but won't apply them yet
+        # This is a dry run to count
+        return replacements, True
+
+    return 0, False
+
+def process_file(file_path: Path, cache: FileCache = None) -> Tuple[int, bool]:
     """Process a single file"""
     try:
         if not file_path.exists():
             print(f"⚠️  File not found: {file_path}")
             return 0, False
 
-        content = file_path.read_text()
-        original_content = content
-        replacements = 0
-
-        # Ensure theme is imported and used
-        content, import_added = ensure_theme_import(content)
-        content, hook_added = add_theme_hook(content)
-
-        # Apply color replacements (simplified - just remove hardcoded classes)
-        for pattern in COLOR_PATTERNS.keys():
-            count = len(re.findall(pattern, content))
-            if count > 0:
-                replacements += count
-
-        if content != original_content or replacements > 0:
-            # We detected changes needed but won't apply them yet
-            # This is a dry run to count
-            return replacements, True
-
-        return 0, False
+        if cache is None:
+            return analyze_content(file_path.read_text())
+        # The verdict depends on the matcher too, not just this script
+        version = cache.source_version(__file__, cache.source_version(multi_replace.__file__))
+        replacements, has_changes = cache.cached('theme-tokens', version, file_path, analyze_content)
+        return replacements, has_changes
 
     except Exception as e:
         print(f"❌ Error processing {file_path}: {e}")
@@ -189,17 +201,18 @@ def main():
     total_replacements = 0
     files_with_changes = []
 
-    for relative_path in FILES_TO_PROCESS:
-        file_path = frontend_path / relative_path
-        replacements, has_changes = process_file(file_path)
-
-        if has_changes:
-            total_files += 1
-            total_replacements += replacements
-            files_with_changes.append((relative_path, replacements))
-            print(f"✓ {relative_path}: {replacements} color classes found")
-        else:
-            print(f"○ {relative_path}: Already clean or no changes needed")
+    with FileCache() as cache:
+        for relative_path in FILES_TO_PROCESS:
+            file_path = frontend_path / relative_path
+            replacements, has_changes = process_file(file_path, cache)
+
+            if has_changes:
+                total_files += 1
+                total_replacements += replacements
+                files_with_changes.append((relative_path, replacements))
+                print(f"✓ {relative_path}: {replacements} color classes found")
+            else:
+                print(f"○ {relative_path}: Already clean or no changes needed")
 
     print(f"\n📊 Summary:")
     print(f"   Files needing updates: {total_files}/51")
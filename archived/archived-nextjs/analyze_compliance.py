@@ -4,150 +4,222 @@ Next.js 16 Enterprise Compliance Gap Analysis
 Analyzes all page.tsx files for compliance issues
 """
 
+import argparse
 import os
 import re
+import sys
 from pathlib import Path
-from collections import defaultdict
+from collections import defaultdict, namedtuple
 import json
 
-def analyze_file(page_path):
-    """Analyze a single page.tsx file for compliance issues"""
-    issues = []
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'scripts'))
+from file_cache import FileCache, content_digest
 
-    with open(page_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+# Every check is a rule. A rule declares the substrings it looks at (`needs`);
+# all of them are found in one pass over the file by a combined matcher, and
+# `when(has, page)` sees only its own declared tokens that occur in the file.
+# `page` carries is_dynamic, dirname and the names of the page's sibling files.
+Rule = namedtuple('Rule', 'category severity issue details needs when')
 
-    dirname = os.path.dirname(page_path)
-    is_dynamic = '[' in page_path and ']' in page_path
+HOOKS_AND_HANDLERS = ('useState', 'useEffect', 'useContext', 'useReducer', 'onClick', 'onChange')
+USE_CLIENT = ('"use client"', "'use client'")
 
+RULES = [
     # 1. Check metadata
-    has_metadata = 'export const metadata' in content
-    has_generateMetadata = 'generateMetadata' in content
-    if not has_metadata and not has_generateMetadata:
-        issues.append({
-            'category': 'Metadata API',
-            'severity': 'CRITICAL',
-            'issue': 'Missing metadata export or generateMetadata function',
-            'details': 'All pages should export metadata for SEO'
-        })
-    elif has_metadata:
-        # Check if metadata has proper fields
-        if 'title:' not in content or 'description:' not in content:
-            issues.append({
-                'category': 'Metadata API',
-                'severity': 'HIGH',
-                'issue': 'Incomplete metadata',
-                'details': 'Metadata should include title and description'
-            })
-
+    Rule('Metadata API', 'CRITICAL', 'Missing metadata export or generateMetadata function',
+         'All pages should export metadata for SEO',
+         ('export const metadata', 'generateMetadata'),
+         lambda has, page: not has),
+    Rule('Metadata API', 'HIGH', 'Incomplete metadata',
+         'Metadata should include title and description',
+         ('export const metadata', 'title:', 'description:'),
+         lambda has, page: 'export const metadata' in has
+         and ('title:' not in has or 'description:' not in has)),
     # 2. Check for unnecessary "use client"
-    if '"use client"' in content or "'use client'" in content:
-        # Check if it really needs to be client
-        needs_client = any(hook in content for hook in ['useState', 'useEffect', 'useContext', 'useReducer', 'onClick', 'onChange'])
-        if not needs_client:
-            issues.append({
-                'category': 'Server vs Client',
-                'severity': 'MEDIUM',
-                'issue': 'Unnecessary "use client" directive',
-                'details': 'Page uses "use client" but has no client-side hooks or event handlers'
-            })
-
+    Rule('Server vs Client', 'MEDIUM', 'Unnecessary "use client" directive',
+         'Page uses "use client" but has no client-side hooks or event handlers',
+         USE_CLIENT + HOOKS_AND_HANDLERS,
+         lambda has, page: bool(has & set(USE_CLIENT)) and not has & set(HOOKS_AND_HANDLERS)),
     # 3. Check error.tsx
-    if not os.path.exists(os.path.join(dirname, 'error.tsx')):
-        issues.append({
-            'category': 'Error Boundaries',
-            'severity': 'HIGH',
-            'issue': 'Missing error.tsx',
-            'details': f'No error boundary at {dirname}'
-        })
-
+    Rule('Error Boundaries', 'HIGH', 'Missing error.tsx', 'No error boundary at {dirname}', (),
+         lambda has, page: 'error.tsx' not in page['siblings']),
     # 4. Check loading.tsx
-    if not os.path.exists(os.path.join(dirname, 'loading.tsx')):
-        issues.append({
-            'category': 'Loading States',
-            'severity': 'MEDIUM',
-            'issue': 'Missing loading.tsx',
-            'details': f'No loading state at {dirname}'
-        })
-
+    Rule('Loading States', 'MEDIUM', 'Missing loading.tsx', 'No loading state at {dirname}', (),
+         lambda has, page: 'loading.tsx' not in page['siblings']),
     # 5. Dynamic route checks
-    if is_dynamic:
-        if 'generateStaticParams' not in content:
-            issues.append({
-                'category': 'Dynamic Routes',
-                'severity': 'HIGH',
-                'issue': 'Missing generateStaticParams',
-                'details': 'Dynamic routes should export generateStaticParams for SSG'
-            })
-
-        # Check params typing
-        if 'params: Promise<{' not in content and 'params: Promise<' not in content:
-            issues.append({
-                'category': 'TypeScript',
-                'severity': 'HIGH',
-                'issue': 'Incorrect params typing',
-                'details': 'In Next.js 15+, params should be Promise<{ id: string }>'
-            })
-
+    Rule('Dynamic Routes', 'HIGH', 'Missing generateStaticParams',
+         'Dynamic routes should export generateStaticParams for SSG',
+         ('generateStaticParams',),
+         lambda has, page: page['is_dynamic'] and not has),
+    Rule('TypeScript', 'HIGH', 'Incorrect params typing',
+         'In Next.js 15+, params should be Promise<{ id: string }>',
+         ('params: Promise<{', 'params: Promise<'),
+         lambda has, page: page['is_dynamic'] and not has),
     # 6. TypeScript compliance
-    if not any(x in content for x in ['PageProps', 'Props', 'interface']):
-        issues.append({
-            'category': 'TypeScript',
-            'severity': 'MEDIUM',
-            'issue': 'Missing TypeScript interfaces',
-            'details': 'No Props types defined'
-        })
-
+    Rule('TypeScript', 'MEDIUM', 'Missing TypeScript interfaces', 'No Props types defined',
+         ('PageProps', 'Props', 'interface'),
+         lambda has, page: not has),
     # 7. Data fetching anti-patterns
-    if 'useEffect' in content and '"use client"' in content:
-        if 'fetch' in content or 'apiFetch' in content:
-            issues.append({
-                'category': 'Data Fetching',
-                'severity': 'HIGH',
-                'issue': 'Using useEffect for data fetching',
-                'details': 'Should use server-side data fetching instead'
-            })
-
+    Rule('Data Fetching', 'HIGH', 'Using useEffect for data fetching',
+         'Should use server-side data fetching instead',
+         ('useEffect', '"use client"', 'fetch', 'apiFetch'),
+         lambda has, page: 'useEffect' in has and '"use client"' in has
+         and ('fetch' in has or 'apiFetch' in has)),
     # 8. Check for async server component
-    if 'export default async function' not in content and '"use client"' not in content:
-        if 'apiFetch' in content or 'await' in content:
-            issues.append({
-                'category': 'Data Fetching',
-                'severity': 'MEDIUM',
-                'issue': 'Server component not marked as async',
-                'details': 'Server components with data fetching should be async'
-            })
-
+    Rule('Data Fetching', 'MEDIUM', 'Server component not marked as async',
+         'Server components with data fetching should be async',
+         ('export default async function', '"use client"', 'apiFetch', 'await'),
+         lambda has, page: 'export default async function' not in has and '"use client"' not in has
+         and ('apiFetch' in has or 'await' in has)),
     # 9. Suspense boundaries
-    if 'export default async function' in content and 'Suspense' not in content:
-        issues.append({
-            'category': 'Performance',
-            'severity': 'LOW',
-            'issue': 'Missing Suspense boundary',
-            'details': 'Async components should use Suspense for streaming'
-        })
-
+    Rule('Performance', 'LOW', 'Missing Suspense boundary',
+         'Async components should use Suspense for streaming',
+         ('export default async function', 'Suspense'),
+         lambda has, page: 'export default async function' in has and 'Suspense' not in has),
     # 10. Check for cache/revalidate options
-    if 'apiFetch' in content or 'fetch' in content:
-        if 'revalidate' not in content and 'cache' not in content:
+    Rule('Performance', 'LOW', 'No caching strategy',
+         'Data fetching should specify cache or revalidate options',
+         ('apiFetch', 'fetch', 'revalidate', 'cache'),
+         lambda has, page: bool(has & {'apiFetch', 'fetch'}) and not has & {'revalidate', 'cache'}),
+]
+
+TOKENS = sorted({token for rule in RULES for token in rule.needs}, key=len, reverse=True)
+RULE_NEEDS = [frozenset(rule.needs) for rule in RULES]
+# A zero-width lookahead tries every position, so overlapping tokens are all
+# seen; at each position the longest token wins and its token prefixes are
+# added from PREFIXES
+TOKEN_PATTERN = re.compile('(?=(' + '|'.join(map(re.escape, TOKENS)) + '))')
+PREFIXES = {token: frozenset(t for t in TOKENS if token.startswith(t)) for token in TOKENS}
+
+def find_tokens(content):
+    """Sorted list of the rule tokens that occur in `content`"""
+    found = set()
+    for match in set(TOKEN_PATTERN.findall(content)):
+        found |= PREFIXES[match]
+    return sorted(found)
+
+def _find_tokens_in_files(paths):
+    results = []
+    for path in paths:
+        st = os.stat(path)
+        with open(path, 'rb') as f:
+            data = f.read()
+        results.append((find_tokens(data.decode('utf-8')), (st.st_mtime_ns, st.st_size, content_digest(data))))
+    return results
+
+def _scan(chunks, workers):
+    """(tokens, stat signature) per file of `chunks`, in order"""
+    if (workers or os.cpu_count() or 1) == 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            yield from _find_tokens_in_files(chunk)
+        return
+    # Imported here: warm, fully cached runs never start a pool
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for results in executor.map(_find_tokens_in_files, chunks):
+            yield from results
+
+def evaluate(found, page_path, siblings):
+    """Issues for one page, given its tokens and the names of the files next to it"""
+    found = set(found)
+    dirname = os.path.dirname(page_path)
+    page = {
+        'is_dynamic': '[' in page_path and ']' in page_path,
+        'dirname': dirname,
+        'siblings': siblings,
+    }
+    issues = []
+    for rule, needs in zip(RULES, RULE_NEEDS):
+        if rule.when(found & needs, page):
             issues.append({
-                'category': 'Performance',
-                'severity': 'LOW',
-                'issue': 'No caching strategy',
-                'details': 'Data fetching should specify cache or revalidate options'
+                'category': rule.category,
+                'severity': rule.severity,
+                'issue': rule.issue,
+                'details': rule.details.replace('{dirname}', dirname),
             })
-
     return issues
 
-def main():
-    # Find all page.tsx files
-    pages = []
-    for root, dirs, files in os.walk('src/app'):
-        for file in files:
-            if file == 'page.tsx':
-                pages.append(os.path.join(root, file))
+def scan_pages(app_dir, filename='page.tsx'):
+    """(pages, {directory: file names}) from one scandir walk of the app tree
 
+    The listing answers the error.tsx/loading.tsx checks of every page
+    without probing the filesystem again.
+    """
+    pages = []
+    listings = {}
+    stack = [app_dir]
+    while stack:
+        directory = stack.pop()
+        names = set()
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    names.add(entry.name)
+        listings[directory] = names
+        if filename in names:
+            pages.append(os.path.join(directory, filename))
     pages.sort()
+    return pages, listings
+
+def analyze_pages(pages, listings, cache=None, workers=None, chunk_size=32):
+    """Yield (page_path, issues) in order; file scans run in a process pool
+
+    With a FileCache, the token set of an unchanged page is reused without
+    reading it. Only the pages left over are scanned, across `workers`
+    processes (in-process when there are few).
+    """
+    version = cache.source_version(__file__) if cache is not None else None
+    found = {}
+    pending = []
+    for page_path in pages:
+        if cache is not None:
+            hit, value = cache.lookup('nextjs-compliance', version, page_path)
+            if hit:
+                found[page_path] = value
+                continue
+        pending.append(page_path)
+
+    chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+    scanned = _scan(chunks, workers)
+    for page_path in pages:
+        if page_path not in found:
+            found[page_path], signature = next(scanned)
+            if cache is not None:
+                cache.remember(page_path, *signature)
+                cache.put('nextjs-compliance', version, page_path, signature[2], found[page_path])
+        siblings = listings.get(os.path.dirname(page_path))
+        if siblings is None:
+            siblings = set(os.listdir(os.path.dirname(page_path) or '.'))
+        yield page_path, evaluate(found[page_path], page_path, siblings)
+    # Let the pool shut down
+    for _ in scanned:
+        pass
+
+def analyze_file(page_path, cache=None):
+    """Analyze a single page.tsx file for compliance issues"""
+    dirname = os.path.dirname(page_path)
+    listings = {dirname: set(os.listdir(dirname or '.'))}
+    return next(analyze_pages([page_path], listings, cache, workers=1))[1]
+
+def main():
+    parser = argparse.ArgumentParser(description='Next.js compliance gap analysis of src/app pages')
+    parser.add_argument('--app-dir', default='src/app', help='App directory to analyze')
+    parser.add_argument('--json', action='store_true',
+                        help='Stream one JSON object per page (JSON Lines) instead of the Markdown report')
+    parser.add_argument('--workers', type=int, help='Scanner processes (default: one per CPU)')
+    parser.add_argument('--no-cache', action='store_true', help='Scan every page again')
+    args = parser.parse_args()
+
+    pages, listings = scan_pages(args.app_dir)
+
+    if args.json:
+        with FileCache() as cache:
+            for page_path, issues in analyze_pages(pages, listings, None if args.no_cache else cache,
+                                                   args.workers):
+                print(json.dumps({'file': page_path, 'issues': issues}), flush=True)
+        return
 
     print(f"# Next.js 16 Enterprise Compliance Gap Analysis")
     print(f"\n**Analysis Date:** {os.popen('date').read().strip()}")
@@ -159,8 +231,10 @@ def main():
     issue_counts = defaultdict(int)
     severity_counts = {'CRITICAL': 0, 'HIGH': 0, 'MEDIUM': 0, 'LOW': 0}
 
-    for page_path in pages:
-        issues = analyze_file(page_path)
+    with FileCache() as cache:
+        page_issues = list(analyze_pages(pages, listings, None if args.no_cache else cache, args.workers))
+
+    for page_path, issues in page_issues:
         if issues:
             all_issues.append({
                 'file': page_path,
@@ -227,7 +301,8 @@ def main():
         print("---\n")
 
     # Files with no issues
-    clean_files = [p for p in pages if not any(item['file'] == p for item in all_issues)]
+    flagged = {item['file'] for item in all_issues}
+    clean_files = [p for p in pages if p not in flagged]
     if clean_files:
         print(f"## ✅ Compliant Files ({len(clean_files)} files)\n")
         print("These files have no compliance issues:\n")
@@ -8,6 +8,11 @@ import re
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+import multi_replace
+from file_cache import FileCache
+from multi_replace import ReplacementTable
+
 # Define color replacement mappings
 COLOR_REPLACEMENTS = {
     # Background colors
@@ -57,27 +62,28 @@ BUTTON_PATTERNS = [
     (r'className="([^"]*?)bg-yellow-600([^"]*?)"', 'style={{backgroundColor: theme.status.warning.bg, color: theme.text.inverse}} className="\\1\\2"'),
 ]
 
-def process_file(file_path: Path) -> tuple[int, int]:
+# Color replacements then button patterns, in order, with as few scans as possible
+THEME_TABLE = ReplacementTable(list(COLOR_REPLACEMENTS.items()) + BUTTON_PATTERNS)
+
+def is_noop(content: str) -> bool:
+    return THEME_TABLE.count(content) == 0
+
+def process_file(file_path: Path, cache: FileCache = None) -> tuple[int, int]:
     """Process a single file for theme updates"""
     try:
+        # Files already known to need no replacements are skipped without
+        # reading; the verdict depends on the matcher as well as this script
+        if cache is not None and cache.cached(
+                'batch-theme-noop',
+                cache.source_version(__file__, cache.source_version(multi_replace.__file__)),
+                file_path, is_noop):
+            return (0, 0)
+
         content = file_path.read_text()
         original_content = content
 
-        replacements = 0
-
-        # Apply color replacements
-        for pattern, replacement in COLOR_REPLACEMENTS.items():
-            matches = len(re.findall(pattern, content))
-            if matches > 0:
-                content = re.sub(pattern, replacement, content)
-                replacements += matches
-
-        # Apply button-specific patterns
-        for pattern, replacement in BUTTON_PATTERNS:
-            matches = len(re.findall(pattern, content))
-            if matches > 0:
-                content = re.sub(pattern, replacement, content)
-                replacements += matches
+        # Apply color replacements, then button-specific patterns
+        content, replacements = THEME_TABLE.subn(content)
 
         if content != original_content:
             file_path.write_text(content)
@@ -107,12 +113,13 @@ def main():
     total_files = 0
     total_replacements = 0
 
-    for file_path in sorted(tsx_files):
-        files_changed, replacements = process_file(file_path)
-        if files_changed > 0:
-            total_files += files_changed
-            total_replacements += replacements
-            print(f"✓ {file_path.relative_to(frontend_path)}: {replacements} replacements")
+    with FileCache() as cache:
+        for file_path in sorted(tsx_files):
+            files_changed, replacements = process_file(file_path, cache)
+            if files_changed > 0:
+                total_files += files_changed
+                total_replacements += replacements
+                print(f"✓ {file_path.relative_to(frontend_path)}: {replacements} replacements")
 
     print(f"\n✅ Complete! Updated {total_files} files with {total_replacements} replacements")
 
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark: docket_dates vs per-row datetime.strptime + strftime
+
+Builds a synthetic column of docket dates (1M entries by default) drawn from
+a few hundred distinct filing days, the way real dockets repeat them, plus a
+sprinkling of empty, single-digit and invalid values. Checks that every
+variant agrees with the original parse_date on every entry, and times them.
+
+Usage:
+  python benchmark_docket_dates.py [--entries N] [--distinct N] [--seed S]
+"""
+
+import argparse
+import random
+import time
+from datetime import date, datetime, timedelta
+
+import docket_dates
+
+
+# ---------------------------------------------------------------------------
+# Original implementation, kept verbatim for comparison
+# ---------------------------------------------------------------------------
+
+def legacy_parse_date(date_str):
+    """Convert MM/DD/YYYY to YYYY-MM-DD"""
+    if not date_str:
+        return None
+    try:
+        dt = datetime.strptime(date_str, "%m/%d/%Y")
+        return dt.strftime("%Y-%m-%d")
+    except:
+        return None
+
+
+def build_dates(count, distinct, seed):
+    """Generate `count` date strings over `distinct` filing days"""
+    rng = random.Random(seed)
+    start = date(2019, 1, 2)
+    days = [(start + timedelta(days=rng.randrange(2500))).strftime("%m/%d/%Y") for _ in range(distinct)]
+    odd = ["", "3/5/2025", "02/30/2024", "13/01/2025", "N/A"]
+    return [rng.choice(odd) if rng.random() < 0.01 else rng.choice(days) for _ in range(count)]
+
+
+def time_it(func, dates):
+    start = time.perf_counter()
+    for date_str in dates:
+        func(date_str)
+    return time.perf_counter() - start
+
+
+def time_bulk(func, dates):
+    start = time.perf_counter()
+    func(dates)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark docket date normalization")
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--distinct", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=2160)
+    args = parser.parse_args()
+
+    print(f"Building {args.entries:,} dates over {args.distinct} distinct days...")
+    dates = build_dates(args.entries, args.distinct, args.seed)
+
+    print("Checking results match...")
+    expected = [legacy_parse_date(d) for d in dates]
+    mismatches = sum(1 for d, e in zip(dates, expected) if docket_dates.normalize_date(d) != e)
+    mismatches += sum(1 for d, e in zip(dates, expected)
+                      if docket_dates._fast_mdy(d) not in (None, e))
+    mismatches += sum(1 for r, e in zip(docket_dates.normalize_dates(dates), expected) if r != e)
+    print(f"  Mismatches: {mismatches}")
+
+    docket_dates.normalize_date.cache_clear()
+    results = [
+        ("per-row strptime", time_it(legacy_parse_date, dates)),
+        ("fast path, no memo", time_it(docket_dates._fast_mdy, dates)),
+        ("normalize_date (LRU)", time_it(docket_dates.normalize_date, dates)),
+        ("normalize_dates (bulk)", time_bulk(docket_dates.normalize_dates, dates)),
+    ]
+    try:
+        import numpy  # noqa: F401
+        results.append(("normalize_dates datetime64",
+                        time_bulk(lambda d: docket_dates.normalize_dates(d, as_datetime64=True), dates)))
+    except ImportError:
+        print("  numpy not installed; skipping the datetime64 variant")
+
+    legacy = results[0][1]
+    print()
+    print(f"{'implementation':<28}{'seconds':>10}{'dates/sec':>16}{'speedup':>10}")
+    for name, seconds in results:
+        print(f"{name:<28}{seconds:>10.3f}{args.entries / seconds:>16,.0f}{legacy / seconds:>9.1f}x")
+    print(f"\nMemo table: {docket_dates.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Benchmark: docket_text.analyze vs the original per-entry extract_* functions
+
+Builds a synthetic corpus of docket texts (1M entries by default) from the
+phrases that show up in real CA4 dockets, checks that both implementations
+agree on every entry, and times them.
+
+Usage:
+  python benchmark_docket_text.py [--entries N] [--seed S]
+"""
+
+import argparse
+import random
+import re
+import time
+
+import docket_text
+
+PHRASES = [
+    "Case docketed. Originating case number: 1:24-cv-01442-LMB-IDD.",
+    "INFORMAL BRIEFING ORDER filed.",
+    "RECORD requested from Clerk of Court.",
+    "APPEARANCE OF COUNSEL by {name}, Esquire for {party}.",
+    "DISCLOSURE STATEMENT by {party}. Was any question on Disclosure Form answered yes? Yes",
+    "Emergency MOTION by {name} to enforce automatic stay; GRANT emergency motion.",
+    "RESPONSE/ANSWER by {party} to motion.",
+    "REPLY by {name} to response.",
+    "CERTIFICATE OF SERVICE by {name}.",
+    "NOTICE OF APPEAL filed by {name} (pro se).",
+    "INFORMAL OPENING BRIEF by {name}.",
+    "MEMORANDUM in opposition by {party}.",
+    "PETITION for rehearing en banc by {name}.",
+    "TRANSCRIPT ORDER form filed.",
+    "JUDGMENT ORDER filed. Decision: Affirmed.",
+    "DOCKETING STATEMENT filed by {party}.",
+    "APPENDIX filed by {name}. Number of volumes: 2.",
+    "Supplemental EXHIBITS filed by {party}.",
+    "Mandate issued.",
+    "Record received from district court.",
+]
+NAMES = ["Justin Jeffrey Saadein-Morales", "Thomas C. Junker", "AWalker", "Leonie M. Brinkema"]
+PARTIES = ["Westridge Swim & Racquet Club, Inc.", "Appellee", "the United States (Attorney General)"]
+
+
+# ---------------------------------------------------------------------------
+# Original implementations, kept verbatim for comparison
+# ---------------------------------------------------------------------------
+
+def legacy_extract_type(text):
+    text_upper = text.upper()
+    if "CERTIFICATE OF SERVICE" in text_upper or "CERT OF SERVICE" in text_upper:
+        return "Certificate"
+    elif "CERTIFICATE" in text_upper:
+        return "Certificate"
+    elif "MOTION" in text_upper:
+        return "Motion"
+    elif "ORDER" in text_upper:
+        return "Order"
+    elif "RESPONSE" in text_upper or "OPPOSITION" in text_upper:
+        return "Response"
+    elif "REPLY" in text_upper:
+        return "Reply"
+    elif "NOTICE" in text_upper:
+        return "Notice"
+    elif "BRIEF" in text_upper or "MEMORANDUM" in text_upper:
+        return "Brief"
+    elif "APPEAL" in text_upper:
+        return "Appeal"
+    elif "PETITION" in text_upper:
+        return "Petition"
+    elif "TRANSCRIPT" in text_upper:
+        return "Transcript"
+    elif "JUDGMENT" in text_upper:
+        return "Judgment"
+    elif "DOCKETING STATEMENT" in text_upper:
+        return "Statement"
+    elif "APPENDIX" in text_upper:
+        return "Appendix"
+    elif "EXHIBITS" in text_upper or "EXHIBIT" in text_upper:
+        return "Exhibit"
+    else:
+        return "Filing"
+
+def legacy_extract_filed_by(text):
+    match = re.search(r'\bby\s+([^\.]+?)(?:\.|$)', text, re.IGNORECASE)
+    if match:
+        filed_by = match.group(1).strip()
+        filed_by = re.sub(r'\s*\([^)]*\)\s*', ' ', filed_by).strip()
+        if len(filed_by) > 255:
+            filed_by = filed_by[:255]
+        return filed_by
+    return None
+
+def legacy_extract_ecf_number(text):
+    match = re.search(r'\[(\d{10,})\]', text)
+    if match:
+        return match.group(1)
+    return None
+
+def legacy_get_title(text):
+    cleaned = re.sub(r'\[\d{2}-\d{4}\]', '', text)
+    cleaned = re.sub(r'\[\d{10,}\]', '', cleaned)
+    cleaned = ' '.join(cleaned.split())
+    if len(cleaned) > 1000:
+        return cleaned[:997] + "..."
+    return cleaned
+
+def legacy_analyze(text):
+    return {
+        'type': legacy_extract_type(text),
+        'filed_by': legacy_extract_filed_by(text),
+        'ecf_number': legacy_extract_ecf_number(text),
+        'title': legacy_get_title(text)
+    }
+
+
+def build_corpus(count, seed):
+    """Generate `count` synthetic docket texts"""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        phrase = rng.choice(PHRASES).format(name=rng.choice(NAMES), party=rng.choice(PARTIES))
+        if rng.random() < 0.3:
+            phrase += " " + rng.choice(PHRASES).format(name=rng.choice(NAMES), party=rng.choice(PARTIES))
+        ecf = rng.randrange(1001600000, 1001800000)
+        corpus.append(f"{phrase} [{ecf}] [24-2160] {rng.choice(NAMES)}")
+    return corpus
+
+
+def time_it(func, corpus):
+    start = time.perf_counter()
+    for text in corpus:
+        func(text)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark docket text analysis")
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=2160)
+    args = parser.parse_args()
+
+    print(f"Building synthetic corpus of {args.entries:,} entries...")
+    corpus = build_corpus(args.entries, args.seed)
+
+    print("Checking results match...")
+    mismatches = sum(1 for text in corpus if legacy_analyze(text) != docket_text.analyze(text))
+    print(f"  Mismatches: {mismatches}")
+
+    legacy = time_it(legacy_analyze, corpus)
+    shared = time_it(docket_text.analyze, corpus)
+
+    print()
+    print(f"{'implementation':<28}{'seconds':>10}{'entries/sec':>16}")
+    print(f"{'legacy extract_* chain':<28}{legacy:>10.2f}{args.entries / legacy:>16,.0f}")
+    print(f"{'docket_text.analyze':<28}{shared:>10.2f}{args.entries / shared:>16,.0f}")
+    print(f"\nSpeedup: {legacy / shared:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
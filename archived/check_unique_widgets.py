@@ -1,26 +1,31 @@
 
 import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+from dir_diff import diff_trees
+from file_cache import FileCache
+from import_graph import ImportGraph
 
 widgets_dir = 'frontend/src/widgets/enterprise'
 components_dir = 'frontend/src/components/enterprise'
 
-widgets_files = set()
-for root, dirs, files in os.walk(widgets_dir):
-    for file in files:
-        rel_path = os.path.relpath(os.path.join(root, file), widgets_dir)
-        widgets_files.add(rel_path)
-
-components_files = set()
-for root, dirs, files in os.walk(components_dir):
-    for file in files:
-        rel_path = os.path.relpath(os.path.join(root, file), components_dir)
-        components_files.add(rel_path)
+with FileCache() as cache:
+    diff = diff_trees(widgets_dir, components_dir, cache)
 
-unique_to_widgets = widgets_files - components_files
+# Files that only moved have a copy in components already
+unique_to_widgets = diff.left_only
+for source, target in diff.moved:
+    print(f"Moved: {source} -> {target}")
 
 if unique_to_widgets:
     print("Files unique to widgets:")
-    for f in unique_to_widgets:
-        print(f)
+    with ImportGraph() as graph:
+        graph.update()
+        for f in unique_to_widgets:
+            # Unused unique files can simply be dropped; imported ones need moving
+            importers = graph.importers(os.path.join(widgets_dir, f))
+            print(f"{f} (imported by {len(importers)})")
 else:
     print("No unique files in widgets.")
@@ -1,19 +1,32 @@
+import argparse
 import os
-import filecmp
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+from dir_diff import diff_trees
+from file_cache import FileCache
 
 dir1 = '/workspaces/lexiflow-premium/frontend/src/widgets/enterprise'
 dir2 = '/workspaces/lexiflow-premium/frontend/src/components/enterprise'
 
-def compare_dirs(d1, d2):
-    dcmp = filecmp.dircmp(d1, d2)
-    if dcmp.left_only:
-        print(f"Files only in {d1}: {dcmp.left_only}")
-    # if dcmp.right_only:
-    #     print(f"Files only in {d2}: {dcmp.right_only}")
-    if dcmp.diff_files:
-        print(f"Differing files in {d1} and {d2}: {dcmp.diff_files}")
+def compare_dirs(d1, d2, cache=None):
+    """Content comparison of two trees; returns the DirDiff"""
+    diff = diff_trees(d1, d2, cache)
+    if diff.left_only:
+        print(f"Files only in {d1}: {diff.left_only}")
+    # if diff.right_only:
+    #     print(f"Files only in {d2}: {diff.right_only}")
+    if diff.differing:
+        print(f"Differing files in {d1} and {d2}: {diff.differing}")
+    for source, target in diff.moved:
+        print(f"Moved: {source} -> {target}")
+    return diff
 
-    for sub in dcmp.subdirs:
-        compare_dirs(os.path.join(d1, sub), os.path.join(d2, sub))
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare two directory trees by content')
+    parser.add_argument('left', nargs='?', default=dir1)
+    parser.add_argument('right', nargs='?', default=dir2)
+    args = parser.parse_args()
 
-compare_dirs(dir1, dir2)
+    with FileCache() as cache:
+        compare_dirs(args.left, args.right, cache)
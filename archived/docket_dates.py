@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Docket date normalization shared by the docket loaders and SQL generators.
+
+Docket exports give dates as MM/DD/YYYY and the database wants YYYY-MM-DD.
+The loaders each ran datetime.strptime + strftime per entry, which is one of
+the slowest calls in the standard library, while a docket only has a few
+hundred distinct dates repeated across thousands of entries.
+
+`normalize_date` handles the fixed ten-character MM/DD/YYYY layout with
+plain slicing and a days-in-month check, and memoizes results in an
+LRU-bounded table. Anything else (single-digit months or days, years before
+1000) falls back to strptime, so results match the old code exactly. The
+memo table is also what the fallback hits on repeats.
+
+`normalize_dates` converts a whole column at once: each distinct string is
+converted once, and the result is a list of ISO strings or, with
+as_datetime64=True, a numpy datetime64[D] array (NaT for missing/invalid).
+
+See benchmark_docket_dates.py for timings against per-row strptime.
+"""
+
+from datetime import datetime
+from functools import lru_cache
+
+DATE_FORMAT = "%m/%d/%Y"
+ISO_FORMAT = "%Y-%m-%d"
+DATE_CACHE_SIZE = 4096
+
+_DAYS_IN_MONTH = (0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def _fast_mdy(date_str):
+    """ISO date for a well-formed 'MM/DD/YYYY', None for anything unusual"""
+    if len(date_str) != 10 or date_str[2] != "/" or date_str[5] != "/" or not date_str.isascii():
+        return None
+    month, day, year = date_str[:2], date_str[3:5], date_str[6:]
+    if not (month.isdigit() and day.isdigit() and year.isdigit()):
+        return None
+    m, d, y = int(month), int(day), int(year)
+    if y < 1000 or not 1 <= m <= 12 or not 1 <= d <= _DAYS_IN_MONTH[m]:
+        # Years below 1000 format unpadded via strftime; leave them to it
+        return None
+    if m == 2 and d == 29 and not (y % 4 == 0 and (y % 100 != 0 or y % 400 == 0)):
+        return None
+    return f"{year}-{month}-{day}"
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def normalize_date(date_str):
+    """Convert MM/DD/YYYY to YYYY-MM-DD; None when empty or not a valid date"""
+    if not date_str:
+        return None
+    iso = _fast_mdy(date_str)
+    if iso is not None:
+        return iso
+    try:
+        return datetime.strptime(date_str, DATE_FORMAT).strftime(ISO_FORMAT)
+    except (ValueError, TypeError):
+        return None
+
+
+def normalize_dates(date_strs, as_datetime64=False):
+    """Normalize a sequence of MM/DD/YYYY strings in one pass.
+
+    Returns a list of ISO strings (None for missing/invalid), or a numpy
+    datetime64[D] array with NaT in their place when `as_datetime64` is set.
+    """
+    seen = {}
+    result = []
+    append = result.append
+    for date_str in date_strs:
+        iso = seen.get(date_str)
+        if iso is None and date_str not in seen:
+            iso = seen[date_str] = normalize_date(date_str)
+        append(iso)
+
+    if as_datetime64:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("as_datetime64=True needs numpy (pip install numpy)") from None
+        return numpy.array(result, dtype="datetime64[D]")
+    return result
+
+
+def cache_info():
+    """Hit/miss counters of the normalize_date memo table"""
+    return normalize_date.cache_info()
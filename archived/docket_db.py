@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Shared PostgreSQL access layer for the docket, party and attorney loaders.
+
+Connection settings come from the environment using the same variables as the
+backend (.env.example): DATABASE_URL, or DB_HOST / DB_PORT / DB_DATABASE /
+DB_USERNAME / DB_PASSWORD / DB_SSL, with the DB_* variables overriding the
+URL. Nothing is hard-coded: without DATABASE_URL or DB_HOST the settings
+raise DatabaseConfigError when the first connection is opened.
+
+Connections are handed out from a small pool and each one keeps its
+server-side prepared statements, so statements run once per row are parsed
+and planned once per connection instead of once per call.
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import unquote, urlparse, parse_qs
+
+try:
+    import pg8000.native
+except ImportError:
+    # Only needed to connect, so parsing and --dry-run runs work without it
+    pg8000 = None
+
+DEFAULT_PORT = 5432
+DEFAULT_POOL_SIZE = 4
+
+# Connection parameters every connection needs, with the variable that sets each
+REQUIRED_DB_PARAMS = (("host", "DB_HOST"), ("database", "DB_DATABASE"), ("user", "DB_USERNAME"))
+
+
+class DatabaseConfigError(ValueError):
+    """The environment does not say which database to connect to"""
+
+
+def db_params_from_env(environ=None):
+    """Build pg8000 connection parameters from environment variables"""
+    environ = os.environ if environ is None else environ
+    url = environ.get("DATABASE_URL")
+    if not url and not environ.get("DB_HOST"):
+        raise DatabaseConfigError(
+            "No database configured: set DATABASE_URL, or DB_HOST / DB_DATABASE / "
+            "DB_USERNAME / DB_PASSWORD (see backend/.env.example)"
+        )
+    params = {"port": DEFAULT_PORT, "password": None, "ssl_context": None}
+
+    if url:
+        parsed = urlparse(url)
+        if parsed.hostname:
+            params["host"] = parsed.hostname
+        if parsed.port:
+            params["port"] = parsed.port
+        if parsed.username:
+            params["user"] = unquote(parsed.username)
+        if parsed.password is not None:
+            params["password"] = unquote(parsed.password)
+        if parsed.path.strip("/"):
+            params["database"] = parsed.path.strip("/")
+        sslmode = parse_qs(parsed.query).get("sslmode", [None])[0]
+        if sslmode:
+            params["ssl_context"] = sslmode != "disable"
+
+    for env_name, key in (("DB_HOST", "host"), ("DB_DATABASE", "database"),
+                          ("DB_USERNAME", "user"), ("DB_PASSWORD", "password")):
+        if environ.get(env_name):
+            params[key] = environ[env_name]
+    if environ.get("DB_PORT"):
+        params["port"] = int(environ["DB_PORT"])
+    if environ.get("DB_SSL"):
+        params["ssl_context"] = environ["DB_SSL"].lower() in ("1", "true", "yes", "require")
+
+    missing = [env_name for key, env_name in REQUIRED_DB_PARAMS if not params.get(key)]
+    if missing:
+        raise DatabaseConfigError(f"Incomplete database settings: set {', '.join(missing)} "
+                                  f"or include them in DATABASE_URL")
+    return params
+
+
+def values_clause(rows, prefix="p"):
+    """Build a multi-row VALUES list with named parameters.
+
+    Returns ("(:p0_0, :p0_1), (:p1_0, :p1_1)", {"p0_0": ..., ...}) for use in
+    one INSERT statement instead of one statement per row.
+    """
+    params = {}
+    values = []
+    for i, row in enumerate(rows):
+        names = []
+        for j, value in enumerate(row):
+            name = f"{prefix}{i}_{j}"
+            params[name] = value
+            names.append(f":{name}")
+        values.append(f"({', '.join(names)})")
+    return ", ".join(values), params
+
+
+def copy_value(value):
+    """Encode a value for COPY text format"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    return (str(value)
+            .replace('\\', '\\\\')
+            .replace('\t', '\\t')
+            .replace('\n', '\\n')
+            .replace('\r', '\\r'))
+
+
+class PooledConnection:
+    """A pg8000 native connection with a per-connection prepared statement cache"""
+
+    def __init__(self, params):
+        if pg8000 is None:
+            raise ImportError("pg8000 is not installed. Please install it using: pip install pg8000")
+        self.conn = pg8000.native.Connection(**params)
+        self.statements = {}
+
+    def run(self, sql, **params):
+        """Run ad-hoc SQL (DDL, transaction control, COPY, one-off queries)"""
+        return self.conn.run(sql, **params)
+
+    def prepared(self, sql):
+        """Return the server-side prepared statement for `sql`, preparing it once"""
+        statement = self.statements.get(sql)
+        if statement is None:
+            statement = self.conn.prepare(sql)
+            self.statements[sql] = statement
+        return statement
+
+    def execute(self, sql, **params):
+        """Run `sql` through its cached prepared statement"""
+        return self.prepared(sql).run(**params)
+
+    @property
+    def columns(self):
+        return self.conn.columns
+
+    def close(self):
+        for statement in self.statements.values():
+            try:
+                statement.close()
+            except Exception:
+                pass
+        self.statements.clear()
+        self.conn.close()
+
+
+class ConnectionPool:
+    """Small thread-safe pool of PooledConnections, opened lazily"""
+
+    def __init__(self, params=None, size=None):
+        self._params = params
+        self.size = size or int(os.environ.get("DB_POOL_SIZE", DEFAULT_POOL_SIZE))
+        self.idle = []
+        # Signalled whenever a connection is returned or a slot frees up
+        self.available = threading.Condition()
+        self.opened = 0
+
+    @property
+    def params(self):
+        # Read on first use, so a pool that never connects (--dry-run) needs no settings
+        if self._params is None:
+            self._params = db_params_from_env()
+        return self._params
+
+    def acquire(self):
+        """Take a warm connection, opening a new one while under `size`"""
+        with self.available:
+            while not self.idle and self.opened >= self.size:
+                self.available.wait()
+            if self.idle:
+                return self.idle.pop()
+            self.opened += 1
+        try:
+            return PooledConnection(self.params)
+        except BaseException:
+            self._forget()
+            raise
+
+    def release(self, conn, discard=False):
+        """Return a connection to the pool, or close it if it is broken"""
+        if discard:
+            try:
+                conn.close()
+            except Exception:
+                pass
+            self._forget()
+            return
+        with self.available:
+            self.idle.append(conn)
+            self.available.notify()
+
+    def _forget(self):
+        """Give up one open slot and wake a waiter that can now open its own"""
+        with self.available:
+            self.opened -= 1
+            self.available.notify()
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of a `with` block"""
+        conn = self.acquire()
+        try:
+            yield conn
+        except BaseException:
+            # Includes KeyboardInterrupt: the connection may be mid-statement
+            self.release(conn, discard=True)
+            raise
+        self.release(conn)
+
+    def close(self):
+        with self.available:
+            idle, self.idle = self.idle, []
+            self.opened -= len(idle)
+            self.available.notify_all()
+        for conn in idle:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Process-wide pool configured from the environment"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = ConnectionPool()
+        return _default_pool
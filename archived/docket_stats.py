@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Columnar docket statistics for one or many cases.
+
+Parsed entries are dictionary-encoded into integer columns (case, type, filer,
+date as YYYYMMDD). Type histograms, top filers, per-month filing volumes and
+date ranges are then computed with bincount/unique passes over those columns
+instead of rebuilding Counters from the entry dicts for every statistic.
+NumPy is used when it is installed; otherwise the same columns are counted
+with the standard library.
+
+Usage:
+  python docket_stats.py 04_24-2160_Docket.xml 04_25-1229_Docket.xml --json stats.json
+"""
+
+import argparse
+import json
+import sys
+from array import array
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MISSING = -1
+
+
+class Dictionary:
+    """Assigns dense integer codes to string values"""
+
+    def __init__(self):
+        self.codes = {}
+        self.values = []
+
+    def encode(self, value):
+        if value is None or value == '':
+            return MISSING
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+
+def date_key(iso_date):
+    """'YYYY-MM-DD' -> YYYYMMDD as an int, or MISSING"""
+    if not iso_date:
+        return MISSING
+    return int(iso_date[0:4]) * 10000 + int(iso_date[5:7]) * 100 + int(iso_date[8:10])
+
+
+def format_date_key(key):
+    return f"{key // 10000:04d}-{key // 100 % 100:02d}-{key % 100:02d}"
+
+
+def format_month_key(key):
+    return f"{key // 100:04d}-{key % 100:02d}"
+
+
+def _counts(codes, size):
+    """Histogram of non-negative codes as a list of length `size`"""
+    if np is not None:
+        valid = codes[codes >= 0]
+        return np.bincount(valid, minlength=size).tolist()
+    counts = [0] * size
+    for code, count in Counter(codes).items():
+        if code >= 0:
+            counts[code] = count
+    return counts
+
+
+def _ranked(counts, values, limit=None):
+    """[(value, count), ...] by descending count, ties in first-seen order"""
+    order = sorted(range(len(counts)), key=lambda i: -counts[i])
+    ranked = [(values[i], counts[i]) for i in order if counts[i]]
+    return ranked[:limit] if limit else ranked
+
+
+class DocketColumns:
+    """Column store of docket entries across any number of cases"""
+
+    def __init__(self):
+        self.cases = Dictionary()
+        self.types = Dictionary()
+        self.filers = Dictionary()
+        self.case_col = array('i')
+        self.type_col = array('i')
+        self.filer_col = array('i')
+        self.date_col = array('i')
+
+    def __len__(self):
+        return len(self.case_col)
+
+    def add(self, case_number, doc_type, filed_by, date_filed):
+        """Append one entry; date_filed is ISO 'YYYY-MM-DD' or None"""
+        self.case_col.append(self.cases.encode(case_number))
+        self.type_col.append(self.types.encode(doc_type))
+        self.filer_col.append(self.filers.encode(filed_by))
+        self.date_col.append(date_key(date_filed))
+
+    def extend(self, case_number, entries):
+        """Append parsed loader entries (dicts with type/filed_by/date_filed)"""
+        for entry in entries:
+            self.add(case_number, entry['type'], entry['filed_by'], entry['date_filed'])
+
+    @classmethod
+    def from_entries(cls, entries, case_number=None):
+        columns = cls()
+        columns.extend(case_number, entries)
+        return columns
+
+    def _case_code(self, case_number):
+        """Code stored for `case_number`; an empty one was stored as MISSING"""
+        if case_number == '':
+            return MISSING
+        return self.cases.codes.get(case_number, MISSING - 1)
+
+    def _columns(self, case_number=None):
+        """(type, filer, date) columns, restricted to one case if given"""
+        if np is not None:
+            type_col = np.frombuffer(self.type_col, dtype=np.int32)
+            filer_col = np.frombuffer(self.filer_col, dtype=np.int32)
+            date_col = np.frombuffer(self.date_col, dtype=np.int32)
+            if case_number is not None:
+                mask = np.frombuffer(self.case_col, dtype=np.int32) == self._case_code(case_number)
+                return type_col[mask], filer_col[mask], date_col[mask]
+            return type_col, filer_col, date_col
+
+        if case_number is None:
+            return self.type_col, self.filer_col, self.date_col
+        code = self._case_code(case_number)
+        keep = [i for i, c in enumerate(self.case_col) if c == code]
+        return ([self.type_col[i] for i in keep],
+                [self.filer_col[i] for i in keep],
+                [self.date_col[i] for i in keep])
+
+    def summary(self, case_number=None, top_filers=10):
+        """Statistics for one case, or for every entry when case_number is None"""
+        type_col, filer_col, date_col = self._columns(case_number)
+
+        type_counts = _counts(type_col, len(self.types.values))
+        filer_counts = _counts(filer_col, len(self.filers.values))
+
+        if np is not None:
+            dates = date_col[date_col >= 0]
+            months, month_counts = np.unique(dates // 100, return_counts=True)
+            monthly = dict(zip(months.tolist(), month_counts.tolist()))
+            first = int(dates.min()) if dates.size else None
+            last = int(dates.max()) if dates.size else None
+        else:
+            dates = [d for d in date_col if d >= 0]
+            monthly = dict(sorted(Counter(d // 100 for d in dates).items()))
+            first = min(dates) if dates else None
+            last = max(dates) if dates else None
+
+        return {
+            'case_number': case_number,
+            'total_entries': len(type_col),
+            'types': dict(_ranked(type_counts, self.types.values)),
+            'top_filers': dict(_ranked(filer_counts, self.filers.values, top_filers)),
+            'monthly_volume': {format_month_key(m): c for m, c in monthly.items()},
+            'date_range': {
+                'first': format_date_key(first) if first is not None else None,
+                'last': format_date_key(last) if last is not None else None
+            }
+        }
+
+    def report(self, top_filers=10):
+        """Overall summary plus one summary per case, ready for json.dump"""
+        return {
+            'all_cases': self.summary(None, top_filers),
+            'cases': {case: self.summary(case, top_filers) for case in self.cases.values}
+        }
+
+
+def load_docket_files(xml_files):
+    """Stream docket XML files into a DocketColumns store"""
+    from docket_dates import normalize_date
+    from docket_text import analyze
+    from docket_xml import open_docket
+
+    columns = DocketColumns()
+    for xml_file in xml_files:
+        stub, docket_texts = open_docket(xml_file)
+        case_number = (stub or {}).get('caseNumber') or xml_file
+        for attrs in docket_texts:
+            text = attrs.get('text', '')
+            if not text:
+                continue
+            analysis = analyze(text)
+            columns.add(case_number, analysis['type'], analysis['filed_by'],
+                        normalize_date(attrs.get('dateFiled', '')))
+    return columns
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Docket statistics across one or more cases")
+    parser.add_argument("xml_files", nargs="+", help="Docket XML exports")
+    parser.add_argument("--json", help="Write the report to this file (default: stdout)")
+    parser.add_argument("--top-filers", type=int, default=10)
+    args = parser.parse_args()
+
+    report = load_docket_files(args.xml_files).report(args.top_filers)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"✓ Statistics written to {args.json}")
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Docket text analysis shared by the docket loaders and SQL generators.
+
+Every docket entry needs a document type, the filer, the ECF document number
+and a cleaned-up title. The loaders each carried their own copy of a 16-branch
+if/elif chain plus three ad-hoc regexes; here the keyword table is data, it is
+compiled once into a flat priority-ordered matcher, and `analyze` derives all
+four fields from a single upper-casing and a fixed set of precompiled scans.
+
+A single regex alternation over the keyword table was measured to be about
+ten times slower than CPython's substring search for a table this size (see
+benchmark_docket_text.py), so the matcher keeps `in` checks in priority order.
+
+The type rules can also come from a JSON file (docket_type_rules.json next to
+this module if present, or the file named by DOCKET_TYPE_RULES_FILE):
+
+    {
+      "default": "Filing",
+      "rules": [
+        {"type": "Certificate", "keywords": ["CERTIFICATE OF SERVICE"]},
+        {"type": "Order", "patterns": ["\\bORDERED\\b"]}
+      ],
+      "courts": {
+        "ca9": {"rules": [{"type": "Order", "keywords": ["MEMORANDUM DISPOSITION"]}]}
+      }
+    }
+
+"rules" replaces DOCKET_TYPE_RULES when present. Keywords are matched as
+substrings of the upper-cased text and patterns as case-insensitive regexes,
+in rule order. A court's rules are tried before the shared ones, or instead
+of them with "inherit": false. Every loader and generator classifies with the
+same base table; court overrides are only applied where a caller names the
+court, and are meant for genuine per-court docket conventions.
+"""
+
+import json
+import os
+import re
+
+# Ordered (type, keywords) table. The first row with any keyword present in
+# the upper-cased text wins, exactly like the original if/elif chain.
+DOCKET_TYPE_RULES = (
+    ("Certificate", ("CERTIFICATE OF SERVICE", "CERT OF SERVICE")),
+    ("Certificate", ("CERTIFICATE",)),
+    ("Motion", ("MOTION",)),
+    ("Order", ("ORDER",)),
+    ("Response", ("RESPONSE", "OPPOSITION")),
+    ("Reply", ("REPLY",)),
+    ("Notice", ("NOTICE",)),
+    ("Brief", ("BRIEF", "MEMORANDUM")),
+    ("Appeal", ("APPEAL",)),
+    ("Petition", ("PETITION",)),
+    ("Transcript", ("TRANSCRIPT",)),
+    ("Judgment", ("JUDGMENT",)),
+    ("Statement", ("DOCKETING STATEMENT",)),
+    ("Appendix", ("APPENDIX",)),
+    ("Exhibit", ("EXHIBITS", "EXHIBIT")),
+)
+DEFAULT_TYPE = "Filing"
+
+RULES_FILE_ENV = "DOCKET_TYPE_RULES_FILE"
+DEFAULT_RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "docket_type_rules.json")
+
+TITLE_MAX_LENGTH = 1000
+FILED_BY_MAX_LENGTH = 255
+
+# "by <name>" up to the next period; [^.]+ stops at the same place the
+# original lazy `[^\.]+?(?:\.|$)` did once the capture is stripped
+FILED_BY_RE = re.compile(r'\bby\s+([^.]+)', re.IGNORECASE)
+PARENTHETICAL_RE = re.compile(r'\s*\([^)]*\)\s*')
+ECF_NUMBER_RE = re.compile(r'\[(\d{10,})\]')
+# Case-number tags like [24-2160] and ECF numbers, both dropped from titles
+BRACKET_TAG_RE = re.compile(r'\[(?:\d{2}-\d{4}|\d{10,})\]')
+
+
+class TypeClassifier:
+    """An ordered (type, keywords[, patterns]) table compiled into one flat matcher.
+
+    Every keyword and pattern becomes one check in priority order, so a text
+    is classified by the first check that hits without re-reading the table.
+    """
+
+    def __init__(self, rules, default=DEFAULT_TYPE):
+        checks = []
+        for rule in rules:
+            doc_type, keywords = rule[0], rule[1]
+            patterns = rule[2] if len(rule) > 2 else ()
+            checks.extend((keyword.upper(), None, doc_type) for keyword in keywords)
+            checks.extend((None, re.compile(pattern, re.IGNORECASE).search, doc_type)
+                          for pattern in patterns)
+        self.default = default
+
+        if all(search is None for _, search, _ in checks):
+            # Keyword-only tables (the common case) skip the pattern branch
+            flat = tuple((keyword, doc_type) for keyword, _, doc_type in checks)
+
+            def classify_upper(text_upper):
+                for keyword, doc_type in flat:
+                    if keyword in text_upper:
+                        return doc_type
+                return default
+        else:
+            flat = tuple(checks)
+
+            def classify_upper(text_upper):
+                for keyword, search, doc_type in flat:
+                    if keyword is not None:
+                        if keyword in text_upper:
+                            return doc_type
+                    elif search(text_upper):
+                        return doc_type
+                return default
+
+        self.classify_upper = classify_upper
+
+    def classify(self, text):
+        return self.classify_upper(text.upper())
+
+    def classify_batch(self, texts):
+        """Types for an iterable of raw texts, as a list"""
+        classify_upper = self.classify_upper
+        return [classify_upper(text.upper()) for text in texts]
+
+
+def compile_type_rules(rules, default=DEFAULT_TYPE):
+    """Compile an ordered (type, keywords) table into a classifier function.
+
+    The returned function takes already upper-cased text and returns the type
+    of the first rule with a keyword in it, or `default`.
+    """
+    return TypeClassifier(rules, default).classify_upper
+
+
+def _rule_table(rules):
+    return tuple(
+        (rule["type"], tuple(rule.get("keywords", ())), tuple(rule.get("patterns", ())))
+        for rule in rules
+    )
+
+
+def load_type_rules(path=None, court=None):
+    """Build a TypeClassifier from a rules file, optionally for one court.
+
+    `path` defaults to $DOCKET_TYPE_RULES_FILE, then docket_type_rules.json;
+    with no file at all the built-in DOCKET_TYPE_RULES are used.
+    """
+    if path is None:
+        path = os.environ.get(RULES_FILE_ENV) or DEFAULT_RULES_FILE
+        if not os.path.exists(path) and not os.environ.get(RULES_FILE_ENV):
+            path = None
+    config = {}
+    if path is not None:
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)
+
+    rules = _rule_table(config["rules"]) if "rules" in config else DOCKET_TYPE_RULES
+    default = config.get("default", DEFAULT_TYPE)
+    if court:
+        courts = {name.lower(): value for name, value in config.get("courts", {}).items()}
+        override = courts.get(court.lower())
+        if override is None:
+            raise ValueError(f"No type rules for court {court!r} in {path or 'the built-in rules'}")
+        court_rules = _rule_table(override.get("rules", ()))
+        rules = court_rules + rules if override.get("inherit", True) else court_rules
+        default = override.get("default", default)
+    return TypeClassifier(rules, default)
+
+
+_classifiers = {}
+
+
+def type_classifier(court=None):
+    """Shared classifier for `court` (or the base rules), loaded once per process"""
+    key = court.lower() if court else None
+    classifier = _classifiers.get(key)
+    if classifier is None:
+        classifier = _classifiers[key] = load_type_rules(court=court)
+    return classifier
+
+
+classify_upper = type_classifier().classify_upper
+
+
+def classify_batch(texts, court=None):
+    """Document types for many docket texts at once"""
+    return type_classifier(court).classify_batch(texts)
+
+
+def extract_type(text, court=None):
+    """Extract document type from docket text"""
+    if court:
+        return type_classifier(court).classify(text)
+    return classify_upper(text.upper())
+
+
+def extract_filed_by(text, text_upper=None):
+    """Extract who filed the document"""
+    if text_upper is not None and 'BY' not in text_upper:
+        return None
+    match = FILED_BY_RE.search(text)
+    if match:
+        filed_by = match.group(1).strip()
+        if '(' in filed_by:
+            filed_by = PARENTHETICAL_RE.sub(' ', filed_by).strip()
+        return filed_by[:FILED_BY_MAX_LENGTH]
+    return None
+
+
+def extract_ecf_number(text):
+    """Extract ECF number from [10010xxxxx] pattern"""
+    match = ECF_NUMBER_RE.search(text)
+    return match.group(1) if match else None
+
+
+def get_title(text, title_limit=TITLE_MAX_LENGTH):
+    """Get shortened title from text"""
+    cleaned = ' '.join(BRACKET_TAG_RE.sub('', text).split())
+    if len(cleaned) > title_limit:
+        return cleaned[:title_limit - 3] + '...'
+    return cleaned
+
+
+def analyze(text, title_limit=TITLE_MAX_LENGTH, court=None):
+    """Return type, filed_by, ecf_number and title for one docket text"""
+    text_upper = text.upper()
+    classify = type_classifier(court).classify_upper if court else classify_upper
+    return {
+        'type': classify(text_upper),
+        'filed_by': extract_filed_by(text, text_upper),
+        'ecf_number': extract_ecf_number(text),
+        'title': get_title(text, title_limit)
+    }
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Streaming reader for CM/ECF appellate docket XML exports.
+
+Docket exports are a single <caseSummary> document holding a <stub> with the
+case metadata followed by <party>, <caption> and <docketTexts> sections. The
+loaders only need the stub and the docketText attributes, so instead of
+building the whole tree with ET.parse we walk it once with iterparse and drop
+each element as soon as it has been handled. Memory stays flat no matter how
+large the docket is. Parties and their attorneys are read the same way.
+"""
+
+import xml.etree.ElementTree as ET
+
+DOCKET_TAGS = ('stub', 'docketText')
+
+# Attorney attributes carried over into party records
+ATTORNEY_FIELDS = ('firstName', 'middleName', 'lastName', 'email', 'businessPhone',
+                   'personalPhone', 'address1', 'city', 'state', 'zip', 'office')
+# Party names containing these are loaded as organisations
+CORPORATION_MARKERS = ('INC', 'CLUB')
+
+
+def iter_elements(xml_file, tags):
+    """Yield each complete element whose tag is in `tags`, in document order.
+
+    The element (with its children) is only valid until the generator is
+    resumed: it is then cleared and detached from its parent, so the
+    partially built tree never grows beyond the current path.
+    """
+    wanted = set(tags)
+    stack = []
+
+    for event, elem in ET.iterparse(xml_file, events=('start', 'end')):
+        if event == 'start':
+            stack.append(elem)
+            continue
+
+        stack.pop()
+        if elem.tag in wanted:
+            yield elem
+
+        # Drop finished subtrees: wanted elements immediately, everything
+        # else once it is a direct child of the document root.
+        if stack and (elem.tag in wanted or len(stack) == 1):
+            elem.clear()
+            stack[-1].remove(elem)
+
+
+def iter_docket(xml_file, tags=DOCKET_TAGS):
+    """Yield (tag, attributes) for every element in `tags`, in document order"""
+    for elem in iter_elements(xml_file, tags):
+        yield elem.tag, dict(elem.attrib)
+
+
+def party_from_element(party):
+    """Build a party record, with its attorneys, from a <party> element"""
+    name = party.get('info', '')
+    # The type attribute spans several lines in the export; collapse it
+    role = ' '.join(party.get('type', '').split())
+
+    attorneys = []
+    for attorney_elem in party.iter('attorney'):
+        attorney = {
+            field: attorney_elem.get(field)
+            for field in ATTORNEY_FIELDS
+            if field in attorney_elem.attrib
+        }
+        attorney['full_name'] = ' '.join(
+            attorney[part] for part in ('firstName', 'middleName', 'lastName') if attorney.get(part)
+        )
+        if attorney['full_name']:
+            attorneys.append(attorney)
+
+    upper = name.upper()
+    return {
+        'name': name,
+        'type_description': role,
+        'type': 'Corporation' if any(m in upper for m in CORPORATION_MARKERS) else 'Individual',
+        'role': role,
+        'attorneys': attorneys
+    }
+
+
+def iter_parties(xml_file):
+    """Yield one party record (with nested attorneys) per <party> element"""
+    for party in iter_elements(xml_file, ('party',)):
+        yield party_from_element(party)
+
+
+def read_stub(xml_file):
+    """Return the <stub> attributes without reading past the stub element"""
+    for tag, attrs in iter_docket(xml_file, tags=('stub',)):
+        return attrs
+    return None
+
+
+def open_docket(xml_file):
+    """Single-pass reader returning (stub_attributes, docket_text_iterator).
+
+    The stub is read eagerly; the docketText entries are produced lazily from
+    the same iterparse pass. docketText elements that happen to precede the
+    stub are buffered and replayed first.
+    """
+    events = iter_docket(xml_file)
+    stub = None
+    pending = []
+
+    for tag, attrs in events:
+        if tag == 'stub':
+            stub = attrs
+            break
+        pending.append(attrs)
+
+    def entries():
+        yield from pending
+        pending.clear()
+        for tag, attrs in events:
+            if tag == 'docketText':
+                yield attrs
+
+    return stub, entries()
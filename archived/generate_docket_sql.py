@@ -2,98 +2,53 @@
 """
 Enterprise Agent 3: Docket Entries Loader
 Generate SQL INSERT statements for all docket entries
+
+Entries are streamed from the XML and written to disk as they are parsed, as
+chunked multi-row INSERT statements (default) or as a psql COPY script, so
+memory use does not grow with the size of the docket. Output ending in .gz
+(or --gzip) is gzip-compressed and can be applied with
+`gunzip -c file.sql.gz | psql`.
+
+Usage:
+  python generate_docket_sql.py [xml_file] [-o output] [--format sql|copy]
+                                [--chunk-size N] [--gzip]
 """
 
+import argparse
+import gzip
+import os
+import sys
+import tempfile
 import xml.etree.ElementTree as ET
 import uuid
-import re
 from datetime import datetime
 from collections import Counter
 
+from docket_dates import normalize_date
+from docket_text import analyze
+from docket_xml import open_docket
+
 # XML file path
 XML_FILE = "04_24-2160_Docket.xml"
 SQL_OUTPUT = "docket_entries_insert.sql"
 
+# Rows per multi-row INSERT statement
+CHUNK_SIZE = 500
+SAMPLE_SIZE = 5
+
+INSERT_COLUMNS = (
+    'id', 'case_id', 'sequence_number', 'date_filed', 'type', 'title',
+    'description', 'filed_by', 'is_sealed', 'ecf_number', 'created_at'
+)
+# Columns carried in COPY data; case_id and created_at are filled in on insert
+COPY_COLUMNS = (
+    'id', 'sequence_number', 'date_filed', 'type', 'title',
+    'description', 'filed_by', 'is_sealed', 'ecf_number'
+)
+
 def parse_date(date_str):
     """Convert MM/DD/YYYY to YYYY-MM-DD"""
-    if not date_str:
-        return None
-    try:
-        dt = datetime.strptime(date_str, "%m/%d/%Y")
-        return dt.strftime("%Y-%m-%d")
-    except:
-        return None
-
-def extract_type(text):
-    """Extract document type from docket text"""
-    text_upper = text.upper()
-
-    # Order matters - check specific patterns first
-    if "CERTIFICATE OF SERVICE" in text_upper or "CERT OF SERVICE" in text_upper:
-        return "Certificate"
-    elif "CERTIFICATE" in text_upper:
-        return "Certificate"
-    elif "MOTION" in text_upper:
-        return "Motion"
-    elif "ORDER" in text_upper:
-        return "Order"
-    elif "RESPONSE" in text_upper or "OPPOSITION" in text_upper:
-        return "Response"
-    elif "REPLY" in text_upper:
-        return "Reply"
-    elif "NOTICE" in text_upper:
-        return "Notice"
-    elif "BRIEF" in text_upper or "MEMORANDUM" in text_upper:
-        return "Brief"
-    elif "APPEAL" in text_upper:
-        return "Appeal"
-    elif "PETITION" in text_upper:
-        return "Petition"
-    elif "TRANSCRIPT" in text_upper:
-        return "Transcript"
-    elif "JUDGMENT" in text_upper:
-        return "Judgment"
-    elif "DOCKETING STATEMENT" in text_upper:
-        return "Statement"
-    elif "APPENDIX" in text_upper:
-        return "Appendix"
-    elif "EXHIBITS" in text_upper or "EXHIBIT" in text_upper:
-        return "Exhibit"
-    else:
-        return "Filing"
-
-def extract_filed_by(text):
-    """Extract who filed the document"""
-    # Pattern: "by [Name]"
-    match = re.search(r'\bby\s+([^\.]+?)(?:\.|$)', text, re.IGNORECASE)
-    if match:
-        filed_by = match.group(1).strip()
-        # Clean up common patterns
-        filed_by = re.sub(r'\s*\([^)]*\)\s*', ' ', filed_by).strip()
-        if len(filed_by) > 255:
-            filed_by = filed_by[:255]
-        return filed_by
-    return None
-
-def extract_ecf_number(text):
-    """Extract ECF number from [10010xxxxx] pattern"""
-    match = re.search(r'\[(\d{10,})\]', text)
-    if match:
-        return match.group(1)
-    return None
-
-def get_title(text):
-    """Get shortened title from text"""
-    # Remove case number patterns like [24-2160]
-    cleaned = re.sub(r'\[\d{2}-\d{4}\]', '', text)
-    # Remove ECF numbers
-    cleaned = re.sub(r'\[\d{10,}\]', '', cleaned)
-    # Clean up whitespace
-    cleaned = ' '.join(cleaned.split())
-    # Limit to 1000 chars
-    if len(cleaned) > 1000:
-        return cleaned[:997] + "..."
-    return cleaned
+    return normalize_date(date_str)
 
 def sql_escape(value):
     """Escape strings for SQL"""
@@ -107,138 +62,268 @@ def sql_escape(value):
     escaped = str(value).replace("'", "''")
     return f"'{escaped}'"
 
+def copy_escape(value):
+    """Encode a value for COPY text format"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return (str(value)
+            .replace('\\', '\\\\')
+            .replace('\t', '\\t')
+            .replace('\n', '\\n')
+            .replace('\r', '\\r'))
+
+def open_output(path, compress):
+    """Open the output file for text writing, gzip-compressed if requested"""
+    if compress:
+        return gzip.open(path, 'wt', encoding='utf-8')
+    return open(path, 'w', encoding='utf-8')
+
+class SqlInsertWriter:
+    """Writes entries as chunked multi-row INSERTs inside a DO $$ block"""
+
+    def __init__(self, out, case_number, chunk_size=CHUNK_SIZE):
+        self.out = out
+        self.case_number = case_number
+        self.chunk_size = chunk_size
+        self.rows = []
+        self.count = 0
+
+    def begin(self):
+        case = sql_escape(self.case_number)
+        self.out.write(f"-- First, get the case_id for case {self.case_number}\n")
+        self.out.write("DO $$\n")
+        self.out.write("DECLARE\n")
+        self.out.write("    v_case_id UUID;\n")
+        self.out.write("BEGIN\n")
+        self.out.write("    -- Get case_id\n")
+        self.out.write(f"    SELECT id INTO v_case_id FROM cases WHERE case_number = {case};\n")
+        self.out.write("\n")
+        self.out.write("    IF v_case_id IS NULL THEN\n")
+        self.out.write(f"        RAISE EXCEPTION {sql_escape(f'Case {self.case_number} not found')};\n")
+        self.out.write("    END IF;\n")
+        self.out.write("\n")
+        self.out.write("    -- Insert docket entries\n")
+
+    def add(self, entry):
+        self.rows.append(
+            "        ("
+            f"{sql_escape(entry['id'])}, v_case_id, {entry['sequence_number']}, "
+            f"{sql_escape(entry['date_filed'])}, {sql_escape(entry['type'])}, "
+            f"{sql_escape(entry['title'])}, {sql_escape(entry['description'])}, "
+            f"{sql_escape(entry['filed_by'])}, FALSE, {sql_escape(entry['ecf_number'])}, "
+            "CURRENT_TIMESTAMP)"
+        )
+        self.count += 1
+        if len(self.rows) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        self.out.write(f"    INSERT INTO docket_entries ({', '.join(INSERT_COLUMNS)})\n")
+        self.out.write("    VALUES\n")
+        self.out.write(",\n".join(self.rows))
+        self.out.write(";\n\n")
+        self.rows = []
+
+    def end(self):
+        self.flush()
+        self.out.write(f"    RAISE NOTICE 'Successfully inserted % docket entries', {self.count};\n")
+        self.out.write("END $$;\n")
+
+class CopyWriter:
+    """Writes entries as a psql script: COPY into a temp table, then one INSERT"""
+
+    def __init__(self, out, case_number):
+        self.out = out
+        self.case_number = case_number
+        self.count = 0
+
+    def begin(self):
+        case = sql_escape(self.case_number)
+        self.out.write("BEGIN;\n\n")
+        self.out.write("DO $$\n")
+        self.out.write("BEGIN\n")
+        self.out.write(f"    IF NOT EXISTS (SELECT 1 FROM cases WHERE case_number = {case}) THEN\n")
+        self.out.write(f"        RAISE EXCEPTION {sql_escape(f'Case {self.case_number} not found')};\n")
+        self.out.write("    END IF;\n")
+        self.out.write("END $$;\n\n")
+        self.out.write("CREATE TEMP TABLE docket_entries_import ON COMMIT DROP AS\n")
+        self.out.write(f"SELECT {', '.join(COPY_COLUMNS)} FROM docket_entries WITH NO DATA;\n\n")
+        self.out.write(f"COPY docket_entries_import ({', '.join(COPY_COLUMNS)}) FROM STDIN;\n")
+
+    def add(self, entry):
+        row = (
+            entry['id'], entry['sequence_number'], entry['date_filed'], entry['type'],
+            entry['title'], entry['description'], entry['filed_by'], False, entry['ecf_number']
+        )
+        self.out.write('\t'.join(copy_escape(v) for v in row))
+        self.out.write('\n')
+        self.count += 1
+
+    def end(self):
+        case = sql_escape(self.case_number)
+        self.out.write("\\.\n\n")
+        self.out.write(f"INSERT INTO docket_entries ({', '.join(INSERT_COLUMNS)})\n")
+        self.out.write(
+            "SELECT i.id, c.id, i.sequence_number, i.date_filed, i.type, i.title,\n"
+            "       i.description, i.filed_by, i.is_sealed, i.ecf_number, CURRENT_TIMESTAMP\n"
+        )
+        self.out.write("FROM docket_entries_import i\n")
+        self.out.write(f"JOIN cases c ON c.case_number = {case};\n\n")
+        self.out.write("COMMIT;\n")
+
+def write_sql_file(path, compress, xml_file, case_number, docket_texts, args):
+    """Write the SQL for `docket_texts` to `path`.
+
+    Returns (total_entries, type_counter, min_date, max_date, samples), or
+    None when the XML turned out to be malformed or held no entries.
+    """
+    # Running statistics only; entries are written out as they are parsed
+    total_entries = 0
+    type_counter = Counter()
+    min_date = max_date = None
+    samples = []
+
+    with open_output(path, compress) as f:
+        f.write("-- Docket Entries INSERT Statements\n")
+        f.write(f"-- Generated from: {xml_file}\n")
+        f.write(f"-- Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write("\n")
+
+        if args.format == 'copy':
+            writer = CopyWriter(f, case_number)
+        else:
+            writer = SqlInsertWriter(f, case_number, args.chunk_size)
+        writer.begin()
+
+        try:
+            for idx, docket_text in enumerate(docket_texts, 1):
+                date_filed = docket_text.get('dateFiled', '')
+                text = docket_text.get('text', '')
+
+                # Parse data
+                parsed_date = parse_date(date_filed)
+                analysis = analyze(text)
+
+                # Track statistics
+                total_entries += 1
+                type_counter[analysis['type']] += 1
+                if parsed_date:
+                    min_date = parsed_date if min_date is None else min(min_date, parsed_date)
+                    max_date = parsed_date if max_date is None else max(max_date, parsed_date)
+
+                entry = {
+                    'id': str(uuid.uuid4()),
+                    'sequence_number': idx,
+                    'date_filed': parsed_date,
+                    'type': analysis['type'],
+                    'title': analysis['title'],
+                    'description': text,
+                    'filed_by': analysis['filed_by'],
+                    'ecf_number': analysis['ecf_number'],
+                    'doc_link': docket_text.get('docLink', '')
+                }
+                writer.add(entry)
+                if len(samples) < SAMPLE_SIZE:
+                    samples.append(entry)
+        except ET.ParseError as e:
+            print(f"ERROR: Failed to parse XML: {e}")
+            return None
+
+        writer.end()
+        f.write("\n")
+        f.write(f"-- Total entries: {total_entries}\n")
+        f.write("-- Verify insertion\n")
+        f.write("SELECT COUNT(*) as total_entries, MIN(date_filed) as earliest_date, MAX(date_filed) as latest_date\n")
+        f.write("FROM docket_entries\n")
+        f.write(f"WHERE case_id = (SELECT id FROM cases WHERE case_number = {sql_escape(case_number)});\n")
+
+
+    if not total_entries:
+        print("ERROR: No docketText elements found in XML")
+        return None
+    return total_entries, type_counter, min_date, max_date, samples
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate docket entry SQL from a docket XML export")
+    parser.add_argument("xml_file", nargs="?", default=XML_FILE,
+                        help=f"Docket XML export (default: {XML_FILE})")
+    parser.add_argument("-o", "--output", default=SQL_OUTPUT,
+                        help=f"Output file (default: {SQL_OUTPUT})")
+    parser.add_argument("--format", choices=("sql", "copy"), default="sql",
+                        help="Chunked multi-row INSERTs (sql) or a psql COPY script (copy)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                        help=f"Rows per INSERT statement in sql format (default: {CHUNK_SIZE})")
+    parser.add_argument("--gzip", action="store_true",
+                        help="Gzip the output (implied by a .gz output name)")
+    args = parser.parse_args()
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+    return args
+
 def main():
+    args = parse_args()
+    xml_file = args.xml_file
+    sql_output = args.output
+    compress = args.gzip or sql_output.endswith('.gz')
+    if args.gzip and not sql_output.endswith('.gz'):
+        sql_output += '.gz'
+
     print("=" * 80)
     print("AGENT 3: DOCKET ENTRIES LOADER (SQL GENERATOR)")
     print("=" * 80)
     print()
 
-    # Parse XML file
-    print(f"[1/4] Parsing XML file: {XML_FILE}")
+    # Stream docketText entries straight out of the XML (single pass)
+    print(f"[1/4] Parsing XML file: {xml_file}")
     try:
-        tree = ET.parse(XML_FILE)
-        root = tree.getroot()
-    except Exception as e:
+        stub, docket_texts = open_docket(xml_file)
+    except (ET.ParseError, OSError) as e:
         print(f"ERROR: Failed to parse XML: {e}")
-        return
+        return 1
+    case_number = (stub or {}).get('caseNumber') or '24-2160'
 
-    # Find all docketText elements
     print("[2/4] Extracting docketText entries...")
-    docket_texts = root.findall('.//docketText')
-
-    if not docket_texts:
-        print("ERROR: No docketText elements found in XML")
-        return
+    print(f"[3/4] Parsing and writing {args.format.upper()} to {sql_output}...")
 
-    total_entries = len(docket_texts)
-    print(f"✓ Found {total_entries} docket entries")
-    print()
+    # Written next to the destination and moved over it only once complete,
+    # so a failed run never leaves a truncated file in place of a good one
+    fd, tmp_output = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(sql_output)),
+                                      prefix=f".{os.path.basename(sql_output)}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        written = write_sql_file(tmp_output, compress, xml_file, case_number, docket_texts, args)
+    except BaseException:
+        os.unlink(tmp_output)
+        raise
+    if written is None:
+        os.unlink(tmp_output)
+        return 1
+    total_entries, type_counter, min_date, max_date, samples = written
+    os.chmod(tmp_output, 0o644)
+    os.replace(tmp_output, sql_output)
 
-    # Parse entries
-    print("[3/4] Parsing docket entry data...")
-    entries = []
-    type_counter = Counter()
-    dates = []
-
-    for idx, docket_text in enumerate(docket_texts, 1):
-        date_filed = docket_text.get('dateFiled', '')
-        text = docket_text.get('text', '')
-        doc_link = docket_text.get('docLink', '')
-
-        # Parse data
-        parsed_date = parse_date(date_filed)
-        doc_type = extract_type(text)
-        filed_by = extract_filed_by(text)
-        ecf_number = extract_ecf_number(text)
-        title = get_title(text)
-
-        # Track statistics
-        type_counter[doc_type] += 1
-        if parsed_date:
-            dates.append(parsed_date)
-
-        entry = {
-            'id': str(uuid.uuid4()),
-            'sequence_number': idx,
-            'date_filed': parsed_date,
-            'type': doc_type,
-            'title': title,
-            'description': text,
-            'filed_by': filed_by,
-            'ecf_number': ecf_number,
-            'doc_link': doc_link
-        }
-        entries.append(entry)
-
-    # Print statistics
-    print(f"✓ Parsed {len(entries)} entries")
+    print(f"✓ Parsed {total_entries} entries")
     print()
     print("Entry Type Distribution:")
-    for doc_type, count in sorted(type_counter.items(), key=lambda x: x[1], reverse=True):
+    for doc_type, count in type_counter.most_common():
         print(f"  - {count:3d} {doc_type}(s)")
 
-    if dates:
-        dates_sorted = sorted(dates)
+    if min_date:
         print()
-        print(f"Date Range: {dates_sorted[0]} to {dates_sorted[-1]}")
+        print(f"Date Range: {min_date} to {max_date}")
     print()
 
-    # Generate SQL
-    print(f"[4/4] Generating SQL INSERT statements...")
-    with open(SQL_OUTPUT, 'w') as f:
-        f.write("-- Docket Entries INSERT Statements\n")
-        f.write(f"-- Generated from: {XML_FILE}\n")
-        f.write(f"-- Total entries: {total_entries}\n")
-        f.write(f"-- Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write("\n")
-        f.write("-- First, get the case_id for case 24-2160\n")
-        f.write("DO $$\n")
-        f.write("DECLARE\n")
-        f.write("    v_case_id UUID;\n")
-        f.write("BEGIN\n")
-        f.write("    -- Get case_id\n")
-        f.write("    SELECT id INTO v_case_id FROM cases WHERE case_number = '24-2160';\n")
-        f.write("\n")
-        f.write("    IF v_case_id IS NULL THEN\n")
-        f.write("        RAISE EXCEPTION 'Case 24-2160 not found';\n")
-        f.write("    END IF;\n")
-        f.write("\n")
-        f.write("    -- Insert docket entries\n")
-
-        for entry in entries:
-            date_val = sql_escape(entry['date_filed']) if entry['date_filed'] else 'NULL'
-
-            f.write(f"    INSERT INTO docket_entries (id, case_id, sequence_number, date_filed, type, title, description, filed_by, is_sealed, ecf_number, created_at)\n")
-            f.write(f"    VALUES (\n")
-            f.write(f"        {sql_escape(entry['id'])},\n")
-            f.write(f"        v_case_id,\n")
-            f.write(f"        {entry['sequence_number']},\n")
-            f.write(f"        {date_val},\n")
-            f.write(f"        {sql_escape(entry['type'])},\n")
-            f.write(f"        {sql_escape(entry['title'])},\n")
-            f.write(f"        {sql_escape(entry['description'])},\n")
-            f.write(f"        {sql_escape(entry['filed_by'])},\n")
-            f.write(f"        FALSE,\n")
-            f.write(f"        {sql_escape(entry['ecf_number'])},\n")
-            f.write(f"        CURRENT_TIMESTAMP\n")
-            f.write(f"    );\n")
-            f.write("\n")
-
-        f.write("    RAISE NOTICE 'Successfully inserted % docket entries', {0};\n".format(total_entries))
-        f.write("END $$;\n")
-        f.write("\n")
-        f.write("-- Verify insertion\n")
-        f.write("SELECT COUNT(*) as total_entries, MIN(date_filed) as earliest_date, MAX(date_filed) as latest_date\n")
-        f.write("FROM docket_entries\n")
-        f.write("WHERE case_id = (SELECT id FROM cases WHERE case_number = '24-2160');\n")
-
-    print(f"✓ SQL file generated: {SQL_OUTPUT}")
+    print(f"[4/4] ✓ SQL file generated: {sql_output}")
     print()
 
     # Show sample entries
-    print("Sample Entries (first 5):")
+    print(f"Sample Entries (first {SAMPLE_SIZE}):")
     print("-" * 80)
-    for i, entry in enumerate(entries[:5], 1):
+    for i, entry in enumerate(samples, 1):
         print(f"{i}. [{entry['date_filed']}] {entry['type']}: {entry['title'][:60]}...")
         if entry['filed_by']:
             print(f"   Filed by: {entry['filed_by']}")
@@ -248,21 +333,29 @@ def main():
     print("SUMMARY REPORT")
     print("=" * 80)
     print(f"Total entries found in XML: {total_entries}")
-    print(f"SQL statements generated:   {total_entries}")
+    if args.format == 'copy':
+        print(f"COPY rows written:          {total_entries}")
+    else:
+        print(f"INSERT statements written:  {-(-total_entries // args.chunk_size)} "
+              f"({args.chunk_size} rows each)")
     print()
     print("Entry Type Summary:")
-    for doc_type, count in sorted(type_counter.items(), key=lambda x: x[1], reverse=True):
+    for doc_type, count in type_counter.most_common():
         print(f"  {count:3d} {doc_type}(s)")
     print()
-    if dates:
-        print(f"Date Range: {dates_sorted[0]} to {dates_sorted[-1]}")
+    if min_date:
+        print(f"Date Range: {min_date} to {max_date}")
     print()
-    print(f"Output File: {SQL_OUTPUT}")
+    print(f"Output File: {sql_output}")
     print()
-    print("To execute: psql [connection-string] < docket_entries_insert.sql")
+    if compress:
+        print(f"To execute: gunzip -c {sql_output} | psql [connection-string]")
+    else:
+        print(f"To execute: psql [connection-string] < {sql_output}")
     print()
     print("✓ AGENT 3 SQL GENERATION COMPLETE")
     print("=" * 80)
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Enterprise Agent 3: Multi-Docket Ingestion
+Parse every docket XML export in a directory (or glob) in parallel and load
+the entries into PostgreSQL through a small set of writer connections
+
+Parsing and classification run in a process pool; parsed dockets are handed
+to a bounded queue drained by writer threads, each holding its own database
+connection. A failure in one file (bad XML, missing stub, database error) is
+reported and counted without stopping the rest of the run.
+
+Usage:
+  python ingest_dockets.py /exports/dockets
+  python ingest_dockets.py "/exports/dockets/04_*_Docket.xml" --writers 4
+  python ingest_dockets.py /exports/dockets --dry-run
+"""
+
+import argparse
+import glob
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from docket_db import ConnectionPool
+from docket_xml import open_docket
+from load_docket_entries_pg8000 import (
+    BULK_BATCH_SIZE,
+    BULK_MODES,
+    case_info_from_stub,
+    docket_entry_from_xml,
+    get_or_create_case,
+    insert_docket_entries_bulk,
+)
+
+DEFAULT_PATTERN = "*.xml"
+DEFAULT_WRITERS = 4
+
+
+def find_docket_files(sources, pattern=DEFAULT_PATTERN):
+    """Expand directories and glob patterns into a sorted list of XML files"""
+    files = set()
+    for source in sources:
+        if os.path.isdir(source):
+            files.update(glob.glob(os.path.join(source, "**", pattern), recursive=True))
+        else:
+            files.update(p for p in glob.glob(source) if os.path.isfile(p))
+    return sorted(files)
+
+
+def parse_docket_file(xml_file):
+    """Parse one docket export (runs in a worker process).
+
+    Returns (case_info, entries, seconds). Raises on unreadable XML or a
+    missing <stub>, so the caller can isolate the failure to this file.
+    """
+    start = time.perf_counter()
+    stub, docket_texts = open_docket(xml_file)
+    case_info = case_info_from_stub(stub)
+    if not case_info or not case_info['case_number']:
+        raise ValueError("no <stub> case metadata found")
+
+    entries = []
+    for attrs in docket_texts:
+        if attrs.get('text'):
+            entries.append(docket_entry_from_xml(str(len(entries) + 1), attrs))
+
+    return case_info, entries, time.perf_counter() - start
+
+
+class IngestStats:
+    """Thread-safe run counters"""
+
+    def __init__(self, total_files):
+        self.lock = threading.Lock()
+        self.total_files = total_files
+        self.done = 0
+        self.loaded = 0
+        self.failed = []
+        self.entries = 0
+        self.inserted = 0
+        self.skipped = 0
+
+    def fail(self, xml_file, stage, error):
+        with self.lock:
+            self.done += 1
+            self.failed.append((xml_file, stage, str(error)))
+            print(f"  ✗ [{self.done}/{self.total_files}] {os.path.basename(xml_file)}: {stage} failed: {error}")
+
+    def succeed(self, xml_file, case_number, entries, inserted, skipped):
+        with self.lock:
+            self.done += 1
+            self.loaded += 1
+            self.entries += entries
+            self.inserted += inserted
+            self.skipped += skipped
+            print(f"  ✓ [{self.done}/{self.total_files}] {os.path.basename(xml_file)} "
+                  f"({case_number}): {entries} entries, {inserted} inserted, {skipped} skipped")
+
+
+def writer_worker(pool, work, stats, batch_size, mode):
+    """Drain parsed dockets from `work` into the database on one connection"""
+    conn = None
+    while True:
+        item = work.get()
+        if item is None:
+            break
+        xml_file, case_info, entries = item
+
+        try:
+            if conn is None:
+                conn = pool.acquire()
+            case_id = get_or_create_case(conn, case_info)
+            if not case_id:
+                raise RuntimeError(f"could not resolve case {case_info['case_number']}")
+            inserted, skipped = insert_docket_entries_bulk(
+                conn, case_id, entries, batch_size, mode, verbose=False, stop_on_error=True
+            )
+            stats.succeed(xml_file, case_info['case_number'], len(entries), inserted, skipped)
+        except Exception as e:
+            stats.fail(xml_file, "load", e)
+            # Drop the connection; the next item reconnects
+            if conn is not None:
+                pool.release(conn, discard=True)
+                conn = None
+
+    if conn is not None:
+        pool.release(conn)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Ingest many docket XML exports in parallel")
+    parser.add_argument("sources", nargs="+", help="Directories or glob patterns of docket XML files")
+    parser.add_argument("--pattern", default=DEFAULT_PATTERN,
+                        help=f"File pattern when a source is a directory (default: {DEFAULT_PATTERN})")
+    parser.add_argument("--parse-workers", type=int, default=os.cpu_count(),
+                        help="Parser processes (default: CPU count)")
+    parser.add_argument("--writers", type=int, default=DEFAULT_WRITERS,
+                        help=f"Database writer connections (default: {DEFAULT_WRITERS})")
+    parser.add_argument("--bulk", choices=BULK_MODES, default="copy",
+                        help="Bulk load mode (default: copy)")
+    parser.add_argument("--batch-size", type=int, default=BULK_BATCH_SIZE,
+                        help=f"Entries per bulk transaction (default: {BULK_BATCH_SIZE})")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Parse and classify only; do not touch the database")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print("=" * 80)
+    print("AGENT 3: MULTI-DOCKET INGESTION")
+    print("=" * 80)
+
+    files = find_docket_files(args.sources, args.pattern)
+    if not files:
+        print("ERROR: No docket XML files found")
+        return 1
+    print(f"Found {len(files)} docket files "
+          f"({args.parse_workers} parsers, {0 if args.dry_run else args.writers} writers)")
+    print()
+
+    stats = IngestStats(len(files))
+    # Parsed dockets waiting for a writer. Together with the window of
+    # in-flight parses below, this bounds how many dockets are held in memory.
+    work = queue.Queue(maxsize=max(1, args.writers) * 2)
+    db_pool = ConnectionPool(size=max(1, args.writers))
+    writers = []
+    if not args.dry_run:
+        for _ in range(max(1, args.writers)):
+            thread = threading.Thread(
+                target=writer_worker, args=(db_pool, work, stats, args.batch_size, args.bulk), daemon=True
+            )
+            thread.start()
+            writers.append(thread)
+
+    started = time.perf_counter()
+    parse_seconds = 0.0
+
+    parse_workers = max(1, args.parse_workers or 1)
+    with ProcessPoolExecutor(max_workers=parse_workers) as executor:
+        # Only `parse_workers` files are in flight; the next one is submitted
+        # when a result has been handed on, so a blocked queue stops parsing
+        remaining = iter(files)
+        in_flight = {}
+
+        def submit_next():
+            xml_file = next(remaining, None)
+            if xml_file is not None:
+                in_flight[executor.submit(parse_docket_file, xml_file)] = xml_file
+
+        for _ in range(parse_workers):
+            submit_next()
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                xml_file = in_flight.pop(future)
+                try:
+                    case_info, entries, seconds = future.result()
+                except Exception as e:
+                    stats.fail(xml_file, "parse", e)
+                else:
+                    parse_seconds += seconds
+                    if args.dry_run:
+                        stats.succeed(xml_file, case_info['case_number'], len(entries), 0, 0)
+                    else:
+                        work.put((xml_file, case_info, entries))
+                submit_next()
+            # Drop the last references so a handed-on docket is not kept
+            # alive while waiting for the next parse
+            done = future = case_info = entries = None
+
+    for _ in writers:
+        work.put(None)
+    for thread in writers:
+        thread.join()
+    db_pool.close()
+
+    elapsed = time.perf_counter() - started
+
+    print()
+    print("=" * 80)
+    print("SUMMARY REPORT")
+    print("=" * 80)
+    print(f"Files found:        {len(files)}")
+    print(f"Files loaded:       {stats.loaded}")
+    print(f"Files failed:       {len(stats.failed)}")
+    print(f"Entries parsed:     {stats.entries}")
+    if not args.dry_run:
+        print(f"Entries inserted:   {stats.inserted}")
+        print(f"Entries skipped:    {stats.skipped}")
+    print(f"Parse worker time:  {parse_seconds:.2f}s (summed over parsers)")
+    print(f"Wall time:          {elapsed:.2f}s")
+    if elapsed > 0:
+        print(f"Throughput:         {stats.entries / elapsed:,.0f} entries/sec")
+
+    if stats.failed:
+        print()
+        print("Failures:")
+        for xml_file, stage, error in stats.failed:
+            print(f"  - {xml_file} ({stage}): {error}")
+
+    return 1 if stats.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Enterprise Agent 3: Async Multi-Docket Ingestion
+Stream docket XML exports into PostgreSQL with asyncpg, overlapping parsing
+with database round trips
+
+One producer streams each XML file with iterparse in a worker thread, and
+classifies the entries in batches (docket_entry_from_xml). It then puts the
+batches on a bounded asyncio queue. Several consumer tasks take batches off
+the queue and load each one in its own transaction on a pooled connection:
+binary COPY (or executemany) into a temp staging table, then the same
+set-wise merge the pg8000 bulk loader uses.
+
+While a consumer waits on the network, the event loop keeps the producer
+going, so latency to a remote pooled endpoint is hidden behind parsing.
+When the consumers fall behind, the full queue blocks the producer. At most
+--queue-size batches are ever held in memory.
+
+The summary reports the time spent in each stage. Parse, case lookups and
+inserts are busy time. Producer blocked means waiting on a full queue;
+consumers idle means waiting on an empty one. Busy time above the wall time
+is work that overlapped.
+
+Usage:
+  python ingest_dockets_async.py /exports/dockets
+  python ingest_dockets_async.py "/exports/dockets/04_*_Docket.xml" --consumers 8 --queue-size 16
+  python ingest_dockets_async.py /exports/dockets --dry-run
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import date, datetime
+
+try:
+    import asyncpg
+except ImportError:
+    print("ERROR: asyncpg is not installed. Please install it using:")
+    print("  pip install asyncpg")
+    exit(1)
+
+from docket_db import DatabaseConfigError, db_params_from_env
+from docket_xml import open_docket
+from ingest_dockets import DEFAULT_PATTERN, find_docket_files
+from load_docket_entries_pg8000 import (
+    BULK_BATCH_SIZE,
+    BULK_COLUMNS,
+    BULK_MODES,
+    MERGE_STAGE_SQL,
+    STAGE_TABLE_SQL,
+    case_info_from_stub,
+    docket_entry_from_xml,
+)
+
+DEFAULT_CONSUMERS = 4
+
+CASE_LOOKUP_SQL = "SELECT id FROM cases WHERE case_number = $1"
+CASE_INSERT_SQL = """
+    INSERT INTO cases (
+        id, case_number, title, court, filing_date, nature_of_suit,
+        status, created_at, updated_at
+    )
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
+    RETURNING id
+"""
+STAGE_INSERT_SQL = (
+    f"INSERT INTO docket_entries_stage ({', '.join(BULK_COLUMNS)}) "
+    f"VALUES ({', '.join(f'${i}' for i in range(1, len(BULK_COLUMNS) + 1))})"
+)
+
+
+def connect_params(params=None):
+    """asyncpg connection arguments from the docket_db environment settings"""
+    params = params if params is not None else db_params_from_env()
+    return {
+        "host": params["host"],
+        "port": params["port"],
+        "user": params["user"],
+        "password": params["password"],
+        "database": params["database"],
+        "ssl": "require" if params.get("ssl_context") else False,
+        # PgBouncer-style poolers in transaction mode (Neon's "-pooler" hosts)
+        # cannot keep named prepared statements across transactions
+        "statement_cache_size": 0 if "-pooler" in params["host"] else 100,
+    }
+
+
+def iso_date(value):
+    return date.fromisoformat(value) if value else None
+
+
+def entry_record(case_id, entry, now):
+    """BULK_COLUMNS tuple with the Python types asyncpg's binary codecs expect"""
+    text = entry['text']
+    return (
+        uuid.uuid4(),
+        case_id,
+        int(entry['entry_number']),
+        iso_date(entry['date_filed']),
+        text,
+        entry['type'],
+        entry['filed_by'],
+        entry['ecf_number'],
+        entry['title'],
+        text[:500] if text else None,
+        now,
+        now
+    )
+
+
+def entry_batches(docket_texts, batch_size):
+    """Parse and classify docketText attributes into lists of entry dicts"""
+    batch = []
+    count = 0
+    for attrs in docket_texts:
+        if attrs.get('text'):
+            count += 1
+            batch.append(docket_entry_from_xml(str(count), attrs))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+async def get_or_create_case(pool, case_info):
+    """Case id for `case_info`, creating the case if needed"""
+    async with pool.acquire() as conn:
+        case_id = await conn.fetchval(CASE_LOOKUP_SQL, case_info['case_number'])
+        if case_id is None:
+            now = datetime.now()
+            case_id = await conn.fetchval(
+                CASE_INSERT_SQL, uuid.uuid4(), case_info['case_number'], case_info['short_title'],
+                case_info['orig_court'], iso_date(case_info['date_filed']),
+                case_info['nature_of_suit'], 'Active', now, now
+            )
+    return case_id
+
+
+async def insert_batch(pool, case_id, entries, mode='copy'):
+    """Stage and merge one batch in a single transaction; returns (inserted, skipped)"""
+    now = datetime.now()
+    records = [entry_record(case_id, entry, now) for entry in entries]
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            await conn.execute(STAGE_TABLE_SQL)
+            if mode == 'copy':
+                await conn.copy_records_to_table(
+                    'docket_entries_stage', records=records, columns=list(BULK_COLUMNS)
+                )
+            else:
+                await conn.executemany(STAGE_INSERT_SQL, records)
+            result = await conn.fetch(MERGE_STAGE_SQL)
+    return len(result), len(entries) - len(result)
+
+
+class PipelineStats:
+    """Per-file progress and per-stage timing; only touched from the event loop"""
+
+    def __init__(self, total_files):
+        self.total_files = total_files
+        self.files = {}
+        self.done = 0
+        self.loaded = 0
+        self.failed = []
+        self.entries = 0
+        self.inserted = 0
+        self.skipped = 0
+        self.batches = 0
+        self.max_depth = 0
+        # Seconds per stage
+        self.parse = 0.0
+        self.case = 0.0
+        self.blocked = 0.0
+        self.insert = 0.0
+        self.idle = 0.0
+
+    def begin(self, xml_file):
+        self.files[xml_file] = {'case_number': None, 'pending': 0, 'parsed': False,
+                                'entries': 0, 'inserted': 0, 'skipped': 0, 'error': None}
+
+    def queued(self, xml_file):
+        self.files[xml_file]['pending'] += 1
+
+    def batch_done(self, xml_file, entries, inserted, skipped):
+        progress = self.files[xml_file]
+        progress['pending'] -= 1
+        progress['entries'] += entries
+        progress['inserted'] += inserted
+        progress['skipped'] += skipped
+        self.batches += 1
+        self._maybe_finish(xml_file)
+
+    def batch_failed(self, xml_file, error):
+        progress = self.files[xml_file]
+        progress['pending'] -= 1
+        progress['error'] = progress['error'] or ("load", error)
+        self._maybe_finish(xml_file)
+
+    def parsed(self, xml_file, stage=None, error=None):
+        progress = self.files[xml_file]
+        progress['parsed'] = True
+        if error is not None:
+            progress['error'] = progress['error'] or (stage, error)
+        self._maybe_finish(xml_file)
+
+    def _maybe_finish(self, xml_file):
+        progress = self.files[xml_file]
+        if not progress['parsed'] or progress['pending']:
+            return
+        del self.files[xml_file]
+        self.done += 1
+        self.entries += progress['entries']
+        self.inserted += progress['inserted']
+        self.skipped += progress['skipped']
+        name = os.path.basename(xml_file)
+        if progress['error']:
+            stage, error = progress['error']
+            self.failed.append((xml_file, stage, str(error)))
+            print(f"  ✗ [{self.done}/{self.total_files}] {name}: {stage} failed: {error}")
+        else:
+            self.loaded += 1
+            print(f"  ✓ [{self.done}/{self.total_files}] {name} ({progress['case_number']}): "
+                  f"{progress['entries']} entries, {progress['inserted']} inserted, "
+                  f"{progress['skipped']} skipped")
+
+
+async def produce(files, work, pool, stats, batch_size, dry_run):
+    """Stream every file into `work` batch by batch; blocks while the queue is full"""
+    for xml_file in files:
+        stats.begin(xml_file)
+        stage = "parse"
+        try:
+            started = time.perf_counter()
+            stub, docket_texts = await asyncio.to_thread(open_docket, xml_file)
+            stats.parse += time.perf_counter() - started
+            case_info = case_info_from_stub(stub)
+            if not case_info or not case_info['case_number']:
+                raise ValueError("no <stub> case metadata found")
+            stats.files[xml_file]['case_number'] = case_info['case_number']
+
+            case_id = None
+            if not dry_run:
+                stage = "case"
+                started = time.perf_counter()
+                case_id = await get_or_create_case(pool, case_info)
+                stats.case += time.perf_counter() - started
+                stage = "parse"
+
+            batches = entry_batches(docket_texts, batch_size)
+            while True:
+                # iterparse and classification run off the event loop
+                started = time.perf_counter()
+                batch = await asyncio.to_thread(next, batches, None)
+                stats.parse += time.perf_counter() - started
+                if batch is None:
+                    break
+                stats.queued(xml_file)
+                started = time.perf_counter()
+                await work.put((xml_file, case_id, batch))
+                stats.blocked += time.perf_counter() - started
+                stats.max_depth = max(stats.max_depth, work.qsize())
+        except Exception as e:
+            stats.parsed(xml_file, stage, e)
+        else:
+            stats.parsed(xml_file)
+
+
+async def consume(work, pool, stats, mode, dry_run):
+    """Load batches from `work` until a None sentinel arrives"""
+    while True:
+        started = time.perf_counter()
+        item = await work.get()
+        stats.idle += time.perf_counter() - started
+        if item is None:
+            return
+        xml_file, case_id, entries = item
+
+        started = time.perf_counter()
+        try:
+            if dry_run:
+                inserted, skipped = 0, 0
+            else:
+                inserted, skipped = await insert_batch(pool, case_id, entries, mode)
+        except Exception as e:
+            stats.batch_failed(xml_file, e)
+        else:
+            stats.batch_done(xml_file, len(entries), inserted, skipped)
+        stats.insert += time.perf_counter() - started
+
+
+async def ingest(files, args):
+    stats = PipelineStats(len(files))
+    consumers = max(1, args.consumers)
+    # Bounded so the producer cannot run arbitrarily far ahead of the consumers
+    work = asyncio.Queue(maxsize=args.queue_size or consumers * 2)
+
+    pool = None
+    if not args.dry_run:
+        pool = await asyncpg.create_pool(min_size=1, max_size=consumers + 1, **connect_params())
+
+    try:
+        tasks = [asyncio.create_task(consume(work, pool, stats, args.bulk, args.dry_run))
+                 for _ in range(consumers)]
+        await produce(files, work, pool, stats, args.batch_size, args.dry_run)
+        for _ in tasks:
+            await work.put(None)
+        await asyncio.gather(*tasks)
+    finally:
+        if pool is not None:
+            await pool.close()
+    return stats
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Ingest docket XML exports with asyncpg")
+    parser.add_argument("sources", nargs="+", help="Directories or glob patterns of docket XML files")
+    parser.add_argument("--pattern", default=DEFAULT_PATTERN,
+                        help=f"File pattern when a source is a directory (default: {DEFAULT_PATTERN})")
+    parser.add_argument("--consumers", type=int, default=DEFAULT_CONSUMERS,
+                        help=f"Concurrent insert tasks/connections (default: {DEFAULT_CONSUMERS})")
+    parser.add_argument("--queue-size", type=int, default=0,
+                        help="Batches buffered between parser and consumers (default: 2 per consumer)")
+    parser.add_argument("--bulk", choices=BULK_MODES, default="copy",
+                        help="Binary COPY or executemany into the staging table (default: copy)")
+    parser.add_argument("--batch-size", type=int, default=BULK_BATCH_SIZE,
+                        help=f"Entries per batch and transaction (default: {BULK_BATCH_SIZE})")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Parse and classify only; do not touch the database")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print("=" * 80)
+    print("AGENT 3: ASYNC MULTI-DOCKET INGESTION")
+    print("=" * 80)
+
+    files = find_docket_files(args.sources, args.pattern)
+    if not files:
+        print("ERROR: No docket XML files found")
+        return 1
+    consumers = max(1, args.consumers)
+    print(f"Found {len(files)} docket files "
+          f"({consumers} consumers, queue of {args.queue_size or consumers * 2} batches)")
+    print()
+
+    started = time.perf_counter()
+    try:
+        stats = asyncio.run(ingest(files, args))
+    except (OSError, asyncpg.PostgresError, DatabaseConfigError) as e:
+        print(f"ERROR: Could not connect to the database: {e}")
+        return 1
+    elapsed = time.perf_counter() - started
+    busy = stats.parse + stats.case + stats.insert
+
+    print()
+    print("=" * 80)
+    print("SUMMARY REPORT")
+    print("=" * 80)
+    print(f"Files found:        {len(files)}")
+    print(f"Files loaded:       {stats.loaded}")
+    print(f"Files failed:       {len(stats.failed)}")
+    print(f"Entries parsed:     {stats.entries}")
+    if not args.dry_run:
+        print(f"Entries inserted:   {stats.inserted}")
+        print(f"Entries skipped:    {stats.skipped}")
+    print(f"Batches:            {stats.batches} (max queue depth {stats.max_depth})")
+    print(f"Wall time:          {elapsed:.2f}s")
+    if elapsed > 0:
+        print(f"Throughput:         {stats.entries / elapsed:,.0f} entries/sec")
+
+    print()
+    print("Stage timing:")
+    stages = [("Parse + classify", stats.parse)]
+    if not args.dry_run:
+        stages.append(("Case lookup/create", stats.case))
+    stages += [
+        ("Insert (all consumers)", stats.insert),
+        ("Producer blocked (queue full)", stats.blocked),
+        ("Consumers idle (queue empty)", stats.idle),
+        ("Overlapped", max(0.0, busy - elapsed)),
+    ]
+    for label, seconds in stages:
+        print(f"  {label:<32}{seconds:8.2f}s")
+
+    if stats.failed:
+        print()
+        print("Failures:")
+        for xml_file, stage, error in stats.failed:
+            print(f"  - {xml_file} ({stage}): {error}")
+
+    return 1 if stats.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,23 @@
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+from file_inventory import FileInventory
+
+EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx', '.css', '.scss')
 
 def list_files(startpath):
+    # The inventory is refreshed by mtime diff instead of walking the tree again
+    with FileInventory() as inventory:
+        inventory.refresh()
+        entries = list(inventory.files(extensions=EXTENSIONS, directory=startpath))
     with open('file_list.txt', 'w') as f:
-        for root, dirs, files in os.walk(startpath):
-            if 'node_modules' in dirs:
-                dirs.remove('node_modules')
-            for file in files:
-                if file.endswith(('.ts', '.tsx', '.js', '.jsx', '.css', '.scss')):
-                    # Get absolute path
-                    abs_path = os.path.join(root, file)
-                    # Make it relative to the startpath (frontend/src) for easier matching
-                    rel_path = os.path.relpath(abs_path, startpath)
-                    # Normalize to forward slashes
-                    rel_path = rel_path.replace('\\', '/')
-                    f.write(f"{rel_path}\n")
+        for entry in entries:
+            # Make it relative to the startpath (frontend/src) for easier matching
+            rel_path = os.path.relpath(entry.abspath, startpath)
+            # Normalize to forward slashes
+            rel_path = rel_path.replace('\\', '/')
+            f.write(f"{rel_path}\n")
 
 if __name__ == "__main__":
     # Assuming the script is run from the root, and we want to list frontend/src
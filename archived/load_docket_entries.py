@@ -5,110 +5,32 @@ Parse all docket entries from XML and load into PostgreSQL
 """
 
 import xml.etree.ElementTree as ET
-try:
-    import pg8000.native
-except ImportError:
-    print("ERROR: pg8000 is not installed. Please install it using:")
-    print("  pip install pg8000")
-    exit(1)
 import uuid
-import re
-from datetime import datetime
 from collections import Counter
 
-# Database connection parameters
-DB_PARAMS = {
-    "user": "neondb_owner",
-    "password": "npg_u71zdejvgHOR",
-    "host": "ep-morning-violet-ahjfqnv2-pooler.c-3.us-east-1.aws.neon.tech",
-    "database": "neondb",
-    "port": 5432,
-    "ssl_context": True
-}
+from docket_db import get_pool
+from docket_dates import normalize_date
+from docket_text import analyze
+from docket_xml import iter_docket
+
+# Run once per entry; prepared once per pooled connection
+ENTRY_INSERT_SQL = """
+    INSERT INTO docket_entries (
+        id, case_id, sequence_number, date_filed, type,
+        title, description, filed_by, is_sealed, ecf_number,
+        created_at
+    ) VALUES (
+        :id, :case_id, :sequence_number, :date_filed, :type, :title,
+        :description, :filed_by, :is_sealed, :ecf_number, CURRENT_TIMESTAMP
+    )
+"""
 
 # XML file path
 XML_FILE = "/home/user/lexiflow-premium/04_24-2160_Docket.xml"
 
 def parse_date(date_str):
     """Convert MM/DD/YYYY to YYYY-MM-DD"""
-    if not date_str:
-        return None
-    try:
-        dt = datetime.strptime(date_str, "%m/%d/%Y")
-        return dt.strftime("%Y-%m-%d")
-    except:
-        return None
-
-def extract_type(text):
-    """Extract document type from docket text"""
-    text_upper = text.upper()
-
-    # Order matters - check specific patterns first
-    if "CERTIFICATE OF SERVICE" in text_upper or "CERT OF SERVICE" in text_upper:
-        return "Certificate"
-    elif "CERTIFICATE" in text_upper:
-        return "Certificate"
-    elif "MOTION" in text_upper:
-        return "Motion"
-    elif "ORDER" in text_upper:
-        return "Order"
-    elif "RESPONSE" in text_upper or "OPPOSITION" in text_upper:
-        return "Response"
-    elif "REPLY" in text_upper:
-        return "Reply"
-    elif "NOTICE" in text_upper:
-        return "Notice"
-    elif "BRIEF" in text_upper or "MEMORANDUM" in text_upper:
-        return "Brief"
-    elif "APPEAL" in text_upper:
-        return "Appeal"
-    elif "PETITION" in text_upper:
-        return "Petition"
-    elif "TRANSCRIPT" in text_upper:
-        return "Transcript"
-    elif "JUDGMENT" in text_upper:
-        return "Judgment"
-    elif "DOCKETING STATEMENT" in text_upper:
-        return "Statement"
-    elif "APPENDIX" in text_upper:
-        return "Appendix"
-    elif "EXHIBITS" in text_upper or "EXHIBIT" in text_upper:
-        return "Exhibit"
-    else:
-        return "Filing"
-
-def extract_filed_by(text):
-    """Extract who filed the document"""
-    # Pattern: "by [Name]"
-    match = re.search(r'\bby\s+([^\.]+?)(?:\.|$)', text, re.IGNORECASE)
-    if match:
-        filed_by = match.group(1).strip()
-        # Clean up common patterns
-        filed_by = re.sub(r'\s*\([^)]*\)\s*', ' ', filed_by).strip()
-        if len(filed_by) > 255:
-            filed_by = filed_by[:255]
-        return filed_by
-    return None
-
-def extract_ecf_number(text):
-    """Extract ECF number from [10010xxxxx] pattern"""
-    match = re.search(r'\[(\d{10,})\]', text)
-    if match:
-        return match.group(1)
-    return None
-
-def get_title(text):
-    """Get shortened title from text"""
-    # Remove case number patterns like [24-2160]
-    cleaned = re.sub(r'\[\d{2}-\d{4}\]', '', text)
-    # Remove ECF numbers
-    cleaned = re.sub(r'\[\d{10,}\]', '', cleaned)
-    # Clean up whitespace
-    cleaned = ' '.join(cleaned.split())
-    # Limit to 1000 chars
-    if len(cleaned) > 1000:
-        return cleaned[:997] + "..."
-    return cleaned
+    return normalize_date(date_str)
 
 def main():
     print("=" * 80)
@@ -116,62 +38,58 @@ def main():
     print("=" * 80)
     print()
 
-    # Parse XML file
+    # Stream docketText entries straight out of the XML (single pass)
     print(f"[1/5] Parsing XML file: {XML_FILE}")
+    print("[2/5] Extracting docketText entries...")
+    docket_texts = (attrs for _, attrs in iter_docket(XML_FILE, tags=('docketText',)))
+
+    print("[3/5] Parsing docket entry data...")
+    entries = []
+    type_counter = Counter()
+    dates = []
+
     try:
-        tree = ET.parse(XML_FILE)
-        root = tree.getroot()
-    except Exception as e:
+        for idx, docket_text in enumerate(docket_texts, 1):
+            date_filed = docket_text.get('dateFiled', '')
+            text = docket_text.get('text', '')
+            doc_link = docket_text.get('docLink', '')
+
+            # Parse data
+            parsed_date = parse_date(date_filed)
+            analysis = analyze(text)
+            doc_type = analysis['type']
+            filed_by = analysis['filed_by']
+            ecf_number = analysis['ecf_number']
+            title = analysis['title']
+
+            # Track statistics
+            type_counter[doc_type] += 1
+            if parsed_date:
+                dates.append(parsed_date)
+
+            entry = {
+                'sequence_number': idx,
+                'date_filed': parsed_date,
+                'type': doc_type,
+                'title': title,
+                'description': text,
+                'filed_by': filed_by,
+                'ecf_number': ecf_number,
+                'doc_link': doc_link
+            }
+            entries.append(entry)
+    except ET.ParseError as e:
         print(f"ERROR: Failed to parse XML: {e}")
         return
 
-    # Find all docketText elements
-    print("[2/5] Extracting docketText entries...")
-    docket_texts = root.findall('.//docketText')
-
-    if not docket_texts:
+    if not entries:
         print("ERROR: No docketText elements found in XML")
         return
 
-    total_entries = len(docket_texts)
+    total_entries = len(entries)
     print(f"✓ Found {total_entries} docket entries")
     print()
 
-    # Parse entries
-    print("[3/5] Parsing docket entry data...")
-    entries = []
-    type_counter = Counter()
-    dates = []
-
-    for idx, docket_text in enumerate(docket_texts, 1):
-        date_filed = docket_text.get('dateFiled', '')
-        text = docket_text.get('text', '')
-        doc_link = docket_text.get('docLink', '')
-
-        # Parse data
-        parsed_date = parse_date(date_filed)
-        doc_type = extract_type(text)
-        filed_by = extract_filed_by(text)
-        ecf_number = extract_ecf_number(text)
-        title = get_title(text)
-
-        # Track statistics
-        type_counter[doc_type] += 1
-        if parsed_date:
-            dates.append(parsed_date)
-
-        entry = {
-            'sequence_number': idx,
-            'date_filed': parsed_date,
-            'type': doc_type,
-            'title': title,
-            'description': text,
-            'filed_by': filed_by,
-            'ecf_number': ecf_number,
-            'doc_link': doc_link
-        }
-        entries.append(entry)
-
     # Print statistics
     print(f"✓ Parsed {len(entries)} entries")
     print()
@@ -187,9 +105,9 @@ def main():
 
     # Connect to database
     print("[4/5] Connecting to PostgreSQL database...")
+    pool = get_pool()
     try:
-        conn = pg8000.native.Connection(**DB_PARAMS)
-        cur = conn.cursor()
+        conn = pool.acquire()
         print("✓ Connected to database")
     except Exception as e:
         print(f"ERROR: Database connection failed: {e}")
@@ -199,17 +117,16 @@ def main():
     print()
     print("[5/5] Loading docket entries into database...")
     try:
-        cur.execute("SELECT id FROM cases WHERE case_number = %s", ('24-2160',))
-        result = cur.fetchone()
+        result = conn.run("SELECT id FROM cases WHERE case_number = :case_number", case_number='24-2160')
 
         if not result:
             print("ERROR: Case 24-2160 not found in database")
             print("Please run Agent 1 first to load case metadata")
-            cur.close()
-            conn.close()
+            pool.release(conn)
+            pool.close()
             return
 
-        case_id = result[0]
+        case_id = result[0][0]
         print(f"✓ Found case_id: {case_id}")
         print()
 
@@ -217,30 +134,29 @@ def main():
         inserted = 0
         errors = []
 
+        conn.run("START TRANSACTION")
+
         for entry in entries:
+            # A failed INSERT aborts the whole transaction; roll back to the
+            # savepoint so only this row is lost and the rest still commit
+            conn.run("SAVEPOINT entry_insert")
             try:
                 entry_id = str(uuid.uuid4())
 
-                cur.execute("""
-                    INSERT INTO docket_entries (
-                        id, case_id, sequence_number, date_filed, type,
-                        title, description, filed_by, is_sealed, ecf_number,
-                        created_at
-                    ) VALUES (
-                        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP
-                    )
-                """, (
-                    entry_id,
-                    case_id,
-                    entry['sequence_number'],
-                    entry['date_filed'],
-                    entry['type'],
-                    entry['title'],
-                    entry['description'],
-                    entry['filed_by'],
-                    False,  # is_sealed
-                    entry['ecf_number']
-                ))
+                conn.execute(
+                    ENTRY_INSERT_SQL,
+                    id=entry_id,
+                    case_id=case_id,
+                    sequence_number=entry['sequence_number'],
+                    date_filed=entry['date_filed'],
+                    type=entry['type'],
+                    title=entry['title'],
+                    description=entry['description'],
+                    filed_by=entry['filed_by'],
+                    is_sealed=False,
+                    ecf_number=entry['ecf_number']
+                )
+                conn.run("RELEASE SAVEPOINT entry_insert")
 
                 inserted += 1
 
@@ -248,10 +164,11 @@ def main():
                     print(f"  Inserted {inserted}/{total_entries} entries...")
 
             except Exception as e:
+                conn.run("ROLLBACK TO SAVEPOINT entry_insert")
                 errors.append(f"Entry {entry['sequence_number']}: {str(e)}")
 
         # Commit transaction
-        conn.commit()
+        conn.run("COMMIT")
         print(f"✓ Successfully inserted {inserted} docket entries")
 
         if errors:
@@ -265,25 +182,27 @@ def main():
         # Verify insertion
         print()
         print("Verifying data insertion...")
-        cur.execute("""
+        count, min_date, max_date = conn.run("""
             SELECT COUNT(*), MIN(date_filed), MAX(date_filed)
             FROM docket_entries
-            WHERE case_id = %s
-        """, (case_id,))
-
-        count, min_date, max_date = cur.fetchone()
+            WHERE case_id = :case_id
+        """, case_id=case_id)[0]
         print(f"✓ Verified: {count} entries in database")
         print(f"✓ Date range: {min_date} to {max_date}")
 
         # Close connection
-        cur.close()
-        conn.close()
+        pool.release(conn)
+        pool.close()
 
     except Exception as e:
         print(f"ERROR: Database operation failed: {e}")
         if conn:
-            conn.rollback()
-            conn.close()
+            try:
+                conn.run("ROLLBACK")
+            except Exception:
+                pass
+            pool.release(conn, discard=True)
+        pool.close()
         return
 
     print()
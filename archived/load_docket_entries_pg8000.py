@@ -5,175 +5,121 @@ Parse all docket entries from XML and load into PostgreSQL
 """
 
 import xml.etree.ElementTree as ET
-import pg8000.native
+import argparse
+import hashlib
+import io
 import uuid
-import re
+from collections import defaultdict
 from datetime import datetime
-from collections import Counter
-
-# Database connection parameters
-DB_PARAMS = {
-    "user": "neondb_owner",
-    "password": "npg_u71zdejvgHOR",
-    "host": "ep-morning-violet-ahjfqnv2-pooler.c-3.us-east-1.aws.neon.tech",
-    "database": "neondb",
-    "port": 5432,
-    "ssl_context": True
-}
+
+from docket_db import copy_value, get_pool, values_clause
+from docket_stats import DocketColumns
+from docket_dates import normalize_date
+from docket_text import analyze
+from docket_xml import open_docket, read_stub
 
 # XML file path - update to Windows path
 XML_FILE = "C:\\temp\\lexiflow-premium\\04_24-2160_Docket.xml"
 
+# document_title is capped shorter here than in the SQL generators
+TITLE_MAX_LENGTH = 500
+
 def parse_date(date_str):
     """Convert MM/DD/YYYY to YYYY-MM-DD"""
-    if not date_str:
-        return None
-    try:
-        dt = datetime.strptime(date_str, "%m/%d/%Y")
-        return dt.strftime("%Y-%m-%d")
-    except:
-        return None
-
-def extract_type(text):
-    """Extract document type from docket text"""
-    text_upper = text.upper()
-
-    # Order matters - check specific patterns first
-    if "CERTIFICATE OF SERVICE" in text_upper or "CERT OF SERVICE" in text_upper:
-        return "Certificate"
-    elif "CERTIFICATE" in text_upper:
-        return "Certificate"
-    elif "MOTION" in text_upper:
-        return "Motion"
-    elif "ORDER" in text_upper:
-        return "Order"
-    elif "RESPONSE" in text_upper or "OPPOSITION" in text_upper:
-        return "Response"
-    elif "REPLY" in text_upper:
-        return "Reply"
-    elif "NOTICE" in text_upper:
-        return "Notice"
-    elif "BRIEF" in text_upper or "MEMORANDUM" in text_upper:
-        return "Brief"
-    elif "APPEAL" in text_upper:
-        return "Appeal"
-    elif "PETITION" in text_upper:
-        return "Petition"
-    elif "TRANSCRIPT" in text_upper:
-        return "Transcript"
-    elif "JUDGMENT" in text_upper:
-        return "Judgment"
-    elif "DOCKETING STATEMENT" in text_upper:
-        return "Statement"
-    elif "APPENDIX" in text_upper:
-        return "Appendix"
-    elif "EXHIBITS" in text_upper or "EXHIBIT" in text_upper:
-        return "Exhibit"
-    else:
-        return "Filing"
-
-def extract_filed_by(text):
-    """Extract who filed the document"""
-    match = re.search(r'\bby\s+([^\.]+?)(?:\.|$)', text, re.IGNORECASE)
-    if match:
-        filed_by = match.group(1).strip()
-        filed_by = re.sub(r'\s*\([^)]*\)\s*', ' ', filed_by).strip()
-        if len(filed_by) > 255:
-            filed_by = filed_by[:255]
-        return filed_by
-    return None
-
-def extract_ecf_number(text):
-    """Extract ECF number from [10010xxxxx] pattern"""
-    match = re.search(r'\[(\d{10,})\]', text)
-    if match:
-        return match.group(1)
-    return None
+    return normalize_date(date_str)
 
-def get_title(text):
-    """Get shortened title from text"""
-    cleaned = re.sub(r'\[\d{2}-\d{4}\]', '', text)
-    cleaned = re.sub(r'\[\d{10,}\]', '', cleaned)
-    cleaned = ' '.join(cleaned.split())
-    if len(cleaned) > 500:
-        cleaned = cleaned[:497] + '...'
-    return cleaned
+def case_info_from_stub(stub):
+    """Build the case summary dict from <stub> attributes"""
+    if stub is None:
+        return None
+    return {
+        'case_number': stub.get('caseNumber', ''),
+        'date_filed': parse_date(stub.get('dateFiled', '')),
+        'nature_of_suit': stub.get('natureOfSuit', ''),
+        'short_title': stub.get('shortTitle', ''),
+        'orig_court': stub.get('origCourt', '')
+    }
 
 def parse_case_info(xml_file):
     """Parse case summary information from XML"""
     try:
-        tree = ET.parse(xml_file)
-        root = tree.getroot()
-        
-        stub = root.find('.//stub')
-        if stub is not None:
-            return {
-                'case_number': stub.get('caseNumber', ''),
-                'date_filed': parse_date(stub.get('dateFiled', '')),
-                'nature_of_suit': stub.get('natureOfSuit', ''),
-                'short_title': stub.get('shortTitle', ''),
-                'orig_court': stub.get('origCourt', '')
-            }
+        return case_info_from_stub(read_stub(xml_file))
     except Exception as e:
         print(f"ERROR parsing case info: {e}")
     return None
 
-def parse_docket_entries(xml_file):
-    """Parse XML file and extract docket entries"""
-    print(f"Parsing XML file: {xml_file}")
+def docket_entry_from_xml(entry_number, attrs):
+    """Build an entry dict from one docketText element's attributes"""
+    date_filed_str = attrs.get('dateFiled', '')
+    text = attrs.get('text', '')
+    analysis = analyze(text, title_limit=TITLE_MAX_LENGTH)
+
+    return {
+        'entry_number': entry_number,
+        'date_filed': parse_date(date_filed_str),
+        'date_filed_str': date_filed_str,
+        'text': text,
+        'type': analysis['type'],
+        'filed_by': analysis['filed_by'],
+        'ecf_number': analysis['ecf_number'],
+        'title': analysis['title']
+    }
+
+def parse_docket_entries(docket_texts):
+    """Extract docket entries from a stream of docketText attribute dicts"""
+    entries = []
 
     try:
-        tree = ET.parse(xml_file)
-        root = tree.getroot()
-    except Exception as e:
-        print(f"ERROR parsing XML: {e}")
-        return []
+        for entry in docket_texts:
+            try:
+                # Skip if no text
+                if not entry.get('text', ''):
+                    continue
 
-    entries = []
+                # Generate sequential entry number
+                entry_number = str(len(entries) + 1)
 
-    for entry in root.findall('.//docketText'):
-        try:
-            date_filed_str = entry.get('dateFiled', '')
-            text = entry.get('text', '')
+                entries.append(docket_entry_from_xml(entry_number, entry))
 
-            # Skip if no text
-            if not text:
+            except Exception as e:
+                print(f"ERROR processing entry: {e}")
                 continue
-
-            # Generate sequential entry number
-            entry_number = str(len(entries) + 1)
-
-            date_filed = parse_date(date_filed_str)
-            doc_type = extract_type(text)
-            filed_by = extract_filed_by(text)
-            ecf_number = extract_ecf_number(text)
-            title = get_title(text)
-
-            entry_data = {
-                'entry_number': entry_number,
-                'date_filed': date_filed,
-                'date_filed_str': date_filed_str,
-                'text': text,
-                'type': doc_type,
-                'filed_by': filed_by,
-                'ecf_number': ecf_number,
-                'title': title
-            }
-
-            entries.append(entry_data)
-
-        except Exception as e:
-            print(f"ERROR processing entry: {e}")
-            continue
+    except ET.ParseError as e:
+        print(f"ERROR parsing XML: {e}")
+        return []
 
     print(f"Total entries parsed: {len(entries)}")
     return entries
 
+# Statements run per case / per entry; prepared once per pooled connection
+CASE_LOOKUP_SQL = "SELECT id FROM cases WHERE case_number = :case_num"
+CASE_INSERT_SQL = """
+    INSERT INTO cases (
+        id, case_number, title, court, filing_date, nature_of_suit,
+        status, created_at, updated_at
+    )
+    VALUES (
+        :id, :case_number, :title, :court, :filing_date, :nature_of_suit,
+        :status, :created_at, :updated_at
+    )
+"""
+ENTRY_EXISTS_SQL = "SELECT id FROM docket_entries WHERE case_id = :case_id AND sequence_number = :seq_num"
+ENTRY_INSERT_SQL = """
+    INSERT INTO docket_entries (
+        id, case_id, sequence_number, date_filed, text, type,
+        filed_by, ecf_document_number, document_title, description, created_at, updated_at
+    )
+    VALUES (
+        :id, :case_id, :seq_num, :date_filed, :text, :type,
+        :filed_by, :ecf_num, :doc_title, :description, :created_at, :updated_at
+    )
+"""
+
 def get_or_create_case(conn, case_info):
     """Get case_id or create case if it doesn't exist"""
     try:
         # Check if case exists
-        result = conn.run("SELECT id FROM cases WHERE case_number = :case_num", case_num=case_info['case_number'])
+        result = conn.execute(CASE_LOOKUP_SQL, case_num=case_info['case_number'])
         if result:
             case_id = result[0][0]
             print(f"✓ Found existing case: {case_info['case_number']} (ID: {case_id})")
@@ -181,17 +127,8 @@ def get_or_create_case(conn, case_info):
         
         # Create new case
         case_id = str(uuid.uuid4())
-        conn.run(
-            """
-            INSERT INTO cases (
-                id, case_number, title, court, filing_date, nature_of_suit,
-                status, created_at, updated_at
-            )
-            VALUES (
-                :id, :case_number, :title, :court, :filing_date, :nature_of_suit,
-                :status, :created_at, :updated_at
-            )
-            """,
+        conn.execute(
+            CASE_INSERT_SQL,
             id=case_id,
             case_number=case_info['case_number'],
             title=case_info['short_title'],
@@ -221,8 +158,8 @@ def insert_docket_entries(conn, case_id, entries):
             docket_id = str(uuid.uuid4())
 
             # Check if entry already exists
-            existing = conn.run(
-                "SELECT id FROM docket_entries WHERE case_id = :case_id AND sequence_number = :seq_num",
+            existing = conn.execute(
+                ENTRY_EXISTS_SQL,
                 case_id=case_id,
                 seq_num=entry['entry_number']
             )
@@ -233,17 +170,8 @@ def insert_docket_entries(conn, case_id, entries):
                 continue
 
             # Insert the docket entry
-            conn.run(
-                """
-                INSERT INTO docket_entries (
-                    id, case_id, sequence_number, date_filed, text, type,
-                    filed_by, ecf_document_number, document_title, description, created_at, updated_at
-                )
-                VALUES (
-                    :id, :case_id, :seq_num, :date_filed, :text, :type,
-                    :filed_by, :ecf_num, :doc_title, :description, :created_at, :updated_at
-                )
-                """,
+            conn.execute(
+                ENTRY_INSERT_SQL,
                 id=docket_id,
                 case_id=case_id,
                 seq_num=entry['entry_number'],
@@ -267,72 +195,361 @@ def insert_docket_entries(conn, case_id, entries):
 
     print(f"\nInserted: {inserted}, Skipped: {skipped}")
 
-def print_statistics(entries):
+# Columns written by the bulk load path, in staging/COPY order
+BULK_COLUMNS = (
+    'id', 'case_id', 'sequence_number', 'date_filed', 'text', 'type',
+    'filed_by', 'ecf_document_number', 'document_title', 'description',
+    'created_at', 'updated_at'
+)
+BULK_BATCH_SIZE = 500
+BULK_MODES = ('copy', 'insert')
+
+# Per-batch staging table; dropped automatically when the batch commits
+STAGE_TABLE_SQL = f"""
+    CREATE TEMP TABLE docket_entries_stage ON COMMIT DROP AS
+    SELECT {', '.join(BULK_COLUMNS)} FROM docket_entries WITH NO DATA
+"""
+
+# docket_entries has no unique key on (case_id, sequence_number), so the
+# existence check is done set-wise instead of with ON CONFLICT
+MERGE_STAGE_SQL = f"""
+    INSERT INTO docket_entries ({', '.join(BULK_COLUMNS)})
+    SELECT {', '.join('s.' + c for c in BULK_COLUMNS)}
+    FROM docket_entries_stage s
+    WHERE NOT EXISTS (
+        SELECT 1 FROM docket_entries d
+        WHERE d.case_id = s.case_id AND d.sequence_number = s.sequence_number
+    )
+    RETURNING sequence_number
+"""
+
+def docket_entry_row(case_id, entry, now):
+    """Build a BULK_COLUMNS tuple for one parsed entry"""
+    return (
+        str(uuid.uuid4()),
+        case_id,
+        entry['entry_number'],
+        entry['date_filed'],
+        entry['text'],
+        entry['type'],
+        entry['filed_by'],
+        entry['ecf_number'],
+        entry['title'],
+        entry['text'][:500] if entry['text'] else None,
+        now,
+        now
+    )
+
+def stage_rows_copy(conn, rows):
+    """Stream rows into the staging table with COPY FROM STDIN"""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join(copy_value(v) for v in row))
+        buffer.write('\n')
+    buffer.seek(0)
+    conn.run(
+        f"COPY docket_entries_stage ({', '.join(BULK_COLUMNS)}) FROM STDIN",
+        stream=buffer
+    )
+
+def stage_rows_insert(conn, rows):
+    """Load rows into the staging table with one multi-row INSERT"""
+    values, params = values_clause(rows)
+    conn.run(
+        f"INSERT INTO docket_entries_stage ({', '.join(BULK_COLUMNS)}) VALUES {values}",
+        **params
+    )
+
+def insert_docket_entries_bulk(conn, case_id, entries, batch_size=BULK_BATCH_SIZE, mode='copy', verbose=True,
+                               stop_on_error=False):
+    """Insert docket entries in batches, one transaction per batch.
+
+    Each batch is staged (COPY or multi-row INSERT) into a temp table and
+    merged with a single INSERT ... SELECT that skips sequence numbers the
+    case already has, so a batch costs a handful of round trips instead of
+    two per entry. Returns (inserted, skipped).
+
+    A failed batch is rolled back and reported; with `stop_on_error` the
+    error is then re-raised instead of moving on to the next batch.
+    """
+    if mode not in BULK_MODES:
+        raise ValueError(f"Unknown bulk mode: {mode}")
+    stage_rows = stage_rows_copy if mode == 'copy' else stage_rows_insert
+
+    if verbose:
+        print(f"\nBulk inserting {len(entries)} docket entries ({mode}, batch size {batch_size})...")
+
+    inserted = 0
+    skipped = 0
+
+    for start in range(0, len(entries), batch_size):
+        batch = entries[start:start + batch_size]
+        first, last = batch[0]['entry_number'], batch[-1]['entry_number']
+        now = datetime.now()
+
+        try:
+            conn.run("START TRANSACTION")
+            conn.run(STAGE_TABLE_SQL)
+            stage_rows(conn, [docket_entry_row(case_id, entry, now) for entry in batch])
+            result = conn.run(MERGE_STAGE_SQL)
+            conn.run("COMMIT")
+        except Exception as e:
+            print(f"  ERROR inserting entries {first}-{last}: {e}")
+            try:
+                conn.run("ROLLBACK")
+            except Exception:
+                pass
+            if stop_on_error:
+                raise
+            continue
+
+        inserted += len(result)
+        skipped += len(batch) - len(result)
+        if verbose:
+            print(f"  ✓ Entries {first}-{last}: {len(result)} inserted, {len(batch) - len(result)} already existed")
+
+    if verbose:
+        print(f"\nInserted: {inserted}, Skipped: {skipped}")
+    return inserted, skipped
+
+# Fingerprint of (date, text, ECF number); must match entry_fingerprint() below
+FINGERPRINTS_SQL = """
+    SELECT id, sequence_number,
+           md5(coalesce(to_char(date_filed, 'YYYY-MM-DD'), '') || chr(31) ||
+               coalesce(text, '') || chr(31) ||
+               coalesce(ecf_document_number, '')),
+           ecf_document_number
+    FROM docket_entries
+    WHERE case_id = :case_id
+"""
+
+# Sync rows are staged under the id of the stored row they match (or a new
+# id), so updates and inserts are keyed by id rather than by position
+UPDATE_FROM_STAGE_SQL = """
+    UPDATE docket_entries d
+    SET sequence_number = s.sequence_number,
+        date_filed = s.date_filed,
+        text = s.text,
+        type = s.type,
+        filed_by = s.filed_by,
+        ecf_document_number = s.ecf_document_number,
+        document_title = s.document_title,
+        description = s.description,
+        updated_at = s.updated_at
+    FROM docket_entries_stage s
+    WHERE d.id = s.id
+    RETURNING d.id
+"""
+
+INSERT_NEW_FROM_STAGE_SQL = f"""
+    INSERT INTO docket_entries ({', '.join(BULK_COLUMNS)})
+    SELECT {', '.join('s.' + c for c in BULK_COLUMNS)}
+    FROM docket_entries_stage s
+    WHERE NOT EXISTS (SELECT 1 FROM docket_entries d WHERE d.id = s.id)
+    RETURNING id
+"""
+
+def entry_fingerprint(entry):
+    """Content hash of an entry's date, text and ECF number"""
+    content = '\x1f'.join((
+        entry['date_filed'] or '',
+        entry['text'] or '',
+        entry['ecf_number'] or ''
+    ))
+    return hashlib.md5(content.encode('utf-8')).hexdigest()
+
+def match_stored_entries(entries, stored):
+    """Pair parsed entries with stored rows by content, not by position.
+
+    `stored` is FINGERPRINTS_SQL output. An entry first matches a stored row
+    with the same fingerprint (preferring one at the same sequence number);
+    entries left over then match a remaining row with the same ECF number,
+    which makes them edits of that row. Returns (matches, stale) where
+    matches[i] is the (id, sequence_number) of entries[i]'s row or None for
+    a new entry, and stale counts stored rows nothing matched.
+    """
+    by_fingerprint = defaultdict(list)
+    for row_id, seq, fingerprint, ecf_number in stored:
+        by_fingerprint[fingerprint].append((row_id, str(seq), ecf_number))
+    used = set()
+    matches = [None] * len(entries)
+
+    for i, entry in enumerate(entries):
+        candidates = by_fingerprint.get(entry_fingerprint(entry))
+        if not candidates:
+            continue
+        seq = str(entry['entry_number'])
+        pick = next((c for c in candidates if c[1] == seq), candidates[0])
+        candidates.remove(pick)
+        used.add(pick[0])
+        matches[i] = (pick[0], pick[1])
+
+    by_ecf = defaultdict(list)
+    for candidates in by_fingerprint.values():
+        for row_id, seq, ecf_number in candidates:
+            if ecf_number:
+                by_ecf[ecf_number].append((row_id, seq))
+    for i, entry in enumerate(entries):
+        if matches[i] is None and entry['ecf_number'] and by_ecf.get(entry['ecf_number']):
+            matches[i] = by_ecf[entry['ecf_number']].pop(0)
+            used.add(matches[i][0])
+
+    return matches, len(stored) - len(used)
+
+def sync_docket_entries(conn, case_id, entries, batch_size=BULK_BATCH_SIZE, mode='copy', verbose=True):
+    """Incrementally sync a case's docket entries using content fingerprints.
+
+    Loads the stored fingerprints for the case in one query and matches the
+    parsed entries to stored rows by content (match_stored_entries), so an
+    entry inserted mid-docket does not make every later entry look changed.
+    Entries whose content is unchanged but whose position moved only have
+    their sequence number updated; edited entries (same ECF number, new
+    content) are updated in place; the rest are inserted. One transaction
+    per batch. Returns (inserted, updated, unchanged).
+    """
+    if mode not in BULK_MODES:
+        raise ValueError(f"Unknown bulk mode: {mode}")
+    stage_rows = stage_rows_copy if mode == 'copy' else stage_rows_insert
+
+    stored = conn.run(FINGERPRINTS_SQL, case_id=case_id)
+    matches, stale = match_stored_entries(entries, stored)
+    fingerprints = {row_id: fingerprint for row_id, _, fingerprint, _ in stored}
+
+    pending = []
+    moved = 0
+    for entry, match in zip(entries, matches):
+        if match is None:
+            pending.append((None, entry))
+            continue
+        row_id, stored_seq = match
+        if fingerprints[row_id] != entry_fingerprint(entry):
+            pending.append((row_id, entry))
+        elif stored_seq != str(entry['entry_number']):
+            moved += 1
+            pending.append((row_id, entry))
+    unchanged = len(entries) - len(pending)
+
+    if verbose:
+        print(f"\nSyncing {len(entries)} docket entries: {len(stored)} stored, "
+              f"{unchanged} unchanged, {moved} moved, {len(pending) - moved} new or edited")
+
+    inserted = 0
+    updated = 0
+
+    for start in range(0, len(pending), batch_size):
+        batch = pending[start:start + batch_size]
+        now = datetime.now()
+        rows = []
+        for row_id, entry in batch:
+            row = docket_entry_row(case_id, entry, now)
+            rows.append(row if row_id is None else (str(row_id),) + row[1:])
+
+        try:
+            conn.run("START TRANSACTION")
+            conn.run(STAGE_TABLE_SQL)
+            stage_rows(conn, rows)
+            batch_updated = len(conn.run(UPDATE_FROM_STAGE_SQL))
+            batch_inserted = len(conn.run(INSERT_NEW_FROM_STAGE_SQL))
+            conn.run("COMMIT")
+        except Exception as e:
+            print(f"  ERROR syncing entries {batch[0][1]['entry_number']}-{batch[-1][1]['entry_number']}: {e}")
+            try:
+                conn.run("ROLLBACK")
+            except Exception:
+                pass
+            continue
+
+        inserted += batch_inserted
+        updated += batch_updated
+
+    if verbose:
+        print(f"\nInserted: {inserted}, Updated: {updated}, Unchanged: {unchanged}")
+        if stale:
+            print(f"Note: {stale} stored entries no longer appear in the docket")
+    return inserted, updated, unchanged
+
+def print_statistics(entries, case_number=None):
     """Print statistics about the entries"""
+    stats = DocketColumns.from_entries(entries, case_number).summary(case_number)
+
     print("\n" + "="*80)
     print("DOCKET ENTRIES STATISTICS")
     print("="*80)
 
-    print(f"\nTotal Entries: {len(entries)}")
+    print(f"\nTotal Entries: {stats['total_entries']}")
 
-    # Type distribution
-    types = Counter(e['type'] for e in entries)
     print("\nDocument Types:")
-    for doc_type, count in types.most_common():
+    for doc_type, count in stats['types'].items():
         print(f"  {doc_type}: {count}")
 
-    # Parties filing
-    filers = Counter(e['filed_by'] for e in entries if e['filed_by'])
     print("\nTop Filers:")
-    for filer, count in filers.most_common(10):
+    for filer, count in stats['top_filers'].items():
         print(f"  {filer}: {count}")
 
-    # Date range
-    dates = [e['date_filed'] for e in entries if e['date_filed']]
-    if dates:
-        print(f"\nDate Range: {min(dates)} to {max(dates)}")
+    date_range = stats['date_range']
+    if date_range['first']:
+        print(f"\nDate Range: {date_range['first']} to {date_range['last']}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load docket entries from XML into PostgreSQL")
+    parser.add_argument("--bulk", choices=BULK_MODES,
+                        help="Load in batches via COPY or multi-row INSERT instead of row by row")
+    parser.add_argument("--batch-size", type=int, default=BULK_BATCH_SIZE,
+                        help=f"Entries per bulk transaction (default: {BULK_BATCH_SIZE})")
+    parser.add_argument("--sync", action="store_true",
+                        help="Incremental sync: only send entries whose content fingerprint changed")
+    return parser.parse_args()
 
 def main():
+    args = parse_args()
+
     print("Enterprise Agent 3: Docket Entries Loader")
     print("="*80)
 
     try:
-        # Parse case information
-        print("Parsing case information...")
-        case_info = parse_case_info(XML_FILE)
+        # Parse case information and stream entries in a single pass
+        print(f"Parsing XML file: {XML_FILE}")
+        stub, docket_texts = open_docket(XML_FILE)
+        case_info = case_info_from_stub(stub)
         if not case_info:
             print("ERROR: Could not parse case information")
             return
         
         print(f"✓ Case: {case_info['case_number']} - {case_info['short_title']}")
 
-        # Parse XML
-        entries = parse_docket_entries(XML_FILE)
+        # Parse entries
+        entries = parse_docket_entries(docket_texts)
 
         if not entries:
             print("ERROR: No entries parsed")
             return
 
         # Print statistics
-        print_statistics(entries)
+        print_statistics(entries, case_info['case_number'])
 
         # Connect to database
         print("\nConnecting to database...")
-        conn = pg8000.native.Connection(**DB_PARAMS)
-        print("✓ Connected")
-
-        # Get or create case
-        case_id = get_or_create_case(conn, case_info)
-        if not case_id:
-            print("ERROR: Cannot proceed without case_id")
-            conn.close()
-            return
-
-        # Insert entries
-        insert_docket_entries(conn, case_id, entries)
-
-        # Close connection
-        conn.close()
+        pool = get_pool()
+        try:
+            with pool.connection() as conn:
+                print("✓ Connected")
+
+                # Get or create case
+                case_id = get_or_create_case(conn, case_info)
+                if not case_id:
+                    print("ERROR: Cannot proceed without case_id")
+                    return
+
+                # Insert entries
+                if args.sync:
+                    sync_docket_entries(conn, case_id, entries, args.batch_size, args.bulk or 'copy')
+                elif args.bulk:
+                    insert_docket_entries_bulk(conn, case_id, entries, args.batch_size, args.bulk)
+                else:
+                    insert_docket_entries(conn, case_id, entries)
+        finally:
+            # Close connections once the borrowed one is back in the pool
+            pool.close()
         print("\n✓ Complete")
 
     except Exception as e:
@@ -4,240 +4,189 @@ Enterprise Agent 2: Party & Attorney Loader
 Parses XML docket file and loads all parties and attorneys into PostgreSQL
 """
 
-import xml.etree.ElementTree as ET
-import pg8000.native
 import uuid
 from datetime import datetime
 import sys
 
-# Database connection parameters
-DB_PARAMS = {
-    "user": "neondb_owner",
-    "password": "npg_u71zdejvgHOR",
-    "host": "ep-morning-violet-ahjfqnv2-pooler.c-3.us-east-1.aws.neon.tech",
-    "database": "neondb",
-    "port": 5432,
-    "ssl_context": True
-}
+from docket_db import get_pool, values_clause
+from docket_xml import iter_parties
 
 # XML file path
 XML_FILE = "/home/user/lexiflow-premium/04_24-2160_Docket.xml"
 
-def connect_db():
-    """Connect to PostgreSQL database"""
-    return pg8000.native.Connection(**DB_PARAMS)
+CASE_LOOKUP_SQL = "SELECT id FROM cases WHERE case_number = :case_number"
 
-def parse_xml_parties(xml_file):
-    """Parse XML file and extract party and attorney information"""
-    print(f"Parsing XML file: {xml_file}")
-
-    # Read the XML file
-    with open(xml_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Find all party elements using string parsing (since the XML is all on one line)
-    parties_data = []
-
-    # Split by <party to find each party
-    party_sections = content.split('<party ')
-
-    for i, section in enumerate(party_sections[1:], 1):  # Skip first split which is before first party
-        # Extract party attributes
-        party_end = section.find('</party>')
-        if party_end == -1:
-            party_end = section.find('/>')
-
-        party_section = section[:party_end + 10] if party_end != -1 else section[:1000]
-
-        # Extract party info
-        party_info = {}
-
-        # Get info attribute (party name)
-        info_start = section.find('info="')
-        if info_start != -1:
-            info_start += 6
-            info_end = section.find('"', info_start)
-            party_info['name'] = section[info_start:info_end].replace('&amp;', '&')
-
-        # Get type attribute
-        type_start = section.find('type="')
-        if type_start != -1:
-            type_start += 6
-            type_end = section.find('"', type_start)
-            party_info['type_description'] = section[type_start:type_end]
-
-        # Determine party type (Individual vs Corporation)
-        if 'INC' in party_info.get('name', '').upper() or 'CLUB' in party_info.get('name', '').upper():
-            party_info['type'] = 'Corporation'
-        else:
-            party_info['type'] = 'Individual'
-
-        # Extract role (everything between type=" and the next ")
-        role = party_info.get('type_description', '')
-        party_info['role'] = role
-
-        # Extract attorneys
-        attorneys = []
-        attorney_sections = section.split('<attorney ')
-
-        for att_section in attorney_sections[1:]:
-            attorney = {}
-
-            # Extract attorney attributes
-            for attr in ['firstName', 'middleName', 'lastName', 'email', 'businessPhone',
-                        'personalPhone', 'address1', 'city', 'state', 'zip', 'office']:
-                attr_start = att_section.find(f'{attr}="')
-                if attr_start != -1:
-                    attr_start += len(attr) + 2
-                    attr_end = att_section.find('"', attr_start)
-                    attorney[attr] = att_section[attr_start:attr_end]
-
-            # Build full name
-            name_parts = []
-            for part in ['firstName', 'middleName', 'lastName']:
-                if attorney.get(part):
-                    name_parts.append(attorney[part])
-            attorney['full_name'] = ' '.join(name_parts)
-
-            if attorney.get('full_name'):
-                attorneys.append(attorney)
-
-        party_info['attorneys'] = attorneys
-        parties_data.append(party_info)
-
-    return parties_data
-
-def get_case_id(conn):
-    """Get the case_id for case 24-2160"""
-    cursor = conn.cursor(cursor_factory=RealDictCursor)
-    cursor.execute("SELECT id FROM cases WHERE case_number = %s", ('24-2160',))
-    result = cursor.fetchone()
-    cursor.close()
+# Bulk lookups used to prefill the identity index, one query per table
+PARTY_PREFILL_SQL = """
+    SELECT id, name FROM parties
+    WHERE lower(regexp_replace(trim(name), '\\s+', ' ', 'g')) = ANY(:names)
+"""
+USER_PREFILL_SQL = "SELECT id, email FROM users WHERE lower(email) = ANY(:emails)"
 
-    if result:
-        return result['id']
-    else:
-        print("WARNING: Case 24-2160 not found in database. Creating parties without case link.")
-        return None
+PARTY_COLUMNS = ('id', 'name', 'type', 'created_at', 'updated_at')
+USER_COLUMNS = ('id', 'email', 'password_hash', 'first_name', 'last_name',
+                'role', 'phone', 'organization', 'is_active', 'created_at', 'updated_at')
+CASE_PARTY_COLUMNS = ('case_id', 'party_id', 'role', 'counsel_name', 'created_at', 'updated_at')
 
-def insert_party(conn, party_data):
-    """Insert a party into the parties table"""
-    cursor = conn.cursor(cursor_factory=RealDictCursor)
+def normalize_name(name):
+    """Identity key for a party name: trimmed, single-spaced, lower-case"""
+    return ' '.join(name.split()).lower()
 
-    party_id = str(uuid.uuid4())
+def attorney_email(attorney_data):
+    """Attorney's email, or one generated from the name when missing"""
+    email = (attorney_data.get('email') or '').strip()
+    if not email:
+        email = attorney_data['full_name'].lower().replace(' ', '.') + '@law.example.com'
+    return email
+
+def counsel_name_for(party_data):
+    """Counsel column for case_parties: attorney names, or Pro Se for individuals"""
+    counsel_names = [att['full_name'] for att in party_data['attorneys']]
+    if counsel_names:
+        return ', '.join(counsel_names)
+    return 'Pro Se' if party_data['type'] == 'Individual' else None
+
+class IdentityIndex:
+    """In-memory map of normalized party names and attorney emails to row ids.
+
+    Prefilled with one bulk query per table for the identities a run needs;
+    everything still missing is inserted with one multi-row statement per
+    table, so a run costs a fixed number of round trips however many times
+    the same attorney or party appears.
+    """
+
+    def __init__(self):
+        self.parties = {}
+        self.users = {}
+
+    def prefill(self, conn, parties_data):
+        names = sorted({normalize_name(p['name']) for p in parties_data})
+        emails = sorted({attorney_email(a).lower() for p in parties_data for a in p['attorneys']})
+
+        if names:
+            for party_id, name in conn.run(PARTY_PREFILL_SQL, names=names):
+                self.parties.setdefault(normalize_name(name), party_id)
+        if emails:
+            for user_id, email in conn.run(USER_PREFILL_SQL, emails=emails):
+                self.users.setdefault(email.lower(), user_id)
+
+        print(f"✓ Prefilled index: {len(self.parties)} known parties, {len(self.users)} known attorneys")
+
+    def party_id(self, party_data):
+        return self.parties.get(normalize_name(party_data['name']))
+
+    def user_id(self, attorney_data):
+        return self.users.get(attorney_email(attorney_data).lower())
+
+    def insert_missing_parties(self, conn, parties_data):
+        """Insert every distinct party not yet in the index; returns the count"""
+        now = datetime.now()
+        new = {}
+        for party_data in parties_data:
+            key = normalize_name(party_data['name'])
+            if key not in self.parties and key not in new:
+                new[key] = (str(uuid.uuid4()), party_data['name'], party_data['type'], now, now)
+
+        if new:
+            values, params = values_clause(new.values())
+            conn.run(
+                f"INSERT INTO parties ({', '.join(PARTY_COLUMNS)}) VALUES {values} "
+                f"ON CONFLICT (id) DO NOTHING",
+                **params
+            )
+            for key, row in new.items():
+                self.parties[key] = row[0]
+                print(f"  ✓ Inserted party: {row[1]} (ID: {row[0]})")
+        return len(new)
+
+    def insert_missing_attorneys(self, conn, parties_data):
+        """Insert every distinct attorney not yet in the index; returns the count"""
+        now = datetime.now()
+        new = {}
+        for party_data in parties_data:
+            for attorney in party_data['attorneys']:
+                email = attorney_email(attorney)
+                key = email.lower()
+                if key in self.users or key in new:
+                    continue
+                name_parts = attorney['full_name'].split()
+                new[key] = (
+                    str(uuid.uuid4()), email, 'EXTERNAL_ATTORNEY',
+                    name_parts[0] if len(name_parts) > 0 else '',
+                    name_parts[-1] if len(name_parts) > 1 else '',
+                    'attorney',
+                    attorney.get('businessPhone') or attorney.get('personalPhone', ''),
+                    attorney.get('office', ''),
+                    True, now, now
+                )
 
-    # Check if party already exists
-    cursor.execute(
-        "SELECT id FROM parties WHERE name = %s",
-        (party_data['name'],)
-    )
-    existing = cursor.fetchone()
+        if not new:
+            return 0
 
-    if existing:
-        print(f"  Party already exists: {party_data['name']}")
-        party_id = existing['id']
-    else:
-        cursor.execute(
-            """
-            INSERT INTO parties (id, name, type, created_at, updated_at)
-            VALUES (%s, %s, %s, %s, %s)
-            ON CONFLICT (id) DO NOTHING
-            RETURNING id
-            """,
-            (party_id, party_data['name'], party_data['type'], datetime.now(), datetime.now())
+        values, params = values_clause(new.values())
+        inserted = conn.run(
+            f"INSERT INTO users ({', '.join(USER_COLUMNS)}) VALUES {values} "
+            f"ON CONFLICT (email) DO NOTHING RETURNING id, email",
+            **params
         )
-        result = cursor.fetchone()
-        if result:
-            print(f"  ✓ Inserted party: {party_data['name']} (ID: {party_id})")
-        else:
-            print(f"  Party insert conflict (already exists): {party_data['name']}")
-
-    cursor.close()
-    return party_id
-
-def insert_case_party(conn, case_id, party_id, role, counsel_name=None):
-    """Insert a case-party relationship"""
+        for user_id, email in inserted:
+            self.users[email.lower()] = user_id
+            print(f"    ✓ Inserted attorney: {email}")
+
+        # Rows that lost an ON CONFLICT race with another writer
+        missing = [key for key in new if key not in self.users]
+        if missing:
+            for user_id, email in conn.run(USER_PREFILL_SQL, emails=missing):
+                self.users[email.lower()] = user_id
+        return len(inserted)
+
+def link_case_parties(conn, case_id, parties_data, index):
+    """Upsert all case-party relationships in one statement"""
     if not case_id:
-        print(f"  Skipping case_party link (no case_id)")
-        return
-
-    cursor = conn.cursor()
-
-    try:
-        cursor.execute(
-            """
-            INSERT INTO case_parties (case_id, party_id, role, counsel_name, created_at, updated_at)
-            VALUES (%s, %s, %s, %s, %s, %s)
-            ON CONFLICT (case_id, party_id) DO UPDATE
-            SET role = EXCLUDED.role,
-                counsel_name = EXCLUDED.counsel_name,
-                updated_at = EXCLUDED.updated_at
-            """,
-            (case_id, party_id, role, counsel_name, datetime.now(), datetime.now())
-        )
-        print(f"  ✓ Linked party to case with role: {role}")
-    except Exception as e:
-        print(f"  Error inserting case_party: {e}")
+        print(f"  Skipping case_party links (no case_id)")
+        return 0
 
-    cursor.close()
-
-def insert_attorney_as_user(conn, attorney_data, firm_name=None):
-    """Insert an attorney into the users table"""
-    cursor = conn.cursor(cursor_factory=RealDictCursor)
+    now = datetime.now()
+    links = {}
+    for party_data in parties_data:
+        party_id = index.party_id(party_data)
+        if party_id:
+            # ON CONFLICT DO UPDATE cannot touch the same row twice per statement
+            links[party_id] = (case_id, party_id, party_data['role'], counsel_name_for(party_data), now, now)
+
+    if not links:
+        return 0
+
+    values, params = values_clause(links.values())
+    conn.run(
+        f"""
+        INSERT INTO case_parties ({', '.join(CASE_PARTY_COLUMNS)}) VALUES {values}
+        ON CONFLICT (case_id, party_id) DO UPDATE
+        SET role = EXCLUDED.role,
+            counsel_name = EXCLUDED.counsel_name,
+            updated_at = EXCLUDED.updated_at
+        """,
+        **params
+    )
+    print(f"  ✓ Linked {len(links)} parties to case")
+    return len(links)
 
-    user_id = str(uuid.uuid4())
-    email = attorney_data.get('email', '').strip()
+def parse_xml_parties(xml_file):
+    """Parse XML file and extract party and attorney information"""
+    print(f"Parsing XML file: {xml_file}")
 
-    if not email:
-        # Generate email from name
-        email = attorney_data['full_name'].lower().replace(' ', '.') + '@law.example.com'
+    # Single streaming pass; each <party> is dropped once its record is built
+    return list(iter_parties(xml_file))
 
-    # Check if user already exists
-    cursor.execute(
-        "SELECT id FROM users WHERE email = %s",
-        (email,)
-    )
-    existing = cursor.fetchone()
+def get_case_id(conn):
+    """Get the case_id for case 24-2160"""
+    result = conn.execute(CASE_LOOKUP_SQL, case_number='24-2160')
 
-    if existing:
-        print(f"    Attorney already exists: {attorney_data['full_name']}")
-        user_id = existing['id']
+    if result:
+        return result[0][0]
     else:
-        # Extract name parts
-        name_parts = attorney_data['full_name'].split()
-        first_name = name_parts[0] if len(name_parts) > 0 else ''
-        last_name = name_parts[-1] if len(name_parts) > 1 else ''
-
-        try:
-            cursor.execute(
-                """
-                INSERT INTO users (
-                    id, email, password_hash, first_name, last_name,
-                    role, phone, organization, is_active, created_at, updated_at
-                )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (email) DO NOTHING
-                RETURNING id
-                """,
-                (
-                    user_id, email, 'EXTERNAL_ATTORNEY', first_name, last_name,
-                    'attorney', attorney_data.get('businessPhone') or attorney_data.get('personalPhone', ''),
-                    firm_name or attorney_data.get('office', ''),
-                    True, datetime.now(), datetime.now()
-                )
-            )
-            result = cursor.fetchone()
-            if result:
-                print(f"    ✓ Inserted attorney: {attorney_data['full_name']} ({email})")
-                if firm_name:
-                    print(f"      Firm: {firm_name}")
-            else:
-                print(f"    Attorney insert conflict: {attorney_data['full_name']}")
-        except Exception as e:
-            print(f"    Error inserting attorney: {e}")
-
-    cursor.close()
-    return user_id
+        print("WARNING: Case 24-2160 not found in database. Creating parties without case link.")
+        return None
 
 def main():
     """Main execution function"""
@@ -266,8 +215,9 @@ def main():
 
     # Connect to database
     print("\nConnecting to database...")
+    pool = get_pool()
     try:
-        conn = connect_db()
+        conn = pool.acquire()
         print("✓ Connected to PostgreSQL database")
     except Exception as e:
         print(f"✗ Database connection failed: {e}")
@@ -284,38 +234,19 @@ def main():
     print("INSERTING DATA INTO DATABASE")
     print("=" * 80)
 
-    # Insert parties and attorneys
-    parties_inserted = 0
-    attorneys_inserted = 0
+    conn.run("START TRANSACTION")
 
-    for party_data in parties_data:
-        print(f"\nProcessing: {party_data['name']}")
+    # Resolve each distinct party and attorney once, inserting the new ones in bulk
+    index = IdentityIndex()
+    index.prefill(conn, parties_data)
+    parties_inserted = index.insert_missing_parties(conn, parties_data)
+    attorneys_inserted = index.insert_missing_attorneys(conn, parties_data)
 
-        # Insert party
-        party_id = insert_party(conn, party_data)
-        if party_id:
-            parties_inserted += 1
-
-        # Link party to case
-        if case_id and party_id:
-            # Build counsel name from attorneys
-            counsel_names = [att['full_name'] for att in party_data['attorneys']]
-            counsel_name = ', '.join(counsel_names) if counsel_names else None
-
-            # If no attorneys and it's the individual, mark as Pro Se
-            if not counsel_names and party_data['type'] == 'Individual':
-                counsel_name = 'Pro Se'
-
-            insert_case_party(conn, case_id, party_id, party_data['role'], counsel_name)
-
-        # Insert attorneys
-        for attorney in party_data['attorneys']:
-            firm_name = attorney.get('office', '')
-            insert_attorney_as_user(conn, attorney, firm_name)
-            attorneys_inserted += 1
+    # Link parties to case
+    link_case_parties(conn, case_id, parties_data, index)
 
     # Commit transaction
-    conn.commit()
+    conn.run("COMMIT")
     print("\n✓ All changes committed to database")
 
     # Summary report
@@ -323,37 +254,34 @@ def main():
     print("SUMMARY REPORT")
     print("=" * 80)
     print(f"Total parties processed: {len(parties_data)}")
-    print(f"Parties inserted/updated: {parties_inserted}")
-    print(f"Attorneys inserted/updated: {attorneys_inserted}")
+    print(f"Parties inserted: {parties_inserted} (existing: {len(index.parties) - parties_inserted})")
+    print(f"Attorneys inserted: {attorneys_inserted} (existing: {len(index.users) - attorneys_inserted})")
     print(f"Case ID: {case_id or 'NOT FOUND'}")
 
     # Query final state
-    cursor = conn.cursor(cursor_factory=RealDictCursor)
-
     print("\n--- PARTIES IN DATABASE ---")
-    cursor.execute("SELECT id, name, type FROM parties ORDER BY name")
-    for row in cursor.fetchall():
-        print(f"  {row['name']} ({row['type']}) - ID: {row['id']}")
+    for party_id, name, party_type in conn.run("SELECT id, name, type FROM parties ORDER BY name"):
+        print(f"  {name} ({party_type}) - ID: {party_id}")
 
     if case_id:
         print("\n--- CASE PARTIES ---")
-        cursor.execute(
+        rows = conn.run(
             """
             SELECT p.name, cp.role, cp.counsel_name
             FROM case_parties cp
             JOIN parties p ON cp.party_id = p.id
-            WHERE cp.case_id = %s
+            WHERE cp.case_id = :case_id
             ORDER BY p.name
             """,
-            (case_id,)
+            case_id=case_id
         )
-        for row in cursor.fetchall():
-            print(f"  {row['name']}")
-            print(f"    Role: {row['role']}")
-            print(f"    Counsel: {row['counsel_name'] or 'N/A'}")
+        for name, role, counsel_name in rows:
+            print(f"  {name}")
+            print(f"    Role: {role}")
+            print(f"    Counsel: {counsel_name or 'N/A'}")
 
     print("\n--- ATTORNEYS IN DATABASE ---")
-    cursor.execute(
+    rows = conn.run(
         """
         SELECT first_name, last_name, email, organization, phone
         FROM users
@@ -361,16 +289,16 @@ def main():
         ORDER BY last_name, first_name
         """
     )
-    for row in cursor.fetchall():
-        print(f"  {row['first_name']} {row['last_name']}")
-        print(f"    Email: {row['email']}")
-        if row['organization']:
-            print(f"    Firm: {row['organization']}")
-        if row['phone']:
-            print(f"    Phone: {row['phone']}")
-
-    cursor.close()
-    conn.close()
+    for first_name, last_name, email, organization, phone in rows:
+        print(f"  {first_name} {last_name}")
+        print(f"    Email: {email}")
+        if organization:
+            print(f"    Firm: {organization}")
+        if phone:
+            print(f"    Phone: {phone}")
+
+    pool.release(conn)
+    pool.close()
 
     print("\n" + "=" * 80)
     print("AGENT 2 COMPLETE")
@@ -1,5 +1,10 @@
 import os
-import re
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+import ts_lexer
+from codemod import register, run
+from ts_lexer import apply_edits, clause_text, imports
 
 FRONTEND_PATH = "frontend/src"
 
@@ -53,86 +58,79 @@ MAPPING = {
     "tokens": "@/lib/theme/tokens", # Legacy aliasing
 }
 
-def process_file(filepath):
-    with open(filepath, 'r') as f:
-        content = f.read()
-
-    original_content = content
-
-    # Regex to find imports from @/contexts or @/theme or @/contexts/...
-    # Captures: 1=imports inside {}, 2=module path
-    # We need to handle multi-line imports
-    pattern = re.compile(r'import\s+\{([^}]+)\}\s+from\s+[\'"](@/contexts.*?|@/theme.*?)[\'"];', re.DOTALL)
-
-    matches = pattern.findall(content)
-    if not matches:
-        return False
-
-    new_imports_block = []
-
-    # We will replace the Matches with NOTHING, and instead Prepend the new imports?
-    # Or replace the first match with all new imports and remove others?
-    # Better: Replace each match with its resolved new imports. But this might duplicate imports if multiple old lines map to same new file.
-    # So we should collect all replacements, and consolidate ONLY if they are adjacent.
-    # But for safety, I will replace each occurrence with its specific needed imports. TypeScript usually compiles duplicate imports fine or we can run ESLint fix later.
-
-    def replacement_function(match):
-        imports_str = match.group(1)
-        source_module = match.group(2)
+# Named imports (import { ... } from '...') from @/contexts or @/theme modules
+# are rewritten; the lexer finds them even when they span several lines
+LEGACY_MODULES = ('@/contexts', '@/theme')
+
+@register('final-imports', extensions=('.ts', '.tsx'), depends=(ts_lexer.__file__,))
+def transform(content, filepath):
+    if '@/contexts' not in content and '@/theme' not in content:
+        return content
+
+    # Each matching import is replaced with its resolved new imports. This
+    # might duplicate imports if several old lines map to the same new file;
+    # TypeScript compiles duplicate imports fine or ESLint fix can merge them.
+    edits = []
+    for decl in imports(content, jsx=filepath.endswith('.tsx')):
+        if decl.module is None or not decl.module.startswith(LEGACY_MODULES):
+            continue
+        clause = clause_text(content, decl)
+        if not (clause.startswith('{') and clause.endswith('}')):
+            continue
+        edits.append((decl.start, decl.end, resolve_imports(clause[1:-1], decl.module, filepath)))
+    return apply_edits(content, edits)
+
+def resolve_imports(imports_str, source_module, filepath):
+    """New import lines for the named imports `imports_str` of `source_module`"""
+    # Parse imports like "useAuth, AuthProvider, \n  useTheme"
+    # Handles "useAuth as UA"
+    files_to_imports = {} # "path": ["useAuth", "AuthProvider"]
+
+    raw_imports = [x.strip() for x in imports_str.replace('\n', '').split(',')]
+    raw_imports = [x for x in raw_imports if x]
+
+    for imp in raw_imports:
+        parts = imp.split(' as ')
+        symbol = parts[0].strip()
+        alias = parts[1].strip() if len(parts) > 1 else None
+
+        target_path = MAPPING.get(symbol)
+
+        # Fallback logic for @/theme/tokens specifics
+        if not target_path:
+            if "theme/tokens" in source_module:
+                target_path = "@/lib/theme/tokens"
+            elif "theme" in source_module:
+                 target_path = "@/lib/theme/tokens" # Guess
+            else:
+                print(f"⚠️  Unknown symbol {symbol} from {source_module} in {filepath}")
+                target_path =  "@/unknown_fix_me/" + symbol
 
-        # Parse imports like "useAuth, AuthProvider, \n  useTheme"
-        # Handles "useAuth as UA"
-        files_to_imports = {} # "path": ["useAuth", "AuthProvider"]
+        if target_path not in files_to_imports:
+            files_to_imports[target_path] = []
 
-        raw_imports = [x.strip() for x in imports_str.replace('\n', '').split(',')]
-        raw_imports = [x for x in raw_imports if x]
+        if alias:
+            files_to_imports[target_path].append(f"{symbol} as {alias}")
+        else:
+            files_to_imports[target_path].append(symbol)
 
-        for imp in raw_imports:
-            parts = imp.split(' as ')
-            symbol = parts[0].strip()
-            alias = parts[1].strip() if len(parts) > 1 else None
+    # Generate replacement string
+    lines = []
+    for path, symbols in files_to_imports.items():
+        symbols_str = ", ".join(sorted(symbols))
+        lines.append(f'import {{ {symbols_str} }} from "{path}";')
 
-            target_path = MAPPING.get(symbol)
+    return "\n".join(lines)
 
-            # Fallback logic for @/theme/tokens specifics
-            if not target_path:
-                if "theme/tokens" in source_module:
-                    target_path = "@/lib/theme/tokens"
-                elif "theme" in source_module:
-                     target_path = "@/lib/theme/tokens" # Guess
-                else:
-                    print(f"⚠️  Unknown symbol {symbol} from {source_module} in {filepath}")
-                    target_path =  "@/unknown_fix_me/" + symbol
+def main():
+    def report(filepath, changed_by, error):
+        if error:
+            print(f"Error processing {filepath}: {error}")
+        elif changed_by:
+            print(f"Updated {os.path.basename(filepath)}")
 
-            if target_path not in files_to_imports:
-                files_to_imports[target_path] = []
+    result = run(['final-imports'], roots=[FRONTEND_PATH], on_result=report)
+    print(f"Total files updated: {len(result.changed)}")
 
-            if alias:
-                files_to_imports[target_path].append(f"{symbol} as {alias}")
-            else:
-                files_to_imports[target_path].append(symbol)
-
-        # Generate replacement string
-        lines = []
-        for path, symbols in files_to_imports.items():
-            symbols_str = ", ".join(sorted(symbols))
-            lines.append(f'import {{ {symbols_str} }} from "{path}";')
-
-        return "\n".join(lines)
-
-    content = pattern.sub(replacement_function, content)
-
-    if content != original_content:
-        with open(filepath, 'w') as f:
-            f.write(content)
-        return True
-    return False
-
-count = 0
-for root, dirs, files in os.walk(FRONTEND_PATH):
-    for file in files:
-        if file.endswith('.ts') or file.endswith('.tsx'):
-            if process_file(os.path.join(root, file)):
-                print(f"Updated {file}")
-                count += 1
-print(f"Total files updated: {count}")
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,13 @@
 
 import os
 import re
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+import ts_lexer
+from codemod import REPO_ROOT, SOURCE_EXTENSIONS, register, run
+from import_graph import ImportGraph
+from ts_lexer import apply_edits, is_jsx_path, module_declarations
 
 def migrate_imports(root_dir):
     replacements = [
@@ -56,51 +63,58 @@ def migrate_imports(root_dir):
                 except Exception as e:
                     print(f"Error reading {filepath}: {e}")
 
-def run_migration():
-    root = '/workspaces/lexiflow-premium/frontend/src'
-
-    # Improved list of precise replacements
-    # (pattern, replacement_template)
-    # Using quote capturing group \2
-
-    mappings = [
-        (r'(from\s+)([\'"])@/shared/ui/layouts', r'\1\2@/layouts'),
-        (r'(from\s+)([\'"])@/shared/ui', r'\1\2@/components'),
-        (r'(from\s+)([\'"])@/shared/lib', r'\1\2@/lib'),
-        (r'(from\s+)([\'"])@/shared/hooks', r'\1\2@/hooks'),
-        (r'(from\s+)([\'"])@/shared/utils', r'\1\2@/utils'),
-        (r'(from\s+)([\'"])@/shared/services', r'\1\2@/services'),
-        (r'(from\s+)([\'"])@/shared/theme', r'\1\2@/theme'),
-        (r'(from\s+)([\'"])@/shared/types', r'\1\2@/types'),
-        (r'(from\s+)([\'"])@/shared/components', r'\1\2@/components'),
-    ]
-
-    for subdir, dirs, files in os.walk(root):
-        if 'node_modules' in subdir or '.git' in subdir:
+# Improved list of precise replacements
+# (old module prefix, new module prefix) - first match wins, so longer prefixes first
+MAPPINGS = [
+    ('@/shared/ui/layouts', '@/layouts'),
+    ('@/shared/ui', '@/components'),
+    ('@/shared/lib', '@/lib'),
+    ('@/shared/hooks', '@/hooks'),
+    ('@/shared/utils', '@/utils'),
+    ('@/shared/services', '@/services'),
+    ('@/shared/theme', '@/theme'),
+    ('@/shared/types', '@/types'),
+    ('@/shared/components', '@/components'),
+]
+
+def migrate_specifier(module):
+    for old_prefix, new_prefix in MAPPINGS:
+        if module.startswith(old_prefix):
+            return new_prefix + module[len(old_prefix):]
+    return module
+
+@register('shared-imports', extensions=SOURCE_EXTENSIONS, depends=(ts_lexer.__file__,))
+def transform(content, filepath=None):
+    # Only the module specifiers of real import/export declarations are
+    # rewritten; the same text in comments, strings or JSX is left alone
+    if '@/shared/' not in content:
+        return content
+    edits = []
+    for decl in module_declarations(content, jsx=filepath is None or is_jsx_path(filepath)):
+        if decl.module is None or not decl.module.startswith('@/shared/'):
             continue
+        migrated = migrate_specifier(decl.module)
+        if migrated != decl.module:
+            start, end = decl.module_span
+            # Keep the original quote style
+            edits.append((start + 1, end - 1, migrated))
+    return apply_edits(content, edits)
 
-        for file in files:
-            if file.endswith(('.ts', '.tsx', '.js', '.jsx')):
-                filepath = os.path.join(subdir, file)
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    content = f.read()
-
-                new_content = content
-                for pattern, replacement in mappings:
-                    # We match strictly the prefix of the import path
-                    # pattern matches: from ' @/shared/ui/layouts...
-                    # we want to replace @/shared/ui/layouts with @/layouts in that string
-
-                    # Regex: (from\s+['"])@/shared/ui/layouts
-                    # SUB: \1@/layouts
-
-                    regex = re.compile(pattern)
-                    new_content = regex.sub(replacement, new_content)
-
-                if new_content != content:
-                    print(f"Updating {filepath}")
-                    with open(filepath, 'w', encoding='utf-8') as f:
-                        f.write(new_content)
+def run_migration():
+    # Only files that request an @/shared/ module can change, and the import
+    # graph knows which those are without reading the tree
+    with ImportGraph() as graph:
+        graph.update()
+        files = [str(REPO_ROOT / path) for path in graph.importers_of_specifier('@/shared/')
+                 if path.startswith('frontend/src/')]
+
+    def report(filepath, changed_by, error):
+        if error:
+            print(f"Error processing {filepath}: {error}")
+        elif changed_by:
+            print(f"Updating {filepath}")
+
+    run(['shared-imports'], files=files, on_result=report)
 
 if __name__ == '__main__':
     run_migration()
@@ -2,6 +2,13 @@
 import re
 import glob
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+from codemod import register, run
+from file_cache import FileCache
+import multi_replace
+from multi_replace import ReplacementTable
 
 # Mappings for base classes
 REPLACEMENTS = {
@@ -48,34 +55,23 @@ DARK_MODE_REMOVALS = [
     r'\bdark:text-blue-\d+\b', # Primary usually handles dark mode contrast itself in tokens
 ]
 
-def process_file(filepath):
-    with open(filepath, 'r') as f:
-        content = f.read()
-
-    original_content = content
-
-    # 1. Apply replacements
-    for pattern, replacement in REPLACEMENTS.items():
-        content = re.sub(pattern, replacement, content)
-
-    # 2. Remove dark mode overrides
-    # careful not to leave double spaces
-    for pattern in DARK_MODE_REMOVALS:
-        content = re.sub(pattern, '', content)
-
-    # 3. Cleanup spaces
-    content = re.sub(r'\s{2,}', ' ', content) # cleanup extra spaces in class names
-    content = re.sub(r'className=" ', 'className="', content)
-    content = re.sub(r' "', '"', content)
+# All three steps as one ordered table, applied in as few scans as possible:
+# 1. Apply replacements
+# 2. Remove dark mode overrides (careful not to leave double spaces)
+# 3. Cleanup spaces
+TABLE = ReplacementTable(
+    list(REPLACEMENTS.items())
+    + [(pattern, '') for pattern in DARK_MODE_REMOVALS]
+    + [
+        (r'\s{2,}', ' '), # cleanup extra spaces in class names
+        (r'className=" ', 'className="'),
+        (r' "', '"'),
+    ]
+)
 
-    if content != original_content:
-        # Check if we broke anything (basic check)
-        # e.g. check if we have unclosed braces or something?
-        # For now, just save
-        with open(filepath, 'w') as f:
-            f.write(content)
-        return True
-    return False
+@register('css-vars', extensions=('.tsx', '.ts'), depends=(multi_replace.__file__,))
+def transform(content, filepath=None):
+    return TABLE.sub(content)
 
 def main():
     # Use the list I generated earlier
@@ -139,19 +135,27 @@ def main():
 
     base_dir = '/workspaces/lexiflow-premium/frontend/src'
 
-    count = 0
+    files = []
     for rel_path in targets:
         filepath = os.path.join(base_dir, rel_path)
         if os.path.exists(filepath):
-            if process_file(filepath):
-                count += 1
-                print(f"Updated {rel_path}")
-            else:
-                print(f"Skipped {rel_path} (no changes needed)")
+            files.append(filepath)
         else:
              print(f"File not found: {filepath}")
 
-    print(f"Total files updated: {count}")
+    def report(filepath, changed_by, error):
+        rel_path = os.path.relpath(filepath, base_dir)
+        if error:
+            print(f"Error in {rel_path}: {error}")
+        elif changed_by:
+            print(f"Updated {rel_path}")
+        else:
+            print(f"Skipped {rel_path} (no changes needed)")
+
+    with FileCache() as cache:
+        result = run(['css-vars'], files=files, on_result=report, cache=cache)
+
+    print(f"Total files updated: {len(result.changed)}")
 
 if __name__ == '__main__':
     main()
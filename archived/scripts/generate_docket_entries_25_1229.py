@@ -13,23 +13,80 @@ Example:
 This script will:
   - auto-increment sequence_number
   - parse date_filed from the second field
-  - infer type from the full text (Motion, Order, Notice, etc.)
+  - infer type from the full text (Motion, Order, Notice, etc.) with the
+    same docket_text rule table the XML loaders use
   - set document_title to the first sentence
   - set description to the full text
   - extract ecf_document_number from [1001xxxxxxxx] token
-  - leave case_id as a placeholder ({CASE_ID}) so you can either:
-      * replace it manually, or
-      * wrap in a DO $$ block that selects case_id for 25-1229.
+  - write case_id as a placeholder expression (default v_case_id) and wrap
+    the statements in a DO $$ block that selects it for the case number,
+    or, with --no-wrap, leave the placeholder for you to replace.
+
+The input is read line by line and each multi-row INSERT (--batch-size rows)
+is written out as soon as its batch is full, so memory use stays flat however
+large the export is. Use "-" to read from stdin.
+
+With --load the rows are sent straight to PostgreSQL instead (connection
+settings from DATABASE_URL / DB_*, as for the other docket loaders), in a
+single transaction: one streamed COPY FROM STDIN by default, or
+parameterized multi-row INSERTs with --load insert. Values travel as data,
+so there is no SQL escaping and no psql step.
 
 Usage:
   python archived/scripts/generate_docket_entries_25_1229.py \
     input_entries.txt > archived/docket_entries_insert_25_1229.generated.sql
+
+  python archived/scripts/generate_docket_entries_25_1229.py \
+    export.txt --case-number 25-1229 --batch-size 1000 -o entries.sql
+
+  python archived/scripts/generate_docket_entries_25_1229.py \
+    export.txt --no-wrap --placeholder '{CASE_ID}' > entries.sql
+
+  DATABASE_URL=postgres://... python archived/scripts/generate_docket_entries_25_1229.py \
+    export.txt --load [copy|insert]
 """
 
+import argparse
+import os
 import re
 import sys
+import time
+import uuid
 from datetime import datetime
-from typing import List, Tuple
+from typing import IO, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+# docket_text, docket_dates and docket_db live in archived/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from docket_dates import normalize_date
+from docket_text import TypeClassifier, load_type_rules, type_classifier
+
+BATCH_SIZE = 500
+CASE_NUMBER = "25-1229"
+PLACEHOLDER = "v_case_id"
+LOAD_MODES = ("copy", "insert")
+
+INSERT_COLUMNS = (
+    "id", "case_id", "sequence_number", "date_filed", "entry_date", "type",
+    "document_title", "description", "filed_by", "ecf_document_number",
+    "ecf_url", "is_sealed", "created_at",
+)
+
+ECF_NUMBER_RE = re.compile(r"\[(\d{10,})\]")
+TRAILING_NAME_RE = re.compile(r"\]\s*([^\[\]]+)$")
+WHITESPACE_RE = re.compile(r"\s+")
+SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+class Entry(NamedTuple):
+    sequence_number: int
+    date_filed: str     # YYYY-MM-DD
+    type: str
+    title: str
+    text: str
+    filed_by: str
+    ecf_number: str
+    url: str
 
 
 def parse_line(line: str) -> Tuple[str, str, str]:
@@ -42,132 +99,278 @@ def parse_line(line: str) -> Tuple[str, str, str]:
 
 def parse_date(date_str: str) -> str:
     """Convert MM/DD/YYYY to YYYY-MM-DD."""
-    dt = datetime.strptime(date_str, "%m/%d/%Y")
-    return dt.strftime("%Y-%m-%d")
-
-
-def infer_type(text: str) -> str:
-    upper = text.upper()
-    if "CERTIFICATE OF SERVICE" in upper or "CERTIFICATE OF COMPLIANCE" in upper:
-        return "Filing"
-    if "MOTION" in upper:
-        return "Motion"
-    if "ORDER" in upper or "COURT ORDER" in upper:
-        return "Order"
-    if "NOTICE" in upper:
-        return "Notice"
-    if "BRIEF" in upper:
-        return "Filing"
-    if "JUDGMENT" in upper:
-        return "Judgment"
-    if "DISCLOSURE STATEMENT" in upper:
-        return "Filing"
-    return "Filing"
+    iso = normalize_date(date_str)
+    if iso is None:
+        raise ValueError(f"time data {date_str!r} does not match format '%m/%d/%Y'")
+    return iso
+
+
+def infer_type(text: str, classifier: Optional[TypeClassifier] = None) -> str:
+    """Document type from the shared docket_text rule table"""
+    return (classifier or type_classifier()).classify(text)
 
 
 def extract_ecf_number(text: str) -> str:
-    m = re.search(r"\[(\d{10,})\]", text)
+    m = ECF_NUMBER_RE.search(text)
     return m.group(1) if m else ""
 
 
 def extract_filed_by(text: str) -> str:
     # Try trailing name pattern "... Justin Saadein-Morales" etc.
-    m = re.search(r"\]\s*([^\[\]]+)$", text)
+    m = TRAILING_NAME_RE.search(text)
     if m:
         tail = m.group(1).strip()
         # Trim case number brackets and excess whitespace
-        tail = re.sub(r"\s+", " ", tail)
+        tail = WHITESPACE_RE.sub(" ", tail)
         if len(tail) <= 255:
             return tail
     return ""
 
 
 def first_sentence(text: str) -> str:
-    m = re.split(r"(?<=[.!?])\s+", text.strip(), maxsplit=1)
+    m = SENTENCE_END_RE.split(text.strip(), maxsplit=1)
     return m[0][:255]
 
 
-def generate_inserts(lines: List[str]) -> str:
+def sql_literal(value: str) -> str:
+    """Quote a string for SQL"""
+    return "'" + value.replace("'", "''") + "'"
+
+
+def iter_entries(lines: Iterable[str], classifier: Optional[TypeClassifier] = None) -> Iterator[Entry]:
+    """One parsed Entry per ENTRY line; blank lines and -- comments are skipped"""
+    classify = (classifier or type_classifier()).classify
     seq = 1
-    inserts: List[str] = []
-    for raw in lines:
+    for line_number, raw in enumerate(lines, 1):
         if not raw.strip() or raw.lstrip().startswith("--"):
             continue
-        date_str, text, url = parse_line(raw)
-        date_sql = parse_date(date_str)
-        entry_type = infer_type(text)
-        title = first_sentence(text)
-        ecf_number = extract_ecf_number(text)
-        filed_by = extract_filed_by(text)
-
-        # Escape single quotes for SQL
-        esc_title = title.replace("'", "''")
-        esc_text = text.replace("'", "''")
-        esc_filed_by = filed_by.replace("'", "''")
-        esc_url = url.replace("'", "''")
-
-        insert = f"    INSERT INTO docket_entries (\n" \
-                 f"        id,\n" \
-                 f"        case_id,\n" \
-                 f"        sequence_number,\n" \
-                 f"        date_filed,\n" \
-                 f"        entry_date,\n" \
-                 f"        type,\n" \
-                 f"        document_title,\n" \
-                 f"        description,\n" \
-                 f"        filed_by,\n" \
-                 f"        ecf_document_number,\n" \
-                 f"        ecf_url,\n" \
-                 f"        is_sealed,\n" \
-                 f"        created_at\n" \
-                 f"    ) VALUES (\n" \
-                 f"        gen_random_uuid(),\n" \
-                 f"        {{CASE_ID}},\n" \
-                 f"        {seq},\n" \
-                 f"        '{date_sql}',\n" \
-                 f"        '{date_sql}',\n" \
-                 f"        '{entry_type}',\n" \
-                 f"        '{esc_title}',\n" \
-                 f"        '{esc_text}',\n" \
-                 f"        '{esc_filed_by}',\n" \
-                 f"        '{ecf_number}',\n" \
-                 f"        '{esc_url}',\n" \
-                 f"        FALSE,\n" \
-                 f"        CURRENT_TIMESTAMP\n" \
-                 f"    );\n"
-
-        inserts.append(insert)
+        try:
+            date_str, text, url = parse_line(raw)
+            date_sql = parse_date(date_str)
+        except ValueError as e:
+            raise ValueError(f"line {line_number}: {e}") from None
+        yield Entry(seq, date_sql, classify(text), first_sentence(text), text,
+                    extract_filed_by(text), extract_ecf_number(text), url)
         seq += 1
 
-    return "".join(inserts)
 
+def iter_rows(lines: Iterable[str], case_id: str = "{CASE_ID}",
+              classifier: Optional[TypeClassifier] = None) -> Iterator[str]:
+    """One VALUES tuple of SQL literals per ENTRY line"""
+    for entry in iter_entries(lines, classifier):
+        date_literal = sql_literal(entry.date_filed)
+        yield (
+            "        ("
+            f"gen_random_uuid(), {case_id}, {entry.sequence_number}, {date_literal}, {date_literal}, "
+            f"{sql_literal(entry.type)}, {sql_literal(entry.title)}, "
+            f"{sql_literal(entry.text)}, {sql_literal(entry.filed_by)}, "
+            f"{sql_literal(entry.ecf_number)}, {sql_literal(entry.url)}, "
+            "FALSE, CURRENT_TIMESTAMP)"
+        )
+
+
+def iter_statements(lines: Iterable[str], case_id: str = "{CASE_ID}",
+                    batch_size: int = BATCH_SIZE,
+                    classifier: Optional[TypeClassifier] = None) -> Iterator[str]:
+    """Multi-row INSERT statements of up to `batch_size` rows each"""
+    header = f"    INSERT INTO docket_entries ({', '.join(INSERT_COLUMNS)})\n    VALUES\n"
+    batch: List[str] = []
+    for row in iter_rows(lines, case_id, classifier):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield header + ",\n".join(batch) + ";\n"
+            batch = []
+    if batch:
+        yield header + ",\n".join(batch) + ";\n"
 
-def main() -> None:
-    if len(sys.argv) != 2:
-        print("Usage: generate_docket_entries_25_1229.py <input_entries.txt>", file=sys.stderr)
-        sys.exit(1)
 
-    input_path = sys.argv[1]
-    with open(input_path, "r", encoding="utf-8") as f:
-        lines = f.readlines()
+def generate_inserts(lines: List[str]) -> str:
+    """All INSERTs for `lines` as one string, with {CASE_ID} left in place"""
+    return "".join(iter_statements(lines))
+
+
+def write_sql(lines: Iterable[str], out: IO[str], case_number: str = CASE_NUMBER,
+              placeholder: str = PLACEHOLDER, batch_size: int = BATCH_SIZE,
+              wrap: bool = True, classifier: Optional[TypeClassifier] = None) -> int:
+    """Stream the INSERTs for `lines` to `out`; returns the number of statements"""
+    if wrap:
+        # Wrap with DO $$ to resolve case_id for the case
+        out.write("DO $$\n")
+        out.write("DECLARE\n")
+        out.write(f"    {placeholder} UUID;\n")
+        out.write("BEGIN\n")
+        out.write(f"    SELECT id INTO {placeholder} FROM cases "
+                  f"WHERE case_number = {sql_literal(case_number)} LIMIT 1;\n")
+        out.write(f"    IF {placeholder} IS NULL THEN\n")
+        out.write(f"        RAISE EXCEPTION {sql_literal(f'Case {case_number} not found.')};\n")
+        out.write("    END IF;\n\n")
+
+    statements = 0
+    for statement in iter_statements(lines, placeholder, batch_size, classifier):
+        if statements:
+            out.write("\n")
+        out.write(statement)
+        statements += 1
+
+    if wrap:
+        out.write("END $$;\n")
+    return statements
+
+
+CASE_ID_SQL = "SELECT id FROM cases WHERE case_number = :case_number LIMIT 1"
+
+
+def load_rows(entries: Iterable[Entry], case_id: str, now: datetime) -> Iterator[tuple]:
+    """INSERT_COLUMNS tuples for `entries`, passed to --load as data rather than SQL text"""
+    for entry in entries:
+        yield (
+            str(uuid.uuid4()), case_id, entry.sequence_number, entry.date_filed,
+            entry.date_filed, entry.type, entry.title, entry.text, entry.filed_by,
+            entry.ecf_number, entry.url, False, now,
+        )
+
+
+def load_entries(conn, lines: Iterable[str], case_number: str = CASE_NUMBER,
+                 mode: str = "copy", batch_size: int = BATCH_SIZE,
+                 classifier: Optional[TypeClassifier] = None) -> int:
+    """Load the entries in `lines` into docket_entries in one transaction.
+
+    `conn` is a docket_db PooledConnection. In copy mode every row is streamed
+    through a single COPY FROM STDIN as the input is read; in insert mode rows
+    go out as parameterized multi-row INSERTs of `batch_size` rows through
+    the connection's prepared statement cache, so the full batches share one
+    statement and a shorter final batch adds at most one more. Either way
+    nothing is rendered as SQL literals and psql is not involved. Returns the
+    number of rows loaded.
+    """
+    # Imported here so generating SQL does not need a database driver
+    from docket_db import copy_value, values_clause
+
+    if mode not in LOAD_MODES:
+        raise ValueError(f"Unknown load mode: {mode}")
+    columns = ", ".join(INSERT_COLUMNS)
+
+    conn.run("START TRANSACTION")
+    try:
+        result = conn.run(CASE_ID_SQL, case_number=case_number)
+        if not result:
+            raise ValueError(f"Case {case_number} not found.")
+        case_id = str(result[0][0])
+        rows = load_rows(iter_entries(lines, classifier), case_id, datetime.now())
+
+        loaded = 0
+        if mode == "copy":
+            def copy_lines():
+                nonlocal loaded
+                for row in rows:
+                    loaded += 1
+                    yield "\t".join(copy_value(v) for v in row) + "\n"
+
+            conn.run(f"COPY docket_entries ({columns}) FROM STDIN", stream=copy_lines())
+        else:
+            batch: List[tuple] = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    values, params = values_clause(batch)
+                    conn.execute(f"INSERT INTO docket_entries ({columns}) VALUES {values}", **params)
+                    loaded += len(batch)
+                    batch = []
+            if batch:
+                values, params = values_clause(batch)
+                conn.execute(f"INSERT INTO docket_entries ({columns}) VALUES {values}", **params)
+                loaded += len(batch)
+
+        conn.run("COMMIT")
+    except BaseException:
+        try:
+            conn.run("ROLLBACK")
+        except Exception:
+            pass
+        raise
+    return loaded
+
+
+def load_file(source: IO[str], case_number: str, mode: str, batch_size: int,
+              classifier: Optional[TypeClassifier] = None) -> int:
+    """--load: stream `source` into the database configured by the environment"""
+    from docket_db import get_pool
+
+    pool = get_pool()
+    started = time.perf_counter()
+    try:
+        with pool.connection() as conn:
+            loaded = load_entries(conn, source, case_number, mode, batch_size, classifier)
+    finally:
+        pool.close()
+    elapsed = time.perf_counter() - started
+    print(f"✓ Loaded {loaded} docket entries for case {case_number} "
+          f"({mode}) in {elapsed:.2f}s", file=sys.stderr)
+    return loaded
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Generate docket_entries INSERTs from a pipe-delimited ENTRY file")
+    parser.add_argument("input", help='ENTRY file, or "-" for stdin')
+    parser.add_argument("-o", "--output", default="-",
+                        help="Output file (default: stdout)")
+    parser.add_argument("--case-number", default=CASE_NUMBER,
+                        help=f"Case whose id the rows are inserted under (default: {CASE_NUMBER})")
+    parser.add_argument("--placeholder", default=PLACEHOLDER,
+                        help=f"Expression written as case_id (default: {PLACEHOLDER})")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                        help=f"Rows per INSERT statement (default: {BATCH_SIZE})")
+    parser.add_argument("--no-wrap", action="store_true",
+                        help="Write bare INSERTs without the DO $$ case lookup")
+    parser.add_argument("--rules",
+                        help="Type rules JSON file (default: $DOCKET_TYPE_RULES_FILE, else the "
+                             "built-in rule table the XML loaders use)")
+    parser.add_argument("--court",
+                        help="Apply this court's overrides from the rules file (default: none)")
+    parser.add_argument("--load", nargs="?", const="copy", choices=LOAD_MODES,
+                        help="Load straight into PostgreSQL (DATABASE_URL / DB_* settings) "
+                             "with COPY (default) or parameterized batched INSERTs "
+                             "instead of writing SQL")
+    args = parser.parse_args()
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+    return args
 
-    body = generate_inserts(lines)
 
-    # Wrap with DO $$ to resolve case_id for 25-1229
-    print("DO $$")
-    print("DECLARE")
-    print("    v_case_id UUID;")
-    print("BEGIN")
-    print("    SELECT id INTO v_case_id FROM cases WHERE case_number = '25-1229' LIMIT 1;")
-    print("    IF v_case_id IS NULL THEN")
-    print("        RAISE EXCEPTION 'Case 25-1229 not found.';")
-    print("    END IF;\n")
+def main() -> None:
+    args = parse_args()
 
-    # Substitute placeholder
-    body = body.replace("{CASE_ID}", "v_case_id")
-    print(body.rstrip("\n"))
+    try:
+        classifier = load_type_rules(args.rules, args.court)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"ERROR: Cannot load type rules: {e}", file=sys.stderr)
+        sys.exit(1)
 
-    print("END $$;")
+    source = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    if args.load:
+        try:
+            load_file(source, args.case_number, args.load, args.batch_size, classifier)
+        except (ValueError, ImportError) as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            sys.exit(1)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+        return
+
+    target = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        write_sql(source, target, args.case_number, args.placeholder,
+                  args.batch_size, wrap=not args.no_wrap, classifier=classifier)
+    except ValueError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
 
 
 if __name__ == "__main__":
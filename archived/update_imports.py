@@ -1,5 +1,9 @@
 import os
 import re
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+from file_inventory import inventory
 
 def process_file(file_path):
     with open(file_path, 'r') as f:
@@ -78,11 +82,8 @@ def process_file(file_path):
             f.write('\n'.join(new_lines))
 
 def main():
-    root_dir = '/workspaces/lexiflow-premium/nextjs/src'
-    for root, dirs, files in os.walk(root_dir):
-        for file in files:
-            if file.endswith('.ts') or file.endswith('.tsx'):
-                process_file(os.path.join(root, file))
+    for file_path in inventory().paths(extensions=('.ts', '.tsx'), directory='nextjs/src'):
+        process_file(file_path)
 
 if __name__ == '__main__':
     main()
@@ -1,5 +1,10 @@
 import os
 import re
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+from codemod import SOURCE_EXTENSIONS, register, run
+from import_graph import ImportGraph
 
 # Refactoring Import Mappings
 MAPPINGS = [
@@ -62,36 +67,42 @@ MAPPINGS = [
 
 ROOT_DIR = '/workspaces/lexiflow-premium/frontend/src'
 
-def update_file(filepath):
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
+@register('refactor-imports', extensions=SOURCE_EXTENSIONS)
+def transform(content, filepath=None):
+    for old, new in MAPPINGS:
+        # Simple string replace for import paths
+        # We look for: from 'old...' or import 'old...'
+        # But straightforward string replacement is usually safe for these specific long paths
+        # provided we check context or just simple replace since these are absolute paths in aliased imports
+
+        if old in content:
+            content = content.replace(old, new)
 
-        original_content = content
+    return content
 
+def print_impact():
+    """How many modules import each old path, from the import graph"""
+    with ImportGraph() as graph:
+        graph.update()
         for old, new in MAPPINGS:
-            # Simple string replace for import paths
-            # We look for: from 'old...' or import 'old...'
-            # But straightforward string replacement is usually safe for these specific long paths
-            # provided we check context or just simple replace since these are absolute paths in aliased imports
+            importers = [path for path in graph.importers_of_specifier(old)
+                         if path.startswith('frontend/src/')]
+            if importers:
+                print(f"  {old} -> {new}: {len(importers)} file(s)")
 
-            if old in content:
-                content = content.replace(old, new)
+def main():
+    print("Starting import update...")
+    # The rewrite itself still scans every file: mocks, comments and strings
+    # mention these paths too
+    print_impact()
 
-        if content != original_content:
+    def report(filepath, changed_by, error):
+        if error:
+            print(f"Error processing {filepath}: {error}")
+        elif changed_by:
             print(f"Updating {filepath}")
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
 
-    except Exception as e:
-        print(f"Error processing {filepath}: {e}")
-
-def main():
-    print("Starting import update...")
-    for root, dirs, files in os.walk(ROOT_DIR):
-        for file in files:
-            if file.endswith(('.ts', '.tsx', '.js', '.jsx')):
-                update_file(os.path.join(root, file))
+    run(['refactor-imports'], roots=[ROOT_DIR], on_result=report)
     print("Done.")
 
 if __name__ == '__main__':
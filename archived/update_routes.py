@@ -1,5 +1,9 @@
 import os
 import re
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+from file_inventory import inventory
 
 def update_route_file(filepath):
     with open(filepath, 'r') as f:
@@ -81,11 +85,8 @@ def update_route_file(filepath):
 
 # Scan directories
 count = 0
-for root, dirs, files in os.walk("nextjs/src/app/api"):
-    for file in files:
-        if file == "route.ts":
-            path = os.path.join(root, file)
-            if update_route_file(path):
-                count += 1
+for path in inventory().paths(directory="nextjs/src/app/api", pattern="*/route.ts"):
+    if update_route_file(path):
+        count += 1
 
 print(f"Total files updated: {count}")
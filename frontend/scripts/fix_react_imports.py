@@ -7,23 +7,45 @@ import re
 import sys
 from pathlib import Path
 
-def fix_react_import(content: str) -> tuple[str, bool]:
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'scripts'))
+import ts_lexer
+from codemod import register
+from ts_lexer import apply_edits, clause_text, imports, is_jsx_path
+
+REACT_WITH_NAMED = re.compile(r'React\s*,\s*(\{[^}]*\})')
+# Rest of the line plus any blank lines after it, as `\s*$` always removed;
+# when code or a comment follows on the same line, just the spaces before it
+LINE_REST = re.compile(r'\s*$|[ \t]*', re.MULTILINE)
+
+def fix_react_import(content: str, jsx: bool = True) -> tuple[str, bool]:
     """Remove or fix unused React imports."""
-    changed = False
-    
-    # Pattern 1: import React from "react"; or import React from 'react';
-    pattern1 = r'^import React from ["\']react["\'];?\s*$'
-    if re.search(pattern1, content, re.MULTILINE):
-        content = re.sub(pattern1, '', content, flags=re.MULTILINE)
-        changed = True
-    
-    # Pattern 2: import React, { ... } from "react"; -> import { ... } from "react";
-    pattern2 = r'^import React, \{([^}]+)\} from (["\'])react\2;'
-    if re.search(pattern2, content, re.MULTILINE):
-        content = re.sub(pattern2, r'import {\1} from \2react\2;', content, flags=re.MULTILINE)
-        changed = True
-    
-    return content, changed
+    edits = []
+
+    for decl in imports(content, jsx):
+        if decl.module != 'react':
+            continue
+        clause = clause_text(content, decl)
+
+        # Pattern 1: import React from "react"; -> removed with the blank lines after it
+        if clause == 'React':
+            edits.append((decl.start, LINE_REST.match(content, decl.end).end(), ''))
+            continue
+
+        # Pattern 2: import React, { ... } from "react"; -> import { ... } from "react";
+        named = REACT_WITH_NAMED.fullmatch(clause)
+        if named:
+            edits.append((decl.clause[0], decl.clause[1], named.group(1)))
+
+    if not edits:
+        return content, False
+    return apply_edits(content, edits), True
+
+@register('unused-react-import', extensions=('.tsx', '.ts'), depends=(ts_lexer.__file__,))
+def transform(content: str, path: str) -> str:
+    """Codemod transform wrapper around fix_react_import."""
+    if 'React' not in content:
+        return content
+    return fix_react_import(content, is_jsx_path(path))[0]
 
 def main():
     frontend_dir = Path(__file__).parent
@@ -36,7 +58,7 @@ def main():
     for file_path in files:
         try:
             content = file_path.read_text(encoding='utf-8')
-            new_content, changed = fix_react_import(content)
+            new_content, changed = fix_react_import(content, is_jsx_path(str(file_path)))
             
             if changed:
                 file_path.write_text(new_content, encoding='utf-8')
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark: ReplacementTable vs one re.sub per rule
+==================================================
+
+Runs the theme migration tables (migrate_to_css_vars, batch_theme_update,
+apply_theme_tokens) over the real component tree both ways, checks the
+single-pass output is identical to the sequential re.sub chain for every
+file, and times them. --fuzz additionally checks parity on random strings
+stitched together from the tables' own tokens, which exercises adjacency
+and overlap cases the real tree never hits.
+
+Usage:
+  python scripts/benchmark_multi_replace.py
+  python scripts/benchmark_multi_replace.py --root frontend/src --fuzz 20000
+"""
+
+import argparse
+import random
+import re
+import time
+
+import codemod
+from codemod import DEFAULT_ROOTS, REPO_ROOT
+from multi_replace import ReplacementTable, sequential_subn
+
+
+def load_tables():
+    css = codemod.load_script(str(REPO_ROOT / "archived" / "migrate_to_css_vars.py"))
+    batch = codemod.load_script(str(REPO_ROOT / "archived" / "batch_theme_update.py"))
+    tokens = codemod.load_script(str(REPO_ROOT / "archived" / "apply_theme_tokens.py"))
+
+    css_rules = (list(css.REPLACEMENTS.items())
+                 + [(pattern, '') for pattern in css.DARK_MODE_REMOVALS]
+                 + [(r'\s{2,}', ' '), (r'className=" ', 'className="'), (r' "', '"')])
+    batch_rules = list(batch.COLOR_REPLACEMENTS.items()) + batch.BUTTON_PATTERNS
+    token_rules = list(tokens.COLOR_PATTERNS.items())
+    return [
+        ("migrate_to_css_vars", css_rules, "sub"),
+        ("batch_theme_update", batch_rules, "sub"),
+        ("apply_theme_tokens", token_rules, "count"),
+    ]
+
+
+def sequential_count(rules, text):
+    return sum(len(re.findall(pattern, text)) for pattern, _ in rules)
+
+
+def fuzz_corpus(rules, count, seed):
+    """Random strings made of rule literals, replacements and separators"""
+    rng = random.Random(seed)
+    pieces = [' ', '  ', '"', 'className="', ':', '-', 'x', '0', '5', '\n', 'dark:']
+    for pattern, replacement in rules:
+        pieces.append(re.sub(r'\\[bBd]|\(\?<?[=!][^)]*\)|[+*?{}()\[\]^$|]', '', pattern).replace('\\', ''))
+        if isinstance(replacement, str):
+            pieces.append(replacement)
+    return [''.join(rng.choice(pieces) for _ in range(rng.randint(1, 12))) for _ in range(count)]
+
+
+def time_it(func, corpus):
+    start = time.perf_counter()
+    results = [func(text) for text in corpus]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark single-pass replacement tables")
+    parser.add_argument("--root", action="append", dest="roots",
+                        help="Source root (repeatable, default: frontend/src and nextjs/src)")
+    parser.add_argument("--fuzz", type=int, default=0, help="Random strings to check per table")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    paths = list(codemod.iter_source_files(args.roots or DEFAULT_ROOTS, (".tsx", ".ts")))
+    corpus = [codemod.read_source(path) for path in paths]
+    size = sum(len(text) for text in corpus) / 1e6
+    print(f"Corpus: {len(corpus):,} files, {size:.1f}M characters")
+    print()
+    print(f"{'table':<22}{'rules':>7}{'scans':>7}{'sequential':>12}{'single-pass':>13}{'speedup':>9}{'mismatches':>12}")
+
+    failed = False
+    for name, rules, mode in load_tables():
+        start = time.perf_counter()
+        table = ReplacementTable(rules)
+        compile_seconds = time.perf_counter() - start
+
+        if mode == "count":
+            legacy = lambda text: sequential_count(rules, text)
+            shared = table.count
+        else:
+            legacy = lambda text: sequential_subn(rules, text)
+            shared = table.subn
+
+        legacy_seconds, expected = time_it(legacy, corpus)
+        shared_seconds, actual = time_it(shared, corpus)
+        mismatches = sum(1 for a, b in zip(expected, actual) if a != b)
+
+        fuzz_mismatches = 0
+        if args.fuzz:
+            samples = fuzz_corpus(rules, args.fuzz, args.seed)
+            fuzz_mismatches = sum(1 for text in samples if legacy(text) != shared(text))
+
+        failed = failed or mismatches or fuzz_mismatches
+        print(f"{name:<22}{len(rules):>7}{len(table.stages):>7}{legacy_seconds:>11.2f}s"
+              f"{shared_seconds:>12.2f}s{legacy_seconds / shared_seconds:>8.1f}x{mismatches:>12}"
+              + (f"  (fuzz mismatches: {fuzz_mismatches})" if args.fuzz else "")
+              + f"  [compile {compile_seconds * 1000:.0f}ms]")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Benchmark: ts_lexer import rewriting vs the old per-line regexes
+================================================================
+
+Tokenizes frontend/src once with ts_lexer, then runs each import rewrite both
+ways - the line-regex versions the scripts used before (kept here as the
+reference) and the span-edit versions built on module_declarations() - and
+reports time and how many files come out differently. Differences are
+expected only where the regexes were wrong (matches in comments, strings or
+JSX text, imports past the 20-line window, multi-line declarations); use
+--show to print them.
+
+Usage:
+  python scripts/benchmark_ts_lexer.py
+  python scripts/benchmark_ts_lexer.py --root nextjs/src --show 5
+"""
+
+import argparse
+import contextlib
+import difflib
+import io
+import os
+import re
+import time
+
+import codemod
+from codemod import REPO_ROOT
+from ts_lexer import is_jsx_path, module_declarations, tokenize
+
+FRONTEND_SRC = REPO_ROOT / "frontend" / "src"
+
+
+# -- reference implementations (the previous line-regex versions) ----------
+
+LEGACY_SHARED_MAPPINGS = [
+    (re.compile(pattern), replacement) for pattern, replacement in [
+        (r'(from\s+)([\'"])@/shared/ui/layouts', r'\1\2@/layouts'),
+        (r'(from\s+)([\'"])@/shared/ui', r'\1\2@/components'),
+        (r'(from\s+)([\'"])@/shared/lib', r'\1\2@/lib'),
+        (r'(from\s+)([\'"])@/shared/hooks', r'\1\2@/hooks'),
+        (r'(from\s+)([\'"])@/shared/utils', r'\1\2@/utils'),
+        (r'(from\s+)([\'"])@/shared/services', r'\1\2@/services'),
+        (r'(from\s+)([\'"])@/shared/theme', r'\1\2@/theme'),
+        (r'(from\s+)([\'"])@/shared/types', r'\1\2@/types'),
+        (r'(from\s+)([\'"])@/shared/components', r'\1\2@/components'),
+    ]
+]
+LEGACY_FINAL_PATTERN = re.compile(
+    r'import\s+\{([^}]+)\}\s+from\s+[\'"](@/contexts.*?|@/theme.*?)[\'"];', re.DOTALL)
+
+
+def legacy_shared_imports(content, path):
+    if '@/shared/' not in content:
+        return content
+    for regex, replacement in LEGACY_SHARED_MAPPINGS:
+        content = regex.sub(replacement, content)
+    return content
+
+
+def legacy_final_imports(resolve):
+    def transform(content, path):
+        if '@/contexts' not in content and '@/theme' not in content:
+            return content
+        return LEGACY_FINAL_PATTERN.sub(lambda m: resolve(m.group(1), m.group(2), path), content)
+    return transform
+
+
+def legacy_fix_react_import(content, path):
+    if 'React' not in content:
+        return content
+    pattern1 = r'^import React from ["\']react["\'];?\s*$'
+    content = re.sub(pattern1, '', content, flags=re.MULTILINE)
+    pattern2 = r'^import React, \{([^}]+)\} from (["\'])react\2;'
+    return re.sub(pattern2, r'import {\1} from \2react\2;', content, flags=re.MULTILINE)
+
+
+def legacy_add_react_import(content, path):
+    lines = content.split('\n')
+    first_import_idx = None
+    for idx, line in enumerate(lines):
+        if line.strip().startswith('import '):
+            first_import_idx = idx
+            break
+    if first_import_idx is None:
+        insert_idx = 0
+        for idx, line in enumerate(lines):
+            if not line.strip().startswith('//') and not line.strip().startswith('/*') and not line.strip().startswith('*'):
+                if line.strip() != '':
+                    insert_idx = idx
+                    break
+        lines.insert(insert_idx, "import React from 'react';")
+        return '\n'.join(lines)
+    for idx in range(first_import_idx, min(first_import_idx + 20, len(lines))):
+        match = re.match(r"^import\s+\{([^}]*)\}\s+from\s+['\"]react['\"];?", lines[idx])
+        if match:
+            lines[idx] = f"import React, {{ {match.group(1).strip()} }} from 'react';"
+            return '\n'.join(lines)
+    lines.insert(first_import_idx, "import React from 'react';")
+    return '\n'.join(lines)
+
+
+# -- harness ----------------------------------------------------------------
+
+def load_rewrites():
+    shared = codemod.load_script(str(REPO_ROOT / "archived" / "migrate_imports.py"))
+    final = codemod.load_script(str(REPO_ROOT / "archived" / "migrate_final_imports.py"))
+    unused = codemod.load_script(str(REPO_ROOT / "frontend" / "scripts" / "fix_react_imports.py"))
+    react_fc = codemod.load_script(str(REPO_ROOT / "scripts" / "fix-react-fc-imports.py"))
+
+    def add_react_import(content, path):
+        return react_fc.ReactFCFixer.add_react_import(content, is_jsx_path(path))[0]
+
+    return [
+        ("shared-imports", legacy_shared_imports, shared.transform, None),
+        ("final-imports", legacy_final_imports(final.resolve_imports), final.transform, None),
+        ("unused-react-import", legacy_fix_react_import, unused.transform, None),
+        # Only files that use React.FC without importing React are ever rewritten
+        ("add-react-import", legacy_add_react_import, add_react_import, react_fc.needs_react_import),
+    ]
+
+
+def time_it(func, corpus):
+    # final-imports prints a warning per unknown symbol; keep the table readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        results = [func(content, path) for path, content in corpus]
+        return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the TS/TSX lexer against line regexes")
+    parser.add_argument("--root", action="append", dest="roots",
+                        help="Source root (repeatable, default: frontend/src)")
+    parser.add_argument("--show", type=int, default=0, help="Print up to N differing files per rewrite")
+    args = parser.parse_args()
+
+    paths = list(codemod.iter_source_files(args.roots or [FRONTEND_SRC], (".ts", ".tsx")))
+    corpus = [(path, codemod.read_source(path)) for path in paths]
+    size = sum(len(content) for _, content in corpus) / 1e6
+    print(f"Corpus: {len(corpus):,} files, {size:.1f}M characters")
+    print()
+
+    start = time.perf_counter()
+    tokens = sum(1 for path, content in corpus for _ in tokenize(content, is_jsx_path(path)))
+    full_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    declarations = sum(len(module_declarations(content, is_jsx_path(path))) for path, content in corpus)
+    decl_seconds = time.perf_counter() - start
+    print(f"tokenize:            {tokens:>10,} tokens  {full_seconds:6.2f}s  ({size / full_seconds:.1f}M chars/s)")
+    print(f"module_declarations: {declarations:>10,} decls   {decl_seconds:6.2f}s  ({size / decl_seconds:.1f}M chars/s)")
+    print()
+    print(f"{'rewrite':<22}{'files':>7}{'regex':>9}{'lexer':>9}{'changed (regex/lexer)':>24}{'differ':>8}")
+
+    for name, legacy, lexer, applies in load_rewrites():
+        subset = [(p, c) for p, c in corpus if applies is None or applies(c)]
+        legacy_seconds, expected = time_it(legacy, subset)
+        lexer_seconds, actual = time_it(lexer, subset)
+
+        legacy_changed = sum(1 for (_, c), out in zip(subset, expected) if out != c)
+        lexer_changed = sum(1 for (_, c), out in zip(subset, actual) if out != c)
+        differing = [(p, a, b) for (p, _), a, b in zip(subset, expected, actual) if a != b]
+        print(f"{name:<22}{len(subset):>7}{legacy_seconds:>8.2f}s{lexer_seconds:>8.2f}s"
+              f"{f'{legacy_changed}/{lexer_changed}':>24}{len(differing):>8}")
+
+        for path, before, after in differing[:args.show]:
+            diff = difflib.unified_diff(before.splitlines(), after.splitlines(),
+                                        f"regex/{os.path.relpath(path, REPO_ROOT)}",
+                                        f"lexer/{os.path.relpath(path, REPO_ROOT)}", lineterm="", n=1)
+            print("\n".join(list(diff)[:20]))
+            print()
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,40 +1,253 @@
-import re
+#!/usr/bin/env python3
+"""
+Route File Checker
+==================
+
+Validates that every route module exists, fast enough for a pre-commit hook.
+
+React Router: each routes file (default frontend/src/routes.ts) is lexed once
+and every route()/index()/layout() target is collected. Targets are relative
+to the routes file's directory (the appDirectory). They are checked in bulk
+against a set of file paths listed once with os.scandir, instead of calling
+os.path.exists per target.
+
+Next.js: the nextjs/src/app tree is listed the same way and checked for
+  * page.* / route.* files that resolve to the same URL (route groups,
+    parallel-route slots and private _folders do not add URL segments)
+  * sibling dynamic segments with different names ([id] next to [slug])
+  * pages without a default export, route handlers without an HTTP method
+    export
+
+Usage:
+  python scripts/check_routes.py
+  python scripts/check_routes.py frontend/src/routes.ts other/src/routes.ts --json
+  python scripts/check_routes.py --skip-nextjs
+
+Exits 1 when anything is wrong.
+"""
+
+import argparse
+import json
 import os
+import re
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from file_cache import FileCache
+from ts_lexer import clause_text, is_jsx_path, module_declarations, tokenize
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_ROUTES_FILES = [REPO_ROOT / "frontend" / "src" / "routes.ts"]
+DEFAULT_NEXTJS_APP = REPO_ROOT / "nextjs" / "src" / "app"
+EXCLUDE_DIRS = {"node_modules", ".git", ".next", "dist", "build", "coverage"}
+
+# Which string argument names the module: route(path, file), index(file), layout(file, children)
+ROUTE_CALLS = {"route": 1, "index": 0, "layout": 0}
+
+NEXT_ROUTE_FILE = re.compile(r'^(page|route)\.(?:tsx?|jsx?|mdx)$')
+HTTP_METHODS = {"GET", "HEAD", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"}
+_DEFAULT_EXPORT = re.compile(r'\bdefault\b')
+
+
+def list_files(root: Path) -> Set[str]:
+    """Every file under `root`, as POSIX paths relative to it, in one scandir pass"""
+    files = set()
+    stack = [(os.fspath(root), "")]
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in EXCLUDE_DIRS:
+                            stack.append((entry.path, prefix + entry.name + "/"))
+                    else:
+                        files.add(prefix + entry.name)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+    return files
+
+
+def route_targets(content: str, jsx: bool = False) -> List[str]:
+    """Module paths named by route()/index()/layout() calls, in source order"""
+    targets = []
+    tokens = list(tokenize(content, jsx))
+    for i, token in enumerate(tokens):
+        if token.kind != "name":
+            continue
+        position = ROUTE_CALLS.get(content[token.start:token.end])
+        if position is None or i + 1 >= len(tokens) or content[tokens[i + 1].start:tokens[i + 1].end] != "(":
+            continue
+        # Arguments are (string, ',')* up to the one holding the module
+        j = i + 2 + 2 * position
+        if j < len(tokens) and tokens[j].kind == "string" and all(
+            tokens[k].kind == "string" for k in range(i + 2, j, 2)
+        ):
+            targets.append(content[tokens[j].start + 1:tokens[j].end - 1])
+    return targets
+
+
+def check_routes_file(routes_file: Path, listings: Dict[Path, Set[str]]) -> dict:
+    """Missing route modules of one React Router routes file"""
+    content = routes_file.read_text(encoding="utf-8")
+    targets = route_targets(content, is_jsx_path(str(routes_file)))
+
+    app_dir = routes_file.parent
+    if app_dir not in listings:
+        listings[app_dir] = list_files(app_dir)
+    files = listings[app_dir]
+
+    normalized = {target: os.path.normpath(target).replace(os.sep, "/") for target in targets}
+    missing = sorted({target for target, path in normalized.items() if path not in files})
+    duplicates = sorted({target for target in targets if targets.count(target) > 1})
+    return {
+        "routes_file": os.path.relpath(routes_file, REPO_ROOT),
+        "routes": len(targets),
+        "missing": missing,
+        # React Router needs an explicit id to mount the same module twice
+        "duplicates": duplicates,
+    }
+
+
+def url_path(relative: str) -> str:
+    """URL a page/route file under app/ serves, e.g. (main)/cases/[id]/page.tsx -> /cases/[id]"""
+    segments = [s for s in relative.split("/")[:-1]
+                if not (s.startswith("(") and s.endswith(")")) and not s.startswith("@")]
+    return "/" + "/".join(segments)
+
+
+def analyze_exports(content: str, jsx: bool = True) -> dict:
+    """Whether a module has a default export and which names it exports"""
+    has_default = False
+    names = set()
+    for decl in module_declarations(content, jsx):
+        if decl.kind == "import":
+            continue
+        clause = clause_text(content, decl)
+        if "{" in clause:
+            # export { a, b as GET } [from '...']
+            for part in clause[clause.index("{") + 1:].rstrip("}").split(","):
+                words = part.split()
+                if words:
+                    names.add(words[-1])
+        elif _DEFAULT_EXPORT.match(clause):
+            has_default = True
+        elif decl.name:
+            names.add(decl.name)
+    return {"default": has_default or "default" in names, "names": sorted(names)}
+
+
+def check_nextjs_app(app_dir: Path, cache: Optional[FileCache] = None) -> dict:
+    """Conflicting, mis-named or incomplete page/route files under a Next.js app/ directory"""
+    files = list_files(app_dir)
+    version = cache.source_version(__file__) if cache else None
+
+    by_url: Dict[str, List[str]] = defaultdict(list)
+    dynamic: Dict[str, Set[str]] = defaultdict(set)
+    problems = []
+    checked = 0
+
+    for relative in sorted(files):
+        segments = relative.split("/")
+        if any(s.startswith("_") for s in segments[:-1]):
+            continue  # private folders are not routed
+        for depth, segment in enumerate(segments[:-1]):
+            if segment.startswith("[") and segment.endswith("]"):
+                parent = url_path("/".join(segments[:depth]) + "/x")
+                dynamic[parent].add(segment.strip("[]").lstrip("."))
+
+        match = NEXT_ROUTE_FILE.match(segments[-1])
+        if not match:
+            continue
+        checked += 1
+        kind = match.group(1)
+        by_url[url_path(relative)].append(relative)
+
+        if segments[-1].endswith(".mdx"):
+            continue
+        path = app_dir / relative
+        jsx = is_jsx_path(relative)
+        if cache is not None:
+            exports = cache.cached("route-exports", version, path, lambda c: analyze_exports(c, jsx))
+        else:
+            exports = analyze_exports(path.read_text(encoding="utf-8"), jsx)
+
+        if kind == "page" and not exports["default"]:
+            problems.append({"file": relative, "problem": "page has no default export"})
+        if kind == "route" and not HTTP_METHODS.intersection(exports["names"]):
+            problems.append({"file": relative, "problem": "route handler exports no HTTP method"})
+
+    for url, owners in sorted(by_url.items()):
+        if len(owners) > 1:
+            problems.append({"url": url, "problem": "multiple page/route files", "files": owners})
+    for parent, names in sorted(dynamic.items()):
+        if len(names) > 1:
+            problems.append({"url": parent, "problem": "different dynamic segment names",
+                             "names": sorted(names)})
+
+    return {"app_dir": os.path.relpath(app_dir, REPO_ROOT), "routes": checked, "problems": problems}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that route modules exist and are well-formed")
+    parser.add_argument("routes_files", nargs="*", type=Path,
+                        help="React Router routes files (default: frontend/src/routes.ts)")
+    parser.add_argument("--nextjs-app", type=Path, default=DEFAULT_NEXTJS_APP,
+                        help="Next.js app/ directory to validate")
+    parser.add_argument("--skip-nextjs", action="store_true", help="Only check React Router routes files")
+    parser.add_argument("--no-cache", action="store_true", help="Re-read every page/route file")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
 
-routes_file = '/workspaces/lexiflow-premium/frontend/src/routes.ts'
-base_dir = '/workspaces/lexiflow-premium/frontend/src'
+    listings: Dict[Path, Set[str]] = {}
+    report = {"routes_files": [], "nextjs": None}
+    for routes_file in args.routes_files or DEFAULT_ROUTES_FILES:
+        try:
+            report["routes_files"].append(check_routes_file(routes_file.resolve(), listings))
+        except OSError as e:
+            report["routes_files"].append({"routes_file": str(routes_file), "error": str(e)})
 
-try:
-    with open(routes_file, 'r') as f:
-        content = f.read()
+    if not args.skip_nextjs and args.nextjs_app.is_dir():
+        if args.no_cache:
+            report["nextjs"] = check_nextjs_app(args.nextjs_app.resolve())
+        else:
+            with FileCache() as cache:
+                report["nextjs"] = check_nextjs_app(args.nextjs_app.resolve(), cache)
 
-    # Extract file paths from route definitions
-    # Matches: route('path', 'file/path.tsx') or index('file/path.tsx') or layout('file/path.tsx', ...)
-    # We need to handle cases like route("path", "file.tsx") and index("file.tsx")
-    # The regex needs to be robust enough.
+    failed = any(r.get("error") or r.get("missing") or r.get("duplicates") for r in report["routes_files"])
+    failed = failed or bool(report["nextjs"] and report["nextjs"]["problems"])
+    report["ok"] = not failed
 
-    # Regex explanation:
-    # (?:route|index|layout|prefix)  - match function name
-    # \s*\(\s*                       - match opening parenthesis and whitespace
-    # (?:['"][^'"]*['"]\s*,\s*)?     - optionally match the first argument (path string) and comma
-    # ['"]([^'"]+)['"]               - match the file path (captured group 1)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 1 if failed else 0
 
-    matches = re.findall(r'(?:route|index|layout)\s*\(\s*(?:[\'"][^\'"]*[\'"]\s*,\s*)?[\'"]([^\'"]+)[\'"]', content)
+    for result in report["routes_files"]:
+        if result.get("error"):
+            print(f"❌ {result['routes_file']}: {result['error']}")
+            continue
+        print(f"📄 {result['routes_file']}: {result['routes']} route definitions")
+        for target in result["missing"]:
+            print(f"   ❌ Missing: {target}")
+        for target in result["duplicates"]:
+            print(f"   ⚠️  Used more than once without an id: {target}")
+        if not result["missing"] and not result["duplicates"]:
+            print("   ✅ All route files exist")
 
-    print(f"Found {len(matches)} route definitions.")
+    nextjs = report["nextjs"]
+    if nextjs:
+        print(f"📁 {nextjs['app_dir']}: {nextjs['routes']} page/route files")
+        for problem in nextjs["problems"]:
+            where = problem.get("file") or problem.get("url")
+            extra = problem.get("files") or problem.get("names")
+            print(f"   ❌ {where}: {problem['problem']}" + (f" ({', '.join(extra)})" if extra else ""))
+        if not nextjs["problems"]:
+            print("   ✅ No conflicts")
 
-    missing_files = []
-    for file_path in matches:
-        full_path = os.path.join(base_dir, file_path)
-        if not os.path.exists(full_path):
-            missing_files.append(file_path)
+    return 1 if failed else 0
 
-    if missing_files:
-        print('Missing files:')
-        for f in missing_files:
-            print(f)
-    else:
-        print('All route files exist.')
 
-except Exception as e:
-    print(f"Error: {e}")
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Shared Codemod Engine
+=====================
+
+Rewrite scripts register a transform instead of walking the tree themselves:
+
+    from codemod import register
+
+    @register("css-vars", extensions=(".tsx", ".ts"))
+    def transform(content: str, path: str) -> str:
+        return content.replace(...)
+
+A run walks the source roots once, reads every candidate file once, applies
+all selected transforms to it in order inside a process pool, and writes the
+file back atomically only when the content actually changed.
+
+Transforms must be pure functions of (content, path). They are looked up by
+name in worker processes, which load the registering scripts themselves, so
+they work with both fork and spawn start methods.
+
+Given a FileCache, a run records which transforms left each file unchanged
+and skips files whose content and transform versions have not moved since.
+A transform's version defaults to a hash of the script that registers it.
+
+Use scripts/run_codemods.py to run several transforms from the command line.
+"""
+
+import importlib.util
+import os
+import stat
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from file_cache import FileCache, content_digest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_ROOTS = (REPO_ROOT / "frontend" / "src", REPO_ROOT / "nextjs" / "src")
+EXCLUDE_DIRS = {"node_modules", "dist", "build", ".git", "coverage", ".next"}
+TS_EXTENSIONS = (".ts", ".tsx")
+SOURCE_EXTENSIONS = (".ts", ".tsx", ".js", ".jsx")
+CHUNK_SIZE = 64
+
+
+class Transform(NamedTuple):
+    name: str
+    func: Callable[[str, str], str]
+    extensions: Tuple[str, ...]
+    filenames: Optional[frozenset]
+    script: str
+    version: str
+
+    def applies_to(self, path: str) -> bool:
+        if self.filenames is not None:
+            return os.path.basename(path) in self.filenames
+        return path.endswith(self.extensions)
+
+
+REGISTRY: Dict[str, Transform] = {}
+
+
+def register(name: str, extensions: Sequence[str] = TS_EXTENSIONS,
+             filenames: Optional[Iterable[str]] = None, version: Optional[str] = None,
+             depends: Sequence[str] = ()):
+    """Decorator registering `func(content, path) -> content` under `name`.
+
+    `filenames`, when given, restricts the transform to files with exactly
+    those base names (e.g. "route.ts") instead of matching by extension.
+    `depends` lists helper modules whose source also goes into the default
+    version, so editing them invalidates cached verdicts too.
+    """
+    def decorator(func):
+        script = os.path.abspath(func.__code__.co_filename)
+        if version is None:
+            data = b""
+            for source in (script, *depends):
+                with open(source, "rb") as f:
+                    data += f.read()
+            script_version = content_digest(data)[:12]
+        REGISTRY[name] = Transform(
+            name=name,
+            func=func,
+            extensions=tuple(extensions),
+            filenames=frozenset(filenames) if filenames else None,
+            script=script,
+            version=version or script_version,
+        )
+        return func
+    return decorator
+
+
+def load_script(script: str):
+    """Import a transform script by path so its @register calls run"""
+    script = os.path.abspath(script)
+    for module in list(sys.modules.values()):
+        if getattr(module, "__file__", None) and os.path.abspath(module.__file__) == script:
+            return module
+    module_name = "_codemod_" + Path(script).stem.replace("-", "_")
+    spec = importlib.util.spec_from_file_location(module_name, script)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def iter_source_files(roots: Iterable[os.PathLike], extensions: Sequence[str] = TS_EXTENSIONS,
+                      exclude_dirs=EXCLUDE_DIRS) -> Iterator[str]:
+    """Yield every file under `roots` ending in one of `extensions`, walking each root once"""
+    extensions = tuple(extensions)
+    stack = [os.fspath(root) for root in reversed(list(roots))]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        subdirs = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in exclude_dirs:
+                    subdirs.append(entry.path)
+            elif entry.name.endswith(extensions):
+                yield entry.path
+        stack.extend(reversed(subdirs))
+
+
+def read_source(path: str) -> str:
+    # newline='' keeps CRLF files byte-identical unless a transform changes them
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return f.read()
+
+
+def write_atomic(path: str, content: str):
+    """Replace `path` with `content` via a temp file in the same directory"""
+    directory, name = os.path.split(path)
+    mode = stat.S_IMODE(os.stat(path).st_mode)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(content)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def apply_transforms(path: str, content: str, transforms: Sequence[Transform]) -> Tuple[str, List[str]]:
+    """Run `transforms` over one file's content; return (content, names that changed it)"""
+    changed_by = []
+    for transform in transforms:
+        if not transform.applies_to(path):
+            continue
+        new_content = transform.func(content, path)
+        if new_content != content:
+            changed_by.append(transform.name)
+            content = new_content
+    return content, changed_by
+
+
+def _init_worker(scripts: Sequence[str]):
+    for script in scripts:
+        load_script(script)
+
+
+def _process_chunk(paths: Sequence[str], names: Sequence[str], apply: bool):
+    transforms = [REGISTRY[name] for name in names]
+    results = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            with open(path, "rb") as f:
+                data = f.read()
+            # newline='' semantics: CRLF files stay byte-identical unless a transform changes them
+            original = data.decode("utf-8")
+            content, changed_by = apply_transforms(path, original, transforms)
+            if changed_by and apply:
+                write_atomic(path, content)
+            signature = (st.st_mtime_ns, st.st_size, content_digest(data))
+            results.append((path, changed_by, None, signature))
+        except Exception as e:
+            results.append((path, [], f"{type(e).__name__}: {e}", None))
+    return results
+
+
+class CodemodReport:
+    """Outcome of one run"""
+
+    def __init__(self, names: Sequence[str], apply: bool):
+        self.names = list(names)
+        self.apply = apply
+        self.scanned = 0
+        self.cached = 0
+        self.changed: Dict[str, List[str]] = {}
+        self.errors: List[Tuple[str, str]] = []
+        self.elapsed = 0.0
+
+    def add(self, path: str, changed_by: List[str], error: Optional[str]):
+        self.scanned += 1
+        if error:
+            self.errors.append((path, error))
+        elif changed_by:
+            self.changed[path] = changed_by
+
+    def counts(self) -> Dict[str, int]:
+        counts = {name: 0 for name in self.names}
+        for changed_by in self.changed.values():
+            for name in changed_by:
+                counts[name] += 1
+        return counts
+
+
+def run(names: Sequence[str], roots: Iterable[os.PathLike] = DEFAULT_ROOTS,
+        files: Optional[Iterable[str]] = None, apply: bool = True,
+        workers: Optional[int] = None, chunk_size: int = CHUNK_SIZE,
+        on_result: Optional[Callable[[str, List[str], Optional[str]], None]] = None,
+        cache: Optional[FileCache] = None) -> CodemodReport:
+    """Apply the registered transforms `names`, in that order, to every matching file.
+
+    Files come from walking `roots` unless an explicit `files` list is given.
+    With apply=False nothing is written; the report still lists what would
+    change. workers=1 runs in-process, which is cheaper for short file lists.
+    With a `cache`, files every selected transform already left unchanged are
+    skipped without being read.
+    """
+    missing = [name for name in names if name not in REGISTRY]
+    if missing:
+        raise KeyError(f"Unknown transform(s): {', '.join(missing)}")
+    transforms = [REGISTRY[name] for name in names]
+
+    started = time.perf_counter()
+    if files is None:
+        extensions = tuple({ext for t in transforms for ext in t.extensions})
+        files = iter_source_files(roots, extensions)
+
+    report = CodemodReport(names, apply)
+    paths = []
+    for path in files:
+        path = os.fspath(path)
+        applicable = [t for t in transforms if t.applies_to(path)]
+        if not applicable:
+            continue
+        if cache is not None and all(
+            cache.lookup(f"codemod:{t.name}", t.version, path)[0] for t in applicable
+        ):
+            report.cached += 1
+            report.add(path, [], None)
+            if on_result:
+                on_result(path, [], None)
+            continue
+        paths.append(path)
+
+    def collect(results):
+        for path, changed_by, error, signature in results:
+            report.add(path, changed_by, error)
+            if on_result:
+                on_result(path, changed_by, error)
+            if cache is not None and signature and not error and not changed_by:
+                cache.remember(path, *signature)
+                for t in transforms:
+                    if t.applies_to(path):
+                        cache.put(f"codemod:{t.name}", t.version, path, signature[2], True)
+
+    chunks = [paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size)]
+
+    if workers == 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            collect(_process_chunk(chunk, names, apply))
+    else:
+        scripts = sorted({t.script for t in transforms})
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(scripts,)) as executor:
+            for results in executor.map(_process_chunk, chunks, repeat(names), repeat(apply)):
+                collect(results)
+
+    report.elapsed = time.perf_counter() - started
+    return report
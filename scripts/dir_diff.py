@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Hashed Directory Diff
+=====================
+
+Compares two trees by content rather than by stat signature (filecmp's
+shallow mode) or by name alone. Each tree is listed once with os.scandir.
+Files present on both sides with different sizes differ without being read.
+Everything else that needs a hash is hashed in a thread pool with BLAKE2 over
+a memory-mapped read; hashlib releases the GIL on large buffers, so the
+threads really overlap.
+
+Besides left-only, right-only and differing files, a left-only file whose
+content appears right-only under another path is reported as moved.
+
+Hashes are recorded in the FileCache (scripts/file_cache.py) under the
+file's stat signature. A re-run only reads files that changed since.
+
+Usage:
+    diff = diff_trees("frontend/src/widgets/enterprise", "frontend/src/components/enterprise")
+    diff.left_only, diff.right_only, diff.differing, diff.moved
+
+    python scripts/dir_diff.py LEFT RIGHT [--json] [--no-cache]
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from file_cache import FileCache
+
+EXCLUDE_DIRS = {"node_modules", ".git", "__pycache__"}
+DIGEST_SIZE = 16  # same digest as file_cache.content_digest, so cached hashes are shared
+
+
+@dataclass
+class DirDiff:
+    left: str
+    right: str
+    left_only: List[str] = field(default_factory=list)
+    right_only: List[str] = field(default_factory=list)
+    differing: List[str] = field(default_factory=list)
+    identical: int = 0
+    moved: List[Tuple[str, str]] = field(default_factory=list)  # (left path, right path)
+    hashed: int = 0
+    cached: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def same(self) -> bool:
+        return not (self.left_only or self.right_only or self.differing or self.moved)
+
+
+def hash_file(path: str) -> str:
+    """BLAKE2b of the file's content, read through mmap"""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            # mmap cannot map an empty file
+            return hashlib.blake2b(b"", digest_size=DIGEST_SIZE).hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return hashlib.blake2b(mapped, digest_size=DIGEST_SIZE).hexdigest()
+
+
+def scan_tree(root: str, exclude_dirs=EXCLUDE_DIRS) -> Dict[str, os.stat_result]:
+    """{relative POSIX path: stat} for every file under `root`"""
+    files = {}
+    stack = [(root, "")]
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in exclude_dirs:
+                            stack.append((entry.path, prefix + entry.name + "/"))
+                    elif entry.is_file(follow_symlinks=False):
+                        files[prefix + entry.name] = entry.stat(follow_symlinks=False)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+    return files
+
+
+def hash_files(paths: Iterable[Tuple[str, os.stat_result]], cache: Optional[FileCache] = None,
+               workers: Optional[int] = None) -> Tuple[Dict[str, str], int]:
+    """{path: digest} for `paths`; returns the digests and how many came from the cache"""
+    digests = {}
+    pending = []
+    for path, st in paths:
+        digest = cache.known_digest(path, st) if cache is not None else None
+        if digest is not None:
+            digests[path] = digest
+        else:
+            pending.append((path, st))
+    cached = len(digests)
+
+    if pending:
+        # SQLite connections stay on this thread; workers only hash
+        with ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) + 4)) as executor:
+            for (path, st), digest in zip(pending, executor.map(hash_file, (p for p, _ in pending))):
+                digests[path] = digest
+                if cache is not None:
+                    cache.remember(path, st.st_mtime_ns, st.st_size, digest)
+    return digests, cached
+
+
+def diff_trees(left: str, right: str, cache: Optional[FileCache] = None,
+               workers: Optional[int] = None) -> DirDiff:
+    """Content diff of two directory trees, with move detection"""
+    started = time.perf_counter()
+    left_files = scan_tree(left)
+    right_files = scan_tree(right)
+    diff = DirDiff(left=left, right=right)
+
+    common = left_files.keys() & right_files.keys()
+    left_only = sorted(left_files.keys() - common)
+    right_only = sorted(right_files.keys() - common)
+
+    # Only files that could be equal to something on the other side need hashing
+    to_hash: List[Tuple[str, os.stat_result]] = []
+    compare = []
+    for name in sorted(common):
+        if left_files[name].st_size != right_files[name].st_size:
+            diff.differing.append(name)
+        else:
+            compare.append(name)
+            to_hash.append((os.path.join(left, name), left_files[name]))
+            to_hash.append((os.path.join(right, name), right_files[name]))
+    right_sizes = {right_files[name].st_size for name in right_only}
+    move_candidates = [name for name in left_only if left_files[name].st_size in right_sizes]
+    left_sizes = {left_files[name].st_size for name in move_candidates}
+    move_targets = [name for name in right_only if right_files[name].st_size in left_sizes]
+    to_hash.extend((os.path.join(left, name), left_files[name]) for name in move_candidates)
+    to_hash.extend((os.path.join(right, name), right_files[name]) for name in move_targets)
+
+    digests, diff.cached = hash_files(to_hash, cache, workers)
+    diff.hashed = len(to_hash) - diff.cached
+
+    for name in compare:
+        if digests[os.path.join(left, name)] == digests[os.path.join(right, name)]:
+            diff.identical += 1
+        else:
+            diff.differing.append(name)
+    diff.differing.sort()
+
+    by_digest: Dict[str, List[str]] = defaultdict(list)
+    for name in move_targets:
+        by_digest[digests[os.path.join(right, name)]].append(name)
+    moved_left, moved_right = set(), set()
+    for name in move_candidates:
+        targets = by_digest.get(digests[os.path.join(left, name)])
+        if targets:
+            target = targets.pop(0)
+            diff.moved.append((name, target))
+            moved_left.add(name)
+            moved_right.add(target)
+    diff.left_only = [name for name in left_only if name not in moved_left]
+    diff.right_only = [name for name in right_only if name not in moved_right]
+
+    diff.elapsed = time.perf_counter() - started
+    return diff
+
+
+def print_diff(diff: DirDiff, show_right_only: bool = True):
+    print(f"📂 {diff.left}  ⇄  {diff.right}")
+    sections = [("Only in left", diff.left_only), ("Differing", diff.differing)]
+    if show_right_only:
+        sections.insert(1, ("Only in right", diff.right_only))
+    for title, names in sections:
+        if names:
+            print(f"\n{title} ({len(names)}):")
+            for name in names:
+                print(f"  {name}")
+    if diff.moved:
+        print(f"\nMoved ({len(diff.moved)}):")
+        for source, target in diff.moved:
+            print(f"  {source} → {target}")
+    print(f"\n✓ {diff.identical} identical, {diff.hashed} hashed, {diff.cached} from cache "
+          f"in {diff.elapsed * 1000:.0f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Content diff of two directory trees")
+    parser.add_argument("left")
+    parser.add_argument("right")
+    parser.add_argument("--json", action="store_true", help="Print the diff as JSON")
+    parser.add_argument("--no-cache", action="store_true", help="Hash every file again")
+    parser.add_argument("--workers", type=int, help="Hashing threads")
+    args = parser.parse_args()
+
+    for directory in (args.left, args.right):
+        if not os.path.isdir(directory):
+            print(f"❌ Not a directory: {directory}")
+            return 2
+
+    if args.no_cache:
+        diff = diff_trees(args.left, args.right, workers=args.workers)
+    else:
+        with FileCache() as cache:
+            diff = diff_trees(args.left, args.right, cache, args.workers)
+
+    if args.json:
+        print(json.dumps(asdict(diff), indent=2))
+    else:
+        print_diff(diff)
+    return 0 if diff.same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
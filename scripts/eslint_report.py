@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Streaming ESLint Report Reader
+==============================
+
+Reads ESLint reports without loading them whole, so fix-up scripts can work
+through 50k-message runs in constant memory:
+
+  * JSON formatter output (`eslint -f json -o report.json`): the top-level
+    array is decoded one element - one linted file - at a time with
+    json.JSONDecoder.raw_decode over a buffered read
+  * stylish (default) text output, read line by line
+
+Both yield ESLint's JSON result shape:
+
+    {"filePath": "/abs/path.tsx", "messages": [
+        {"ruleId": "...", "severity": 2, "message": "...", "line": 9, "column": 11}, ...]}
+
+ESLint reports every message of a file together, so a consumer can finish a
+file before the next one is read:
+
+    for result in iter_results("eslint.json"):
+        fix_file(result["filePath"], result["messages"])
+"""
+
+import json
+import re
+from typing import IO, Iterator, Optional
+
+CHUNK_SIZE = 1 << 16
+SEVERITY = {"warning": 1, "error": 2}
+
+_WHITESPACE = re.compile(r'\s*')
+# Characters that can continue a JSON number ("1." + "25", "1e" + "-3")
+_NUMBER_TAIL = re.compile(r'[0-9.eE+-]*')
+_STYLISH_MESSAGE = re.compile(r'^\s+(\d+):(\d+)\s+(error|warning)\s+(.*?)(?:\s{2,}(\S+))?\s*$')
+
+
+def iter_json_array(fp: IO[str], chunk_size: int = CHUNK_SIZE) -> Iterator[object]:
+    """Yield the elements of the JSON array in `fp`, holding at most one element in memory"""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def fill(size=chunk_size):
+        nonlocal buffer, pos, eof
+        chunk = fp.read(size)
+        if not chunk:
+            eof = True
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+    def skip_whitespace():
+        nonlocal pos
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos < len(buffer) or eof:
+                return
+            fill()
+
+    skip_whitespace()
+    if buffer[pos:pos + 1] != "[":
+        raise ValueError("Expected a JSON array")
+    pos += 1
+    first = True
+    while True:
+        skip_whitespace()
+        if pos >= len(buffer):
+            raise ValueError("Unterminated JSON array")
+        if buffer[pos] == "]":
+            return
+        if not first:
+            if buffer[pos] != ",":
+                raise ValueError(f"Expected ',' in JSON array, found {buffer[pos]!r}")
+            pos += 1
+            skip_whitespace()
+        first = False
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # The element runs past the buffer; read more (doubling, so a
+                # large element is not re-parsed once per chunk) and retry
+                fill(max(chunk_size, len(buffer) - pos))
+                continue
+            if not eof and buffer[pos] not in "{[\"" and _NUMBER_TAIL.fullmatch(buffer, end):
+                # A bare number cut by the chunk boundary decodes as its
+                # prefix ("1" of "1."); read on until something ends it
+                fill()
+                continue
+            break
+        pos = end
+        yield value
+
+
+def iter_stylish(fp: IO[str]) -> Iterator[dict]:
+    """Parse stylish text output file by file"""
+    result: Optional[dict] = None
+    for line in fp:
+        line = line.rstrip("\n")
+        if line.startswith("/"):
+            if result is not None:
+                yield result
+            result = {"filePath": line.strip(), "messages": []}
+            continue
+        match = _STYLISH_MESSAGE.match(line)
+        if result is not None and match:
+            line_num, column, severity, message, rule_id = match.groups()
+            result["messages"].append({
+                "ruleId": rule_id,
+                "severity": SEVERITY[severity],
+                "message": message,
+                "line": int(line_num),
+                "column": int(column),
+            })
+    if result is not None:
+        yield result
+
+
+def iter_results(path: str) -> Iterator[dict]:
+    """ESLint results from a JSON or stylish report, one linted file at a time"""
+    with open(path, "r", encoding="utf-8") as fp:
+        head = fp.read(1)
+        while head.isspace():
+            head = fp.read(1)
+        fp.seek(0)
+        if head == "[":
+            yield from iter_json_array(fp)
+        else:
+            yield from iter_stylish(fp)
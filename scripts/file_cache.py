@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Persistent Per-File Result Cache
+================================
+
+Analyzers and codemods re-read and re-regex every file on each run even when
+almost nothing changed. FileCache keeps, in a SQLite database under .temp/:
+
+  * files:   path -> (mtime_ns, size, content hash), so an unchanged file is
+             recognised from os.stat alone without reading it
+  * results: (namespace, version, path, content hash) -> JSON result, e.g. an
+             analyzer's findings for the file or a transform's "no-op" verdict
+
+A result is reused only when the path, its stat signature or content hash,
+and the analyzer/transform version all match. The version defaults to a hash
+of the source file that defines the analyzer, so editing its rules or tables
+invalidates its cached results automatically.
+
+Usage:
+    with FileCache() as cache:
+        version = cache.source_version(__file__)
+        issues = cache.cached("migration-targets", version, path, analyze_content)
+
+    python scripts/file_cache.py --stats
+    python scripts/file_cache.py --clear
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_CACHE_PATH = REPO_ROOT / ".temp" / "file_cache.sqlite"
+
+# Files modified this recently may still change within the same mtime tick;
+# their stat signature is not trusted (the content hash still is)
+RACY_WINDOW_NS = 2_000_000_000
+COMMIT_EVERY = 500
+
+_MISSING = object()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    digest TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    namespace TEXT NOT NULL,
+    version TEXT NOT NULL,
+    path TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (namespace, version, path, digest)
+);
+CREATE INDEX IF NOT EXISTS results_path ON results (path);
+"""
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _key(path: os.PathLike) -> str:
+    # Absolute, so scripts run from different working directories share entries
+    return os.path.abspath(os.fspath(path))
+
+
+class FileCache:
+    """SQLite-backed cache of per-file results keyed by content"""
+
+    def __init__(self, path: os.PathLike = DEFAULT_CACHE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(self.path))
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        self.pending = 0
+        self.hits = 0
+        self.misses = 0
+        self._versions: Dict[str, str] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+    def _dirty(self):
+        self.pending += 1
+        if self.pending >= COMMIT_EVERY:
+            self.db.commit()
+            self.pending = 0
+
+    def source_version(self, source_file: os.PathLike, extra: str = "") -> str:
+        """Version string derived from the contents of the file defining an analyzer"""
+        source_file = os.path.abspath(source_file)
+        version = self._versions.get(source_file)
+        if version is None:
+            with open(source_file, "rb") as f:
+                version = content_digest(f.read())[:12]
+            self._versions[source_file] = version
+        return f"{version}{':' + extra if extra else ''}"
+
+    # -- stat signatures -------------------------------------------------
+
+    def known_digest(self, path: str, st: Optional[os.stat_result] = None) -> Optional[str]:
+        """Content hash recorded for `path`, if its stat signature is unchanged"""
+        path = _key(path)
+        st = st or os.stat(path)
+        row = self.db.execute(
+            "SELECT mtime_ns, size, digest FROM files WHERE path = ?", (path,)
+        ).fetchone()
+        if row and row[0] == st.st_mtime_ns and row[1] == st.st_size:
+            return row[2]
+        return None
+
+    def remember(self, path: str, mtime_ns: int, size: int, digest: str):
+        """Record the content hash `path` had at the given stat signature"""
+        path = _key(path)
+        previous = self.db.execute("SELECT digest FROM files WHERE path = ?", (path,)).fetchone()
+        if previous and previous[0] != digest:
+            self.db.execute("DELETE FROM results WHERE path = ? AND digest = ?", (path, previous[0]))
+        if time.time_ns() - mtime_ns < RACY_WINDOW_NS:
+            # Too fresh to trust the stat signature; keep results, drop the shortcut
+            self.db.execute("DELETE FROM files WHERE path = ?", (path,))
+        else:
+            self.db.execute(
+                "INSERT OR REPLACE INTO files (path, mtime_ns, size, digest) VALUES (?, ?, ?, ?)",
+                (path, mtime_ns, size, digest),
+            )
+        self._dirty()
+
+    # -- results ---------------------------------------------------------
+
+    def get(self, namespace: str, version: str, path: str, digest: str, default: Any = None) -> Any:
+        path = _key(path)
+        row = self.db.execute(
+            "SELECT value FROM results WHERE namespace = ? AND version = ? AND path = ? AND digest = ?",
+            (namespace, version, path, digest),
+        ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def put(self, namespace: str, version: str, path: str, digest: str, value: Any):
+        path = _key(path)
+        self.db.execute(
+            "INSERT OR REPLACE INTO results (namespace, version, path, digest, value) VALUES (?, ?, ?, ?, ?)",
+            (namespace, version, path, digest, json.dumps(value)),
+        )
+        self._dirty()
+
+    def lookup(self, namespace: str, version: str, path: str) -> Tuple[bool, Any]:
+        """(True, result) when a result is cached for the file as it is now, without reading it"""
+        try:
+            digest = self.known_digest(path)
+        except OSError:
+            return False, None
+        if digest is None:
+            return False, None
+        value = self.get(namespace, version, path, digest, _MISSING)
+        if value is _MISSING:
+            return False, None
+        return True, value
+
+    def cached(self, namespace: str, version: str, path: os.PathLike,
+               compute: Callable[[str], Any], encoding: str = "utf-8") -> Any:
+        """Result of compute(file content) for `path`, computed only when the file changed"""
+        path = _key(path)
+        st = os.stat(path)
+        digest = self.known_digest(path, st)
+        if digest is not None:
+            value = self.get(namespace, version, path, digest, _MISSING)
+            if value is not _MISSING:
+                self.hits += 1
+                return value
+
+        with open(path, "rb") as f:
+            data = f.read()
+        digest = content_digest(data)
+        self.remember(path, st.st_mtime_ns, st.st_size, digest)
+
+        value = self.get(namespace, version, path, digest, _MISSING)
+        if value is not _MISSING:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        value = compute(data.decode(encoding))
+        self.put(namespace, version, path, digest, value)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        files = self.db.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+        by_namespace = self.db.execute(
+            "SELECT namespace, COUNT(*) FROM results GROUP BY namespace ORDER BY namespace"
+        ).fetchall()
+        return {"files": files, "results": dict(by_namespace)}
+
+    def clear(self, namespace: Optional[str] = None):
+        if namespace:
+            self.db.execute("DELETE FROM results WHERE namespace = ?", (namespace,))
+        else:
+            self.db.execute("DELETE FROM results")
+            self.db.execute("DELETE FROM files")
+        self.db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or clear the per-file result cache")
+    parser.add_argument("--cache", default=str(DEFAULT_CACHE_PATH), help="Cache database path")
+    parser.add_argument("--stats", action="store_true", help="Show cached file and result counts")
+    parser.add_argument("--clear", nargs="?", const="", metavar="NAMESPACE",
+                        help="Drop all cached results, or only those of NAMESPACE")
+    args = parser.parse_args()
+
+    with FileCache(args.cache) as cache:
+        if args.clear is not None:
+            cache.clear(args.clear or None)
+            print(f"✓ Cleared {args.clear or 'all cached results'}")
+        stats = cache.stats()
+        print(f"Cache: {cache.path}")
+        print(f"  Files tracked: {stats['files']}")
+        for namespace, count in stats["results"].items():
+            print(f"  {namespace}: {count} results")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Source File Inventory
+=====================
+
+One shared, persistent listing of the source trees, so scripts stop walking
+frontend/src and nextjs/src with os.walk on every run.
+
+The inventory is a compact binary index in .temp/file_inventory.idx:
+
+    header   magic, format version, record count, offset of the path blob
+    records  fixed 40-byte entries sorted by path:
+             path offset/length, extension offset, size, mtime_ns, BLAKE2b-128
+    paths    UTF-8 repository-relative paths, concatenated
+
+It is read through mmap. Because the records are sorted by path, directory
+and glob-prefix queries are binary searches; extension queries scan the
+fixed-width records without decoding anything else.
+
+refresh() brings the index up to date with an mtime diff: the roots are
+listed with os.scandir, and only files whose size or mtime changed are
+read and hashed again. The new index is written to a temp file and swapped
+in atomically, so concurrent readers never see a partial index.
+
+Usage:
+    inventory = FileInventory()
+    inventory.refresh()
+    for entry in inventory.files(extensions=(".ts", ".tsx"), directory="frontend/src/api"):
+        entry.path, entry.size, entry.mtime_ns, entry.digest
+
+    python scripts/file_inventory.py refresh
+    python scripts/file_inventory.py query --ext .tsx --dir nextjs/src/app
+    python scripts/file_inventory.py query --glob 'frontend/src/**/*.test.ts'
+"""
+
+import argparse
+import fnmatch
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from file_cache import content_digest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_INDEX_PATH = REPO_ROOT / ".temp" / "file_inventory.idx"
+DEFAULT_ROOTS = ("frontend/src", "nextjs/src")
+EXCLUDE_DIRS = {"node_modules", "dist", "build", ".git", "coverage", ".next", "__pycache__"}
+
+MAGIC = b"LXFINV"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<6sHIQ")           # magic, version, count, paths offset
+RECORD = struct.Struct("<IHHqq16s")        # path offset, path length, ext offset, size, mtime_ns, digest
+
+
+class Entry(NamedTuple):
+    path: str        # repository-relative, POSIX separators
+    extension: str   # ".tsx", or "" when the name has none
+    size: int
+    mtime_ns: int
+    digest: str      # same BLAKE2b-128 hex digest as file_cache.content_digest
+
+    @property
+    def abspath(self) -> str:
+        return str(REPO_ROOT / self.path)
+
+
+def _extension_offset(path: str) -> int:
+    name_start = path.rfind("/") + 1
+    dot = path.rfind(".")
+    return dot if dot > name_start else len(path)
+
+
+def _literal_prefix(pattern: str) -> str:
+    """The part of a glob pattern before its first wildcard"""
+    match = re.search(r'[*?\[]', pattern)
+    return pattern[:match.start()] if match else pattern
+
+
+class FileInventory:
+    """Memory-mapped, sorted index of the files under `roots`"""
+
+    def __init__(self, path: os.PathLike = DEFAULT_INDEX_PATH, roots: Sequence[str] = DEFAULT_ROOTS):
+        self.path = Path(path)
+        self.roots = tuple(roots)
+        self._file = None
+        self._map = None
+        self._count = 0
+        self._paths_offset = 0
+        self._open()
+
+    def __len__(self):
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+        self._map = self._file = None
+        self._count = 0
+
+    def _open(self):
+        self.close()
+        try:
+            self._file = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+        if os.fstat(self._file.fileno()).st_size < HEADER.size:
+            self._file.close()
+            self._file = None
+            return
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, paths_offset = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            # Unknown layout: behave as empty until the next refresh rewrites it
+            self.close()
+            return
+        self._count = count
+        self._paths_offset = paths_offset
+
+    # -- reading ---------------------------------------------------------
+
+    def _record(self, index: int) -> Tuple[int, int, int, int, int, bytes]:
+        return RECORD.unpack_from(self._map, HEADER.size + index * RECORD.size)
+
+    def _path_bytes(self, index: int) -> bytes:
+        offset, length = struct.unpack_from("<IH", self._map, HEADER.size + index * RECORD.size)
+        start = self._paths_offset + offset
+        return self._map[start:start + length]
+
+    def _entry(self, index: int) -> Entry:
+        offset, length, ext_offset, size, mtime_ns, digest = self._record(index)
+        start = self._paths_offset + offset
+        path = self._map[start:start + length].decode("utf-8")
+        return Entry(path, path[ext_offset:], size, mtime_ns, digest.hex())
+
+    def _bisect(self, prefix: bytes) -> int:
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._path_bytes(mid) < prefix:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _range(self, prefix: str) -> range:
+        """Indexes of the records whose path starts with `prefix`"""
+        if not prefix:
+            return range(self._count)
+        encoded = prefix.encode("utf-8")
+        start = self._bisect(encoded)
+        # Every path with the prefix sorts below prefix + 0xFF...
+        end = self._bisect(encoded + b"\xff")
+        return range(start, end)
+
+    def get(self, path: os.PathLike) -> Optional[Entry]:
+        key = self._relative(path)
+        index = self._bisect(key.encode("utf-8"))
+        if index < self._count and self._path_bytes(index) == key.encode("utf-8"):
+            return self._entry(index)
+        return None
+
+    def files(self, extensions: Optional[Iterable[str]] = None, directory: Optional[os.PathLike] = None,
+              pattern: Optional[str] = None) -> Iterator[Entry]:
+        """Entries matching every given filter, in path order.
+
+        `directory` is a repository-relative (or absolute) directory; its whole
+        subtree matches. `pattern` is an fnmatch glob over the relative path,
+        where `*` also crosses `/`.
+        """
+        prefix = ""
+        if directory is not None:
+            prefix = self._relative(directory).rstrip("/") + "/"
+        if pattern is not None:
+            literal = _literal_prefix(pattern)
+            if literal.startswith(prefix):
+                prefix = literal
+            elif not prefix.startswith(literal):
+                return
+        suffixes = tuple(ext.encode("utf-8") for ext in extensions) if extensions else None
+        regex = re.compile(fnmatch.translate(pattern)) if pattern else None
+
+        for index in self._range(prefix):
+            if suffixes is not None:
+                path = self._path_bytes(index)
+                ext_offset = struct.unpack_from("<H", self._map, HEADER.size + index * RECORD.size + 6)[0]
+                if path[ext_offset:] not in suffixes:
+                    continue
+            entry = self._entry(index)
+            if regex is not None and not regex.match(entry.path):
+                continue
+            yield entry
+
+    def paths(self, extensions: Optional[Iterable[str]] = None, directory: Optional[os.PathLike] = None,
+              pattern: Optional[str] = None, absolute: bool = True) -> List[str]:
+        """Like files(), as a list of paths (absolute by default, for open())"""
+        return [entry.abspath if absolute else entry.path
+                for entry in self.files(extensions, directory, pattern)]
+
+    def _relative(self, path: os.PathLike) -> str:
+        path = os.fspath(path)
+        if os.path.isabs(path):
+            path = os.path.relpath(path, REPO_ROOT)
+        path = Path(os.path.normpath(path)).as_posix()
+        return "" if path == "." else path
+
+    # -- refreshing ------------------------------------------------------
+
+    def _scan(self) -> Dict[str, os.stat_result]:
+        found = {}
+        for root in self.roots:
+            stack = [(str(REPO_ROOT / root), root.rstrip("/") + "/")]
+            while stack:
+                directory, prefix = stack.pop()
+                try:
+                    with os.scandir(directory) as it:
+                        for entry in it:
+                            if entry.is_dir(follow_symlinks=False):
+                                if entry.name not in EXCLUDE_DIRS:
+                                    stack.append((entry.path, prefix + entry.name + "/"))
+                            elif entry.is_file(follow_symlinks=False):
+                                found[prefix + entry.name] = entry.stat(follow_symlinks=False)
+                except (FileNotFoundError, NotADirectoryError):
+                    continue
+        return found
+
+    def refresh(self) -> Dict[str, int]:
+        """Update the index from the file system; returns counts of what changed"""
+        started = time.perf_counter()
+        scanned = self._scan()
+        previous = {entry.path: entry for entry in self.files()}
+
+        entries = []
+        counts = {"added": 0, "modified": 0, "removed": 0}
+        for path in sorted(scanned, key=lambda p: p.encode("utf-8")):
+            st = scanned[path]
+            old = previous.get(path)
+            if old is not None and old.size == st.st_size and old.mtime_ns == st.st_mtime_ns:
+                entries.append(old)
+                continue
+            try:
+                with open(REPO_ROOT / path, "rb") as f:
+                    digest = content_digest(f.read())
+            except OSError:
+                continue
+            counts["modified" if old is not None else "added"] += 1
+            entries.append(Entry(path, path[_extension_offset(path):], st.st_size, st.st_mtime_ns, digest))
+        counts["removed"] = len(previous.keys() - scanned.keys())
+
+        if any(counts.values()) or self._map is None:
+            self._write(entries)
+            self._open()
+        counts["files"] = len(entries)
+        counts["ms"] = round((time.perf_counter() - started) * 1000)
+        return counts
+
+    def _write(self, entries: Sequence[Entry]):
+        blob = bytearray()
+        records = bytearray()
+        for entry in entries:
+            encoded = entry.path.encode("utf-8")
+            records += RECORD.pack(len(blob), len(encoded), _extension_offset(entry.path),
+                                   entry.size, entry.mtime_ns, bytes.fromhex(entry.digest))
+            blob += encoded
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, len(entries), HEADER.size + len(records))
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(header)
+                f.write(records)
+                f.write(blob)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+
+_shared: Optional[FileInventory] = None
+
+
+def inventory() -> FileInventory:
+    """The default inventory, refreshed once per process"""
+    global _shared
+    if _shared is None:
+        _shared = FileInventory()
+        _shared.refresh()
+    return _shared
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query or refresh the source file inventory")
+    parser.add_argument("--index", default=str(DEFAULT_INDEX_PATH), help="Index file path")
+    sub = parser.add_subparsers(dest="command")
+    sub.add_parser("refresh", help="Update the index and print what changed")
+    query = sub.add_parser("query", help="List files matching the filters")
+    query.add_argument("--ext", action="append", help="Extension such as .tsx (repeatable)")
+    query.add_argument("--dir", help="Directory, relative to the repository root")
+    query.add_argument("--glob", help="fnmatch pattern over the relative path")
+    query.add_argument("--long", action="store_true", help="Show size, mtime and hash")
+    query.add_argument("--no-refresh", action="store_true", help="Query the index as stored")
+    args = parser.parse_args()
+
+    with FileInventory(args.index) as inv:
+        if args.command != "query" or not args.no_refresh:
+            counts = inv.refresh()
+            if args.command != "query":
+                print(f"✓ Inventory: {counts['files']} files "
+                      f"(+{counts['added']} ~{counts['modified']} -{counts['removed']}) in {counts['ms']}ms")
+                return 0
+
+        started = time.perf_counter()
+        entries = list(inv.files(args.ext, args.dir, args.glob))
+        elapsed = (time.perf_counter() - started) * 1000
+        for entry in entries:
+            if args.long:
+                print(f"{entry.size:>9} {entry.mtime_ns} {entry.digest[:12]} {entry.path}")
+            else:
+                print(entry.path)
+        print(f"\n{len(entries)} file(s) in {elapsed:.1f}ms", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -13,17 +13,48 @@ Usage:
   python scripts/fix-react-fc-imports.py --mode full --apply
 """
 
-import os
 import re
 import argparse
 from pathlib import Path
 from typing import List, Tuple, Optional
 
+import ts_lexer
+from codemod import iter_source_files, register
+from file_cache import FileCache
+from ts_lexer import apply_edits, clause_text, imports, is_jsx_path, tokenize
+
 # Configuration
 FRONTEND_SRC = Path(__file__).parent.parent / "frontend" / "src"
 EXCLUDE_DIRS = {"node_modules", "dist", "build", ".git", "coverage"}
 INCLUDE_EXTENSIONS = {".tsx", ".ts"}
 
+REACT_IMPORT_RE = re.compile(r'^import\s+(?:React|\*\s+as\s+React)', re.MULTILINE)
+
+
+def needs_react_import(content: str) -> bool:
+    """True when the file uses React.FC without importing React."""
+    return 'React.FC' in content and not REACT_IMPORT_RE.search(content)
+
+
+def _first_statement(content: str, jsx: bool = True) -> int:
+    """Offset of the first statement after leading comments and directives ('use client')"""
+    tokens = tokenize(content, jsx, nested=False)
+    for token in tokens:
+        if token.kind != 'string':
+            return token.start
+        following = next(tokens, None)
+        if following is None:
+            break
+        if content[following.start:following.end] != ';':
+            return following.start
+    return len(content)
+
+
+def _line_start(content: str, offset: int) -> int:
+    """Start of the line containing `offset`, unless code precedes it on that line"""
+    line_start = content.rfind('\n', 0, offset) + 1
+    return line_start if not content[line_start:offset].strip() else offset
+
 
 class ReactFCFixer:
     def __init__(self, dry_run: bool = True, mode: str = "quick"):
@@ -37,81 +68,45 @@ class ReactFCFixer:
         """Find all files using React.FC without importing React."""
         affected_files = []
 
-        for root, dirs, files in os.walk(FRONTEND_SRC):
-            # Skip excluded directories
-            dirs[:] = [d for d in dirs if d not in EXCLUDE_DIRS]
-
-            for file in files:
-                if not any(file.endswith(ext) for ext in INCLUDE_EXTENSIONS):
-                    continue
-
-                file_path = Path(root) / file
-
+        # Verdicts are cached per file content, so unchanged files are not re-read
+        with FileCache() as cache:
+            # needs_react_import is a plain substring/regex check defined in this
+            # file, so this file's source is the whole version
+            version = cache.source_version(__file__)
+            for path in iter_source_files([FRONTEND_SRC], tuple(INCLUDE_EXTENSIONS), EXCLUDE_DIRS):
+                file_path = Path(path)
                 try:
-                    content = file_path.read_text(encoding='utf-8')
-
-                    # Check if file uses React.FC
-                    if not re.search(r'React\.FC', content):
-                        continue
-
-                    # Check if React is already imported
-                    has_react_import = bool(re.search(r'^import\s+React', content, re.MULTILINE))
-                    has_star_import = bool(re.search(r'^import\s+\*\s+as\s+React', content, re.MULTILINE))
-
-                    if not has_react_import and not has_star_import:
+                    if cache.cached('react-fc-affected', version, path, needs_react_import):
                         affected_files.append(file_path)
-
                 except Exception as e:
                     print(f"⚠️  Error reading {file_path}: {e}")
 
         return affected_files
 
-    def add_react_import(self, content: str) -> Tuple[str, bool]:
+    @staticmethod
+    def add_react_import(content: str, jsx: bool = True) -> Tuple[str, bool]:
         """Add React import to existing imports section."""
-        lines = content.split('\n')
-
-        # Find first import statement
-        first_import_idx = None
-        for idx, line in enumerate(lines):
-            if line.strip().startswith('import '):
-                first_import_idx = idx
-                break
-
-        if first_import_idx is None:
-            # No imports found, add at top after comments
-            insert_idx = 0
-            for idx, line in enumerate(lines):
-                if not line.strip().startswith('//') and not line.strip().startswith('/*') and not line.strip().startswith('*'):
-                    if line.strip() != '':
-                        insert_idx = idx
-                        break
-            lines.insert(insert_idx, "import React from 'react';")
-            return '\n'.join(lines), True
-
-        # Check if we can modify existing react import
-        react_import_idx = None
-        for idx in range(first_import_idx, min(first_import_idx + 20, len(lines))):
-            if re.match(r"^import\s+\{[^}]*\}\s+from\s+['\"]react['\"];?", lines[idx]):
-                react_import_idx = idx
-                break
-
-        if react_import_idx is not None:
-            # Modify existing import to add React namespace
-            old_import = lines[react_import_idx]
-            # Extract the named imports
-            match = re.match(r"^import\s+\{([^}]*)\}\s+from\s+['\"]react['\"];?", old_import)
-            if match:
-                named_imports = match.group(1).strip()
-                lines[react_import_idx] = f"import React, {{ {named_imports} }} from 'react';"
-                return '\n'.join(lines), True
-        else:
-            # Insert new React import before first import
-            lines.insert(first_import_idx, "import React from 'react';")
-            return '\n'.join(lines), True
-
-        return content, False
-
-    def convert_component_declaration(self, content: str) -> Tuple[str, bool]:
+        declarations = imports(content, jsx)
+
+        if not declarations:
+            # No imports found, add at top after comments and directives
+            insert_at = _line_start(content, _first_statement(content, jsx))
+            return content[:insert_at] + "import React from 'react';\n" + content[insert_at:], True
+
+        # Modify an existing named react import to add the React namespace
+        for decl in declarations:
+            clause = clause_text(content, decl)
+            if decl.module == 'react' and clause.startswith('{') and clause.endswith('}'):
+                named_imports = clause[1:-1].strip()
+                replacement = f"import React, {{ {named_imports} }} from 'react';"
+                return apply_edits(content, [(decl.start, decl.end, replacement)]), True
+
+        # Insert new React import before first import
+        insert_at = _line_start(content, declarations[0].start)
+        return content[:insert_at] + "import React from 'react';\n" + content[insert_at:], True
+
+    @staticmethod
+    def convert_component_declaration(content: str) -> Tuple[str, bool]:
         """Convert React.FC arrow function to function declaration."""
         # Pattern: export const ComponentName: React.FC<Props> = ({ props }) => {
         pattern = r'export\s+const\s+(\w+):\s*React\.FC(?:<([^>]+)>)?\s*=\s*\(([^)]*)\)\s*=>\s*\{'
@@ -144,7 +139,7 @@ class ReactFCFixer:
             modified = False
 
             # Step 1: Add React import
-            content, import_added = self.add_react_import(content)
+            content, import_added = self.add_react_import(content, is_jsx_path(str(file_path)))
             if import_added:
                 modified = True
                 print(f"  ✓ Added React import")
@@ -218,6 +213,23 @@ class ReactFCFixer:
             print(f"   Review the changes and test thoroughly")
 
 
+@register("react-fc-import", extensions=tuple(INCLUDE_EXTENSIONS), depends=(ts_lexer.__file__,))
+def transform_quick(content: str, path: str) -> str:
+    """Codemod transform for --mode quick: add the missing React import."""
+    if not needs_react_import(content):
+        return content
+    return ReactFCFixer.add_react_import(content, is_jsx_path(path))[0]
+
+
+@register("react-fc-declaration", extensions=tuple(INCLUDE_EXTENSIONS), depends=(ts_lexer.__file__,))
+def transform_full(content: str, path: str) -> str:
+    """Codemod transform for --mode full: also convert React.FC arrows to functions."""
+    if not needs_react_import(content):
+        return content
+    content = ReactFCFixer.add_react_import(content, is_jsx_path(path))[0]
+    return ReactFCFixer.convert_component_declaration(content)[0]
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Fix React.FC import issues in TypeScript/React files",
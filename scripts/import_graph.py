@@ -0,0 +1,510 @@
+#!/usr/bin/env python3
+"""
+Project Import Graph
+====================
+
+Persistent index of who imports what across frontend/src and nextjs/src.
+Every module request - static imports and re-exports, `import type`, dynamic
+import(), require() and the route modules named in frontend/src/routes.ts -
+is resolved the way TypeScript does it: relative paths, the tsconfig `paths`
+aliases (@/*, @shared/ui/*, ...), extension and index-file lookup.
+
+The graph lives in SQLite under .temp/ and is updated incrementally: a run
+stats every source file, re-parses only new or modified ones and re-resolves
+requests only when the set of files (or a tsconfig) changed. Queries are
+indexed lookups:
+
+    with ImportGraph() as graph:
+        graph.update()
+        graph.importers("frontend/src/lib/cn.ts", transitive=True)
+        graph.dead_modules("nextjs")
+
+    python scripts/import_graph.py update
+    python scripts/import_graph.py importers frontend/src/lib/cn.ts --transitive
+    python scripts/import_graph.py deps nextjs/src/app/layout.tsx
+    python scripts/import_graph.py specifier @/shared/
+    python scripts/import_graph.py dead --project nextjs
+    python scripts/import_graph.py missing
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from codemod import REPO_ROOT, SOURCE_EXTENSIONS, iter_source_files
+from file_cache import content_digest
+from ts_lexer import clause_text, is_jsx_path, module_declarations, tokenize
+
+DEFAULT_GRAPH_PATH = REPO_ROOT / ".temp" / "import_graph.sqlite"
+
+# Extensions tried, in TypeScript's order, when a request omits one
+RESOLVE_EXTENSIONS = (".ts", ".tsx", ".d.ts", ".js", ".jsx", ".mjs", ".cjs", ".json")
+
+# Files that are entry points by convention rather than by being imported
+COMMON_ENTRY = re.compile(r'\.d\.ts$|\.(?:test|spec|stories)\.[jt]sx?$|(?:^|/)__tests__/')
+
+
+class Project(NamedTuple):
+    name: str
+    root: Path                   # directory holding tsconfig.json
+    source: Path                 # directory that is scanned
+    entries: re.Pattern          # matched against the path relative to `root`
+    route_config: Optional[str]  # file whose string literals name route modules
+    app_directory: Optional[str] # route module paths are relative to this
+
+
+PROJECTS = (
+    Project(
+        name="frontend",
+        root=REPO_ROOT / "frontend",
+        source=REPO_ROOT / "frontend" / "src",
+        entries=re.compile(r'^src/(?:root|entry\.client|entry\.server|routes|main|router)\.tsx?$'),
+        route_config="src/routes.ts",
+        app_directory="src",
+    ),
+    Project(
+        name="nextjs",
+        root=REPO_ROOT / "nextjs",
+        source=REPO_ROOT / "nextjs" / "src",
+        entries=re.compile(
+            r'^src/app/(?:.*/)?(?:page|layout|loading|error|global-error|not-found|template|default'
+            r'|route|opengraph-image|twitter-image|icon|apple-icon|sitemap|robots|manifest)\.[jt]sx?$'
+            r'|^src/(?:middleware|instrumentation)\.ts$'
+        ),
+        route_config=None,
+        app_directory=None,
+    ),
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    project TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS requests (
+    importer TEXT NOT NULL,
+    specifier TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    target TEXT,
+    status TEXT NOT NULL DEFAULT 'pending'
+);
+CREATE INDEX IF NOT EXISTS requests_importer ON requests (importer);
+CREATE INDEX IF NOT EXISTS requests_target ON requests (target);
+CREATE INDEX IF NOT EXISTS requests_specifier ON requests (specifier);
+"""
+
+_DYNAMIC_HINT = re.compile(r'\bimport\s*\(|\brequire\s*\(')
+_JSONC_NOISE = re.compile(r'"(?:[^"\\]|\\.)*"|//[^\n]*|/\*[\s\S]*?\*/|,(?=\s*[}\]])')
+
+
+def rel(path: os.PathLike) -> str:
+    """Repository-relative POSIX key for a path given absolute or relative to the repo"""
+    path = Path(path)
+    if not path.is_absolute():
+        path = REPO_ROOT / path
+    return Path(os.path.normpath(path)).relative_to(REPO_ROOT).as_posix()
+
+
+def load_tsconfig(path: Path) -> dict:
+    """tsconfig.json allows comments and trailing commas; strip them and parse"""
+    text = path.read_text(encoding="utf-8")
+    text = _JSONC_NOISE.sub(lambda m: m.group() if m.group().startswith('"') else "", text)
+    return json.loads(text)
+
+
+def module_requests(source: str, jsx: bool = True) -> List[Tuple[str, str]]:
+    """(specifier, kind) for every module the file asks for.
+
+    kind is 'import', 'type' (import type / export type), 'reexport',
+    'dynamic' (import(...)) or 'require'.
+    """
+    requests = []
+    for decl in module_declarations(source, jsx):
+        if decl.module is None:
+            continue
+        clause = clause_text(source, decl)
+        if clause.startswith("type ") or clause.startswith("type{"):
+            kind = "type"
+        else:
+            kind = "reexport" if decl.kind == "reexport" else "import"
+        requests.append((decl.module, kind))
+
+    if _DYNAMIC_HINT.search(source):
+        # import('x') / require('x') can sit anywhere, so this needs every token
+        window = []
+        for token in tokenize(source, jsx):
+            window.append(token)
+            if len(window) > 4:
+                del window[0]
+            if len(window) < 3 or window[-1].kind != "string":
+                continue
+            name, paren, string = window[-3:]
+            callee = source[name.start:name.end]
+            if (callee in ("import", "require") and source[paren.start:paren.end] == "("
+                    and name.kind == "name"):
+                if callee == "require" and len(window) == 4 and source[window[0].start:window[0].end] == ".":
+                    continue
+                requests.append((source[string.start + 1:string.end - 1],
+                                 "dynamic" if callee == "import" else "require"))
+    return requests
+
+
+class Resolver:
+    """Maps (importer, specifier) to a file the way TypeScript's bundler resolution does"""
+
+    def __init__(self, project: Project, files: Set[str]):
+        self.project = project
+        self.files = files
+        config = load_tsconfig(project.root / "tsconfig.json").get("compilerOptions", {})
+        self.base_url = (project.root / config.get("baseUrl", ".")).resolve()
+        exact, wildcard = {}, []
+        for pattern, targets in (config.get("paths") or {}).items():
+            if "*" in pattern:
+                prefix, _, suffix = pattern.partition("*")
+                wildcard.append((prefix, suffix, targets))
+            else:
+                exact[pattern] = targets
+        # TypeScript prefers the longest matching prefix
+        wildcard.sort(key=lambda entry: len(entry[0]), reverse=True)
+        self.exact = exact
+        self.wildcard = wildcard
+        self._cache: Dict[Tuple[str, str], Tuple[Optional[str], str]] = {}
+
+    def resolve(self, importer: str, specifier: str) -> Tuple[Optional[str], str]:
+        """(target, status); status is 'resolved', 'asset', 'external' or 'missing'"""
+        relative = specifier.startswith((".", "/"))
+        key = (importer.rpartition("/")[0] if relative else "", specifier)
+        cached = self._cache.get(key)
+        if cached is None:
+            cached = self._cache[key] = self._resolve(importer, specifier, relative)
+        return cached
+
+    def _resolve(self, importer: str, specifier: str, relative: bool) -> Tuple[Optional[str], str]:
+        specifier = specifier.split("?", 1)[0]
+        if relative:
+            base = REPO_ROOT / importer
+            return self._lookup([base.parent / specifier])
+
+        candidates = self._alias_candidates(specifier)
+        if candidates is None:
+            return None, "external"
+        return self._lookup(candidates)
+
+    def _alias_candidates(self, specifier: str) -> Optional[List[Path]]:
+        if specifier in self.exact:
+            return [self.base_url / target for target in self.exact[specifier]]
+        for prefix, suffix, targets in self.wildcard:
+            if specifier.startswith(prefix) and specifier.endswith(suffix) \
+                    and len(specifier) >= len(prefix) + len(suffix):
+                star = specifier[len(prefix):len(specifier) - len(suffix)]
+                return [self.base_url / target.replace("*", star) for target in targets]
+        return None
+
+    def _lookup(self, candidates: Iterable[Path]) -> Tuple[Optional[str], str]:
+        for candidate in candidates:
+            base = os.path.normpath(candidate)
+            try:
+                key = Path(base).relative_to(REPO_ROOT).as_posix()
+            except ValueError:
+                continue
+            if key in self.files:
+                return key, "resolved"
+            for ext in RESOLVE_EXTENSIONS:
+                if key + ext in self.files:
+                    return key + ext, "resolved"
+            stem, ext = os.path.splitext(key)
+            if ext in (".js", ".jsx", ".mjs", ".cjs"):
+                # ESM-style `./x.js` naming the TypeScript source x.ts
+                for ts_ext in (".ts", ".tsx", ".mts", ".cts"):
+                    if stem + ts_ext in self.files:
+                        return stem + ts_ext, "resolved"
+            for ext in RESOLVE_EXTENSIONS:
+                if f"{key}/index{ext}" in self.files:
+                    return f"{key}/index{ext}", "resolved"
+            # CSS, images, or sources outside the scanned roots (frontend/rendering):
+            # real files that are not part of the graph
+            for suffix in ("", *RESOLVE_EXTENSIONS, *(f"/index{ext}" for ext in RESOLVE_EXTENSIONS)):
+                if os.path.isfile(base + suffix):
+                    return key + suffix, "asset"
+        return None, "missing"
+
+
+class ImportGraph:
+    """SQLite-backed import graph over the projects' source trees"""
+
+    def __init__(self, path: os.PathLike = DEFAULT_GRAPH_PATH, projects: Iterable[Project] = PROJECTS):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.projects = list(projects)
+        self.db = sqlite3.connect(str(self.path))
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str):
+        self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    # -- building --------------------------------------------------------
+
+    def update(self, verbose: bool = False) -> Dict[str, int]:
+        """Bring the graph up to date with the working tree; returns what changed"""
+        started = time.perf_counter()
+        version = self._code_version()
+        if self._meta("version") != version:
+            # Parser or resolver changed: everything must be re-read
+            self.db.execute("DELETE FROM files")
+            self.db.execute("DELETE FROM requests")
+            self._set_meta("version", version)
+
+        scanned: Dict[str, Tuple[str, int, int]] = {}
+        for project in self.projects:
+            for path in iter_source_files([project.source], SOURCE_EXTENSIONS):
+                st = os.stat(path)
+                scanned[rel(path)] = (project.name, st.st_mtime_ns, st.st_size)
+
+        known = {path: (mtime_ns, size) for path, mtime_ns, size in
+                 self.db.execute("SELECT path, mtime_ns, size FROM files")}
+        added = [path for path in scanned if path not in known]
+        removed = [path for path in known if path not in scanned]
+        modified = [path for path in scanned if path in known and known[path] != scanned[path][1:]]
+
+        stale = removed + modified
+        self.db.executemany("DELETE FROM requests WHERE importer = ?", ((p,) for p in stale))
+        self.db.executemany("DELETE FROM files WHERE path = ?", ((p,) for p in removed))
+
+        for path in added + modified:
+            project, mtime_ns, size = scanned[path]
+            try:
+                content = (REPO_ROOT / path).read_text(encoding="utf-8")
+            except (OSError, UnicodeDecodeError):
+                content = ""
+            self.db.executemany(
+                "INSERT INTO requests (importer, specifier, kind) VALUES (?, ?, ?)",
+                ((path, specifier, kind) for specifier, kind in self._requests(project, path, content)),
+            )
+            self.db.execute(
+                "INSERT OR REPLACE INTO files (path, project, mtime_ns, size) VALUES (?, ?, ?, ?)",
+                (path, project, mtime_ns, size),
+            )
+
+        configs_changed = False
+        for project in self.projects:
+            digest = content_digest((project.root / "tsconfig.json").read_bytes())
+            if self._meta(f"tsconfig:{project.name}") != digest:
+                self._set_meta(f"tsconfig:{project.name}", digest)
+                configs_changed = True
+
+        # New or deleted files can change what any existing request resolves to
+        everything = bool(added or removed or configs_changed)
+        resolved = self._resolve(scanned, everything)
+        self.db.commit()
+
+        stats = {
+            "files": len(scanned), "added": len(added), "modified": len(modified),
+            "removed": len(removed), "resolved": resolved,
+            "ms": round((time.perf_counter() - started) * 1000),
+        }
+        if verbose:
+            print(f"✓ Graph updated: {stats['files']} files "
+                  f"(+{stats['added']} ~{stats['modified']} -{stats['removed']}), "
+                  f"{stats['resolved']} requests resolved in {stats['ms']}ms")
+        return stats
+
+    def _code_version(self) -> str:
+        data = b""
+        for source in (__file__, Path(__file__).with_name("ts_lexer.py")):
+            data += Path(source).read_bytes()
+        return content_digest(data)[:12]
+
+    def _requests(self, project: str, path: str, content: str) -> List[Tuple[str, str]]:
+        requests = module_requests(content, is_jsx_path(path))
+        config = next(p for p in self.projects if p.name == project)
+        if config.route_config and path == rel(config.root / config.route_config):
+            # Route modules are named by path, relative to the app directory
+            app_dir = rel(config.root / config.app_directory)
+            for token in tokenize(content, is_jsx_path(path)):
+                if token.kind != "string":
+                    continue
+                value = content[token.start + 1:token.end - 1]
+                if value.endswith(SOURCE_EXTENSIONS):
+                    relative = os.path.relpath(f"{app_dir}/{value}", os.path.dirname(path))
+                    requests.append(("./" + Path(relative).as_posix(), "route"))
+        return requests
+
+    def _resolve(self, scanned: Dict[str, Tuple[str, int, int]], everything: bool) -> int:
+        files = set(scanned)
+        resolvers = {project.name: Resolver(project, files) for project in self.projects}
+        where = "" if everything else "WHERE status = 'pending'"
+        rows = self.db.execute(f"SELECT rowid, importer, specifier FROM requests {where}").fetchall()
+        updates = []
+        for rowid, importer, specifier in rows:
+            resolver = resolvers[scanned[importer][0]]
+            target, status = resolver.resolve(importer, specifier)
+            updates.append((target, status, rowid))
+        self.db.executemany("UPDATE requests SET target = ?, status = ? WHERE rowid = ?", updates)
+        return len(updates)
+
+    # -- queries ---------------------------------------------------------
+
+    def importers(self, path: os.PathLike, transitive: bool = False) -> List[str]:
+        """Files that import `path` (directly, or through any chain with transitive=True)"""
+        if not transitive:
+            rows = self.db.execute(
+                "SELECT DISTINCT importer FROM requests WHERE target = ? ORDER BY importer", (rel(path),))
+        else:
+            rows = self.db.execute("""
+                WITH RECURSIVE dependents(path) AS (
+                    SELECT importer FROM requests WHERE target = ?
+                    UNION
+                    SELECT r.importer FROM requests r JOIN dependents d ON r.target = d.path
+                )
+                SELECT path FROM dependents ORDER BY path
+            """, (rel(path),))
+        return [row[0] for row in rows]
+
+    def dependencies(self, path: os.PathLike, transitive: bool = False) -> List[str]:
+        """Source files `path` imports (directly, or through any chain with transitive=True)"""
+        if not transitive:
+            rows = self.db.execute(
+                "SELECT DISTINCT target FROM requests WHERE importer = ? AND status = 'resolved' "
+                "ORDER BY target", (rel(path),))
+        else:
+            rows = self.db.execute("""
+                WITH RECURSIVE deps(path) AS (
+                    SELECT target FROM requests WHERE importer = ? AND status = 'resolved'
+                    UNION
+                    SELECT r.target FROM requests r JOIN deps d ON r.importer = d.path
+                    WHERE r.status = 'resolved'
+                )
+                SELECT path FROM deps ORDER BY path
+            """, (rel(path),))
+        return [row[0] for row in rows]
+
+    def importers_of_specifier(self, prefix: str) -> Dict[str, List[str]]:
+        """{importer: [specifiers]} for requests whose specifier starts with `prefix`"""
+        # Range scan on the specifier index instead of LIKE, which ignores it
+        rows = self.db.execute(
+            "SELECT importer, specifier FROM requests WHERE specifier >= ? AND specifier < ? "
+            "ORDER BY importer", (prefix, prefix + "\uffff"))
+        result: Dict[str, List[str]] = defaultdict(list)
+        for importer, specifier in rows:
+            result[importer].append(specifier)
+        return dict(result)
+
+    def missing(self) -> List[Tuple[str, str]]:
+        """(importer, specifier) for local requests that resolve to nothing"""
+        return self.db.execute(
+            "SELECT importer, specifier FROM requests WHERE status = 'missing' "
+            "ORDER BY importer, specifier").fetchall()
+
+    def entry_points(self, project: Optional[str] = None) -> List[str]:
+        entries = []
+        for config in self.projects:
+            if project and config.name != project:
+                continue
+            prefix = rel(config.root) + "/"
+            for (path,) in self.db.execute("SELECT path FROM files WHERE project = ?", (config.name,)):
+                local = path[len(prefix):]
+                if config.entries.search(local) or COMMON_ENTRY.search(local):
+                    entries.append(path)
+        return sorted(entries)
+
+    def dead_modules(self, project: Optional[str] = None) -> List[str]:
+        """Source files no entry point reaches through any chain of imports"""
+        edges: Dict[str, List[str]] = defaultdict(list)
+        for importer, target in self.db.execute(
+                "SELECT importer, target FROM requests WHERE status = 'resolved'"):
+            edges[importer].append(target)
+
+        reachable = set(self.entry_points())
+        stack = list(reachable)
+        while stack:
+            for target in edges.get(stack.pop(), ()):
+                if target not in reachable:
+                    reachable.add(target)
+                    stack.append(target)
+
+        query = "SELECT path FROM files" + (" WHERE project = ?" if project else "") + " ORDER BY path"
+        return [path for (path,) in self.db.execute(query, (project,) if project else ())
+                if path not in reachable]
+
+    def stats(self) -> Dict[str, int]:
+        counts = dict(self.db.execute("SELECT status, COUNT(*) FROM requests GROUP BY status"))
+        counts["files"] = self.db.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+        return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the project import graph")
+    parser.add_argument("--graph", default=str(DEFAULT_GRAPH_PATH), help="Graph database path")
+    parser.add_argument("--no-update", action="store_true",
+                        help="Query the stored graph without checking the tree for changes")
+    sub = parser.add_subparsers(dest="command")
+    sub.add_parser("update", help="Update the graph and print a summary")
+    for name, help_text in (("importers", "Files that import PATH"), ("deps", "Files PATH imports")):
+        command = sub.add_parser(name, help=help_text)
+        command.add_argument("path")
+        command.add_argument("--transitive", action="store_true", help="Follow chains of imports")
+    command = sub.add_parser("specifier", help="Files with a module request starting with PREFIX")
+    command.add_argument("prefix")
+    command = sub.add_parser("dead", help="Modules no entry point reaches")
+    command.add_argument("--project", choices=[p.name for p in PROJECTS])
+    sub.add_parser("missing", help="Local imports that resolve to nothing")
+    args = parser.parse_args()
+
+    with ImportGraph(args.graph) as graph:
+        if not args.no_update or args.command in (None, "update"):
+            graph.update(verbose=True)
+
+        started = time.perf_counter()
+        if args.command == "importers":
+            results = graph.importers(args.path, args.transitive)
+        elif args.command == "deps":
+            results = graph.dependencies(args.path, args.transitive)
+        elif args.command == "specifier":
+            results = [f"{path}: {', '.join(specs)}"
+                       for path, specs in graph.importers_of_specifier(args.prefix).items()]
+        elif args.command == "dead":
+            results = graph.dead_modules(args.project)
+        elif args.command == "missing":
+            results = [f"{importer}: {specifier}" for importer, specifier in graph.missing()]
+        else:
+            for key, value in sorted(graph.stats().items()):
+                print(f"  {key}: {value}")
+            return 0
+        elapsed = (time.perf_counter() - started) * 1000
+
+        for line in results:
+            print(line)
+        print(f"\n{len(results)} result(s) in {elapsed:.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -11,6 +11,9 @@ Requirements from spec:
 - Input validation
 - Data normalization
 - Stable contracts
+
+Uses the import graph (scripts/import_graph.py) to list, per migrated file,
+the modules whose imports have to be updated.
 """
 
 import os
@@ -19,6 +22,8 @@ from pathlib import Path
 from typing import Dict, List, Set
 from dataclasses import dataclass
 
+from import_graph import ImportGraph
+
 @dataclass
 class ApiMethod:
     """Represents an API method to migrate"""
@@ -45,6 +50,8 @@ class EnterpriseMigrator:
         self.target_dir = Path(target_dir)
         self.normalization_dir = Path(normalization_dir)
         self.domains_processed = set()
+        self.graph = None
+        self.importers_to_update: Dict[str, List[str]] = {}
 
     def scan_api_files(self) -> List[Path]:
         """Find all API service files"""
@@ -316,6 +323,16 @@ export function denormalize{domain.title()}(frontend: unknown): Backend{domain.t
                 f.write(normalizer_stub)
             print(f"  ✓ Generated normalizer: {normalizer_file}")
 
+        if self.graph is not None:
+            try:
+                importers = self.graph.importers(file_path)
+            except ValueError:
+                # Outside the repository the graph indexes
+                importers = []
+            if importers:
+                self.importers_to_update[str(file_path)] = importers
+                print(f"  Imported by {len(importers)} file(s)")
+
         self.domains_processed.add(domain)
 
     def run(self) -> None:
@@ -332,11 +349,14 @@ export function denormalize{domain.title()}(frontend: unknown): Backend{domain.t
         print(f"\nFound {len(api_files)} API files")
 
         # Migrate each file
-        for file_path in sorted(api_files):
-            try:
-                self.migrate_domain(file_path)
-            except Exception as e:
-                print(f"  ✗ Error: {e}")
+        with ImportGraph() as self.graph:
+            self.graph.update(verbose=True)
+            for file_path in sorted(api_files):
+                try:
+                    self.migrate_domain(file_path)
+                except Exception as e:
+                    print(f"  ✗ Error: {e}")
+        self.graph = None
 
         print(f"\n{'=' * 60}")
         print(f"Migration complete!")
@@ -345,6 +365,10 @@ export function denormalize{domain.title()}(frontend: unknown): Backend{domain.t
         print(f"1. Review generated files in {self.target_dir}")
         print(f"2. Complete TODO items (validation, normalization)")
         print(f"3. Update imports in components/loaders")
+        for api_file, importers in sorted(self.importers_to_update.items()):
+            print(f"   {api_file}:")
+            for importer in importers:
+                print(f"     - {importer}")
         print(f"4. Run tests")
         print(f"5. Remove old api/ directory once migration verified")
 
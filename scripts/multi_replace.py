@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Single-Pass Replacement Tables
+==============================
+
+The theme migrators apply an ordered list of (pattern, replacement) rules by
+calling re.sub once per rule, rescanning every file 30+ times. A
+ReplacementTable compiles the same ordered list into as few scans as possible
+while producing exactly what the sequential re.sub chain would:
+
+  * Consecutive "literal" rules - a plain string optionally wrapped in
+    one-character assertions such as \\b, (?!\\d) or (?<!-), with a plain
+    string replacement - are merged into one stage: a trie-shaped regex with a
+    dict dispatching each match to its replacement.
+  * A rule only joins the current stage when it is provably independent of
+    every rule already in it: their matches can never overlap, no earlier
+    replacement can produce text a later rule would match, and no earlier
+    replacement changes what a neighbouring match's assertions see.
+    Anything else starts a new stage.
+  * Everything else (character classes, quantifiers, group references in the
+    replacement, callables) runs as its own stage, exactly like re.sub, but is
+    skipped outright when any literal the pattern requires is absent.
+
+Usage:
+    table = ReplacementTable([(r'\\bbg-white\\b', 'bg-surface'), ...])
+    new_content, count = table.subn(content)
+"""
+
+import re
+from typing import Callable, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+try:
+    from re import _constants as sre_constants, _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants
+    import sre_parse
+
+Replacement = Union[str, Callable[[re.Match], str]]
+
+# One-character lookarounds and word boundaries allowed around a literal rule
+_ASSERTION = r'\\[bB]|\(\?<?[=!](?:[^()\\]|\\.)+\)'
+_LITERAL = r'(?:[^\\.^$*+?{}\[\]|()]|\\[^A-Za-z0-9])+'
+_SIMPLE_RULE_RE = re.compile(
+    rf'(?P<lead>(?:{_ASSERTION})*)(?P<core>{_LITERAL})(?P<trail>(?:{_ASSERTION})*)'
+)
+_ASSERTION_RE = re.compile(_ASSERTION)
+
+# Neighbouring characters tried when checking whether two rules interact:
+# empty (start/end of text), space, quote, word, digit, underscore, dash
+_CONTEXT_CHARS = ('', ' ', '"', 'a', 'Z', '0', '_', '-', ':', '[', ']', '\n')
+
+
+class Rule(NamedTuple):
+    pattern: str
+    replacement: Replacement
+    regex: re.Pattern
+    lead: str = ''
+    core: Optional[str] = None
+    trail: str = ''
+    required: Tuple[str, ...] = ()
+
+    @property
+    def literal(self) -> bool:
+        return self.core is not None
+
+
+def _required_literals(parsed) -> Tuple[str, ...]:
+    """Runs of characters every match of the parsed pattern must contain"""
+    runs, run = [], []
+    for op, av in parsed:
+        if op is sre_constants.LITERAL:
+            run.append(chr(av))
+            continue
+        if op in (sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            continue  # zero-width: the literal run continues across it
+        if run:
+            runs.append(''.join(run))
+        run = []
+    if run:
+        runs.append(''.join(run))
+    # Longest first: the most selective check usually fails fastest
+    return tuple(sorted(runs, key=len, reverse=True))
+
+
+def _assertions_ok(source: str) -> bool:
+    """True when `source` is only \\b/\\B and one-character lookarounds"""
+    for item in _ASSERTION_RE.findall(source):
+        if item in (r'\b', r'\B'):
+            continue
+        (op, av), = sre_parse.parse(item)
+        if op not in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            return False
+        if av[1].getwidth() != (1, 1):
+            return False
+    return True
+
+
+def make_rule(pattern: str, replacement: Replacement, flags: int = 0) -> Rule:
+    regex = re.compile(pattern, flags)
+    parsed = sre_parse.parse(pattern, flags)
+    required = () if flags & re.IGNORECASE else _required_literals(parsed)
+
+    simple = _SIMPLE_RULE_RE.fullmatch(pattern)
+    if (simple and not flags & (re.IGNORECASE | re.VERBOSE)
+            and isinstance(replacement, str) and '\\' not in replacement
+            and _assertions_ok(simple.group('lead') + simple.group('trail'))):
+        core = re.sub(r'\\(.)', r'\1', simple.group('core'))
+        return Rule(pattern, replacement, regex, simple.group('lead'), core,
+                    simple.group('trail'), required)
+    return Rule(pattern, replacement, regex, required=required)
+
+
+def _alignments(a: str, b: str):
+    """Yield (text, offset_a, offset_b) for every way `a` and `b` can share characters"""
+    for shift in range(-(len(b) - 1), len(a)):
+        start = min(0, shift)
+        end = max(len(a), shift + len(b))
+        chars = [None] * (end - start)
+        consistent = True
+        for i, ch in enumerate(a):
+            chars[i - start] = ch
+        for i, ch in enumerate(b):
+            slot = shift + i - start
+            if chars[slot] is not None and chars[slot] != ch:
+                consistent = False
+                break
+            chars[slot] = ch
+        if consistent:
+            yield ''.join(chars), -start, shift - start
+
+
+def _placements(replacement: str, core: str):
+    """Like _alignments, but an empty replacement may sit anywhere inside `core`"""
+    if replacement:
+        yield from _alignments(replacement, core)
+    else:
+        for split in range(len(core) + 1):
+            yield core, split, 0
+
+
+def _matches_at(rule: Rule, text: str, pos: int, length: int) -> bool:
+    match = rule.regex.match(text, pos)
+    return match is not None and match.end() == pos + length
+
+
+def _context_pairs(rules: Sequence[Rule]):
+    chars = set(_CONTEXT_CHARS)
+    for rule in rules:
+        for text in (rule.core, rule.replacement):
+            if text:
+                chars.update((text[0], text[-1]))
+        for ch in rule.lead + rule.trail:
+            if not ch.isalnum():
+                chars.add(ch)
+    chars = sorted(chars)
+    return [(left, right) for left in chars for right in chars]
+
+
+def independent(earlier: Rule, later: Rule, contexts=None) -> bool:
+    """True when applying `earlier` then `later` equals applying both in one scan"""
+    contexts = contexts or _context_pairs((earlier, later))
+    a, b = earlier, later
+
+    # Matches of the two rules must never overlap in the original text
+    for text, pos_a, pos_b in _alignments(a.core, b.core):
+        for left, right in contexts:
+            full = left + text + right
+            if (_matches_at(a, full, len(left) + pos_a, len(a.core))
+                    and _matches_at(b, full, len(left) + pos_b, len(b.core))):
+                return False
+
+    # The earlier replacement must not produce (part of) a later match
+    for text, pos_out, pos_b in _placements(a.replacement, b.core):
+        original = text[:pos_out] + a.core + text[pos_out + len(a.replacement):]
+        for left, right in contexts:
+            if (_matches_at(a, left + original + right, len(left) + pos_out, len(a.core))
+                    and _matches_at(b, left + text + right, len(left) + pos_b, len(b.core))):
+                return False
+
+    # Nor change what the later rule's assertions see next to it
+    for left, right in contexts:
+        before = left + a.core + b.core + right
+        after = left + a.replacement + b.core + right
+        if _matches_at(a, before, len(left), len(a.core)):
+            if (_matches_at(b, before, len(left) + len(a.core), len(b.core))
+                    != _matches_at(b, after, len(left) + len(a.replacement), len(b.core))):
+                return False
+
+        before = left + b.core + a.core + right
+        after = left + b.core + a.replacement + right
+        if _matches_at(a, before, len(left) + len(b.core), len(a.core)):
+            if (_matches_at(b, before, len(left), len(b.core))
+                    != _matches_at(b, after, len(left), len(b.core))):
+                return False
+
+    return True
+
+
+def _trie_pattern(entries: Iterable[Tuple[str, str]]) -> str:
+    """Alternation of literal `core`s, factored as a trie, each followed by its `trail`"""
+    root = {}
+    for core, trail in entries:
+        node = root
+        for ch in core:
+            node = node.setdefault(ch, {})
+        node[None] = trail
+
+    def emit(node):
+        branches = [re.escape(ch) + emit(child)
+                    for ch, child in sorted((k, v) for k, v in node.items() if k is not None)]
+        if None in node:
+            branches.append(node[None])
+        if len(branches) == 1:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+
+    return emit(root)
+
+
+class Stage:
+    """One scan over the text: a merged group of literal rules, or a single rule"""
+
+    def __init__(self, rules: List[Rule]):
+        self.rules = rules
+        if len(rules) == 1:
+            rule = rules[0]
+            self.regex = rule.regex
+            self.replacement = rule.replacement
+            self.required = rule.required
+            return
+
+        self.lookup = {rule.core: rule.replacement for rule in rules}
+        groups = {}
+        for rule in rules:
+            groups.setdefault(rule.lead, []).append((rule.core, rule.trail))
+        alternatives = [lead + _trie_pattern(entries) for lead, entries in groups.items()]
+        pattern = alternatives[0] if len(alternatives) == 1 else '(?:' + '|'.join(alternatives) + ')'
+        if groups.keys() != {''}:
+            # A leading assertion hides the first character from the regex
+            # engine's prefix scan; a lookahead on it restores the fast skip
+            first_chars = ''.join(sorted({re.escape(rule.core[0]) for rule in rules}))
+            pattern = f'(?=[{first_chars}])' + pattern
+        self.regex = re.compile(pattern)
+        self.replacement = self._dispatch
+        self.required = ()
+
+    def _dispatch(self, match: re.Match) -> str:
+        return self.lookup[match.group()]
+
+    def subn(self, text: str) -> Tuple[str, int]:
+        if not all(literal in text for literal in self.required):
+            return text, 0
+        return self.regex.subn(self.replacement, text)
+
+    def count(self, text: str) -> int:
+        if not all(literal in text for literal in self.required):
+            return 0
+        return sum(1 for _ in self.regex.finditer(text))
+
+
+class ReplacementTable:
+    """Ordered (pattern, replacement) rules applied with as few scans as possible"""
+
+    def __init__(self, rules: Iterable[Tuple[str, Replacement]], flags: int = 0):
+        self.rules = [make_rule(pattern, replacement, flags) for pattern, replacement in rules]
+        contexts = _context_pairs([rule for rule in self.rules if rule.literal])
+        self.stages: List[Stage] = []
+
+        current: List[Rule] = []
+        for rule in self.rules:
+            if (rule.literal and current and current[-1].literal
+                    and all(prev.core != rule.core for prev in current)
+                    and all(independent(prev, rule, contexts) for prev in current)):
+                current.append(rule)
+                continue
+            if current:
+                self.stages.append(Stage(current))
+            current = [rule]
+        if current:
+            self.stages.append(Stage(current))
+
+    def subn(self, text: str) -> Tuple[str, int]:
+        total = 0
+        for stage in self.stages:
+            text, count = stage.subn(text)
+            total += count
+        return text, total
+
+    def sub(self, text: str) -> str:
+        return self.subn(text)[0]
+
+    def count(self, text: str) -> int:
+        """Total matches of every rule in `text` as given, without applying any"""
+        return sum(stage.count(text) for stage in self.stages)
+
+    def describe(self) -> str:
+        return (f"{len(self.rules)} rules in {len(self.stages)} scans "
+                f"({', '.join(str(len(stage.rules)) for stage in self.stages)})")
+
+
+def sequential_subn(rules: Iterable[Tuple[str, Replacement]], text: str, flags: int = 0) -> Tuple[str, int]:
+    """Reference semantics: one re.subn per rule, in order"""
+    total = 0
+    for pattern, replacement in rules:
+        text, count = re.subn(pattern, replacement, text, flags=flags)
+        total += count
+    return text, total
@@ -1,17 +1,20 @@
 import os
 import re
 
+from codemod import register, run
+
 TARGET_DIR = "nextjs/src/app/api"
 HEADER_IMPORT = 'import { CORS_HEADERS, SECURITY_HEADERS } from "@/lib/api-headers";'
 
-def process_file(file_path):
-    with open(file_path, "r") as f:
-        content = f.read()
+@register("api-headers", filenames=("route.ts",))
+def transform(content, file_path):
+    # Only API route handlers carry the duplicated header constants
+    if "/app/api/" not in file_path.replace(os.sep, "/"):
+        return content
 
     # Check if already refactored
     if '@/lib/api-headers' in content:
-        print(f"Skipping {file_path} (already refactored)")
-        return
+        return content
 
     # Check for body.title validation
     if 'if (!body.title' in content:
@@ -39,19 +42,23 @@ def process_file(file_path):
     new_content = '\n'.join(lines)
     new_content = re.sub(r'\n{3,}', '\n\n', new_content)
 
-    with open(file_path, "w") as f:
-        f.write(new_content)
-    print(f"Updated {file_path}")
+    return new_content
 
 def main():
     if not os.path.exists(TARGET_DIR):
         print(f"Directory {TARGET_DIR} not found.")
         return
 
-    for root, dirs, files in os.walk(TARGET_DIR):
-        for file in files:
-            if file == "route.ts":
-                process_file(os.path.join(root, file))
+    def report(file_path, changed_by, error):
+        if error:
+            print(f"Error processing {file_path}: {error}")
+        elif changed_by:
+            print(f"Updated {file_path}")
+        else:
+            # Cache hits and non-API routes also land here, not just refactored files
+            print(f"Skipping {file_path} (unchanged)")
+
+    run(["api-headers"], roots=[TARGET_DIR], on_result=report)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Run Registered Codemods - Single Pass
+=====================================
+
+Loads the rewrite scripts that register transforms with scripts/codemod.py,
+then applies the selected transforms (in the order given) to frontend/src and
+nextjs/src in one walk, one read per file, across a process pool. Files the
+selected transforms already left unchanged are remembered in the per-file
+cache under .temp/ and skipped on later runs until they or the transform
+scripts change.
+
+Usage:
+  python scripts/run_codemods.py --list
+  python scripts/run_codemods.py css-vars refactor-imports --dry-run
+  python scripts/run_codemods.py comment-separators react-fc-import --apply
+  python scripts/run_codemods.py api-headers --root nextjs/src/app/api --apply
+"""
+
+import argparse
+import os
+import sys
+
+import codemod
+from codemod import DEFAULT_ROOTS, REGISTRY, REPO_ROOT
+from file_cache import FileCache
+
+# Scripts that register transforms, relative to the repository root
+TRANSFORM_SCRIPTS = [
+    "archived/migrate_to_css_vars.py",
+    "archived/migrate_imports.py",
+    "archived/update_imports_refactor.py",
+    "archived/migrate_final_imports.py",
+    "archived/fix_comments.py",
+    "scripts/fix-react-fc-imports.py",
+    "scripts/refactor_routes.py",
+    "frontend/scripts/fix_react_imports.py",
+]
+
+
+def load_transforms():
+    for script in TRANSFORM_SCRIPTS:
+        codemod.load_script(str(REPO_ROOT / script))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply registered codemod transforms in a single pass")
+    parser.add_argument("transforms", nargs="*", help="Transform names, applied in this order")
+    parser.add_argument("--list", action="store_true", help="List the available transforms")
+    parser.add_argument("--root", action="append", dest="roots",
+                        help="Source root to walk (repeatable, default: frontend/src and nextjs/src)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument("--dry-run", action="store_true", help="Report changes without writing (default)")
+    parser.add_argument("--apply", action="store_true", help="Write changed files")
+    parser.add_argument("--verbose", action="store_true", help="Print every changed file")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Re-check every file instead of skipping ones known to be unchanged")
+    args = parser.parse_args()
+
+    load_transforms()
+
+    if args.list or not args.transforms:
+        print("Available transforms:")
+        for name, transform in sorted(REGISTRY.items()):
+            script = os.path.relpath(transform.script, REPO_ROOT)
+            print(f"  {name:<24} {script}")
+        return 0
+
+    unknown = [name for name in args.transforms if name not in REGISTRY]
+    if unknown:
+        print(f"ERROR: Unknown transform(s): {', '.join(unknown)}")
+        return 1
+
+    apply = args.apply and not args.dry_run
+    roots = args.roots or DEFAULT_ROOTS
+
+    print("=" * 60)
+    print(f"Transforms: {', '.join(args.transforms)}")
+    print(f"Roots:      {', '.join(str(r) for r in roots)}")
+    print(f"Dry Run:    {not apply}")
+    print("=" * 60)
+
+    def on_result(path, changed_by, error):
+        if args.verbose and changed_by:
+            print(f"  {'✓' if apply else '~'} {os.path.relpath(path, REPO_ROOT)} ({', '.join(changed_by)})")
+
+    cache = None if args.no_cache else FileCache()
+    try:
+        report = codemod.run(args.transforms, roots=roots, apply=apply,
+                             workers=args.workers, on_result=on_result, cache=cache)
+    finally:
+        if cache is not None:
+            cache.close()
+
+    print()
+    print(f"Files scanned:  {report.scanned} ({report.cached} unchanged since last run)")
+    print(f"Files changed:  {len(report.changed)}")
+    for name, count in report.counts().items():
+        print(f"  {name}: {count}")
+    print(f"Errors:         {len(report.errors)}")
+    for path, error in report.errors:
+        print(f"  ❌ {os.path.relpath(path, REPO_ROOT)}: {error}")
+    print(f"Elapsed:        {report.elapsed:.2f}s")
+
+    if not apply and report.changed:
+        print("\n⚠️  This was a DRY RUN - no files were modified")
+        print("   Run with --apply to make actual changes")
+
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+TypeScript / TSX Lexer
+======================
+
+The import rewriters used to find imports with per-line regexes, which also
+match inside comments, strings, template literals and JSX text, and miss
+declarations that span lines. This module tokenizes a file once - skipping
+comments, strings, template literals (including nested ${...}), regex
+literals and JSX text - and exposes the top-level import/export declarations
+as spans, so a rewrite becomes a list of span edits:
+
+    for decl in module_declarations(content):
+        if decl.kind == "import" and decl.module == "react":
+            edits.append((decl.start, decl.end, "import React from 'react';"))
+    content = apply_edits(content, edits)
+
+tokenize() is a generator, so callers that only need the start of a file can
+stop early without lexing the rest.
+"""
+
+import re
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+# Leading whitespace is folded into every token match; the token itself is
+# the named group that matched
+_JS_TOKEN = re.compile(r'''\s*(?:
+    (?P<comment>//[^\n]*|/\*[\s\S]*?(?:\*/|\Z))
+  | (?P<name>\#?(?:[^\W\d]|\$)(?:\w|\$)*)
+  | (?P<number>0[xXbBoO][\da-fA-F_]+n?|(?:\d[\d_]*(?:\.[\d_]*)?|\.\d[\d_]*)(?:[eE][+-]?\d+)?n?)
+  | (?P<string>"(?:[^"\\\n]|\\[\s\S])*"?|'(?:[^'\\\n]|\\[\s\S])*'?)
+  | (?P<template>`)
+  | (?P<open>\{)
+  | (?P<close>\})
+  | (?P<slash>/)
+  | (?P<lt><)
+  | (?P<punct>>>>=|\.\.\.|===|!==|\*\*=|>>=|>>>|&&=|\|\|=|\?\?=|=>|==|!=|>=|&&|\|\||\?\?
+              |\?\.(?!\d)|\+\+|--|[-+*%&|^]=|>>|\*\*|[-+*%&|^!~?:;,.()\[\]=>@])
+  | (?P<other>[\s\S])
+  | (?P<eof>\Z)
+)''', re.VERBOSE)
+
+# A run of tokens that cannot change the lexer's state (everything but braces,
+# `/`, `<` and backticks). Each group keeps its last match, which tells what
+# the run's final token was.
+_JS_RUN = re.compile(r'''(?:
+    \s+
+  | //[^\n]*|/\*[\s\S]*?(?:\*/|\Z)
+  | (?P<name>\#?(?:[^\W\d]|\$)(?:\w|\$)*)
+  | (?P<number>0[xXbBoO][\da-fA-F_]+n?|(?:\d[\d_]*(?:\.[\d_]*)?|\.\d[\d_]*)(?:[eE][+-]?\d+)?n?)
+  | (?P<string>"(?:[^"\\\n]|\\[\s\S])*"?|'(?:[^'\\\n]|\\[\s\S])*'?)
+  | (?P<punct>>>>=|\.\.\.|===|!==|\*\*=|>>=|>>>|&&=|\|\|=|\?\?=|=>|==|!=|>=|&&|\|\||\?\?
+              |\?\.(?!\d)|\+\+|--|[-+*%&|^]=|>>|\*\*|[-+*%&|^!~?:;,.()\[\]=>@])
+)*''', re.VERBOSE)
+_JSX_TAG_RUN = re.compile(r'''(?:\s+|//[^\n]*|/\*[\s\S]*?(?:\*/|\Z)|"[^"]*"|'[^']*'|[^\s=/<>{}"']+|=)*''')
+
+_TEMPLATE_CHUNK = re.compile(r'(?:[^`\\$]|\\[\s\S]|\$(?!\{))*(?P<stop>`|\$\{)?')
+_REGEX_LITERAL = re.compile(r'/(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*')
+_LT_OPERATOR = re.compile(r'<<=|<<|<=|<')
+
+# After `<` in expression position: a JSX element unless it reads as a generic
+# arrow function's type parameters (`<T,>`, `<T extends U>` or `<T = U>`)
+_JSX_START = re.compile(r'\s*(?:>|(?P<name>[^\W\d][\w$.:-]*)(?P<generic>\s*,|\s+extends\b|\s*=(?!>))?)')
+_JSX_TAG_TOKEN = re.compile(r'''
+    (?P<ws>\s+)
+  | (?P<comment>//[^\n]*|/\*[\s\S]*?(?:\*/|\Z))
+  | (?P<selfclose>/\s*>)
+  | (?P<end>>)
+  | (?P<open>\{)
+  | (?P<string>"[^"]*"?|'[^']*'?)
+  | (?P<typeargs><[^<>]*(?:<[^<>]*>[^<>]*)*>)
+  | (?P<name>[^\s=/<>{}"']+)
+  | (?P<punct>[\s\S])
+''', re.VERBOSE)
+_JSX_TEXT = re.compile(r'[^<{]+')
+_JSX_CLOSING = re.compile(r'<\s*/[^>]*>?')
+
+# Keywords after which `/` starts a regex and `<` starts JSX
+_EXPRESSION_KEYWORDS = frozenset({
+    'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete', 'void',
+    'throw', 'instanceof', 'yield', 'await', 'default',
+})
+_OPERAND_END = frozenset({')', ']', '}', '++', '--'})
+
+# Frame kinds on the lexer's mode stack
+_JS, _TEMPLATE, _JSX_TAG, _JSX_CHILDREN = range(4)
+
+_EXPORT_MODIFIERS = frozenset({
+    'default', 'declare', 'abstract', 'async', 'const', 'let', 'var', 'function',
+    'class', 'interface', 'type', 'enum', 'namespace', 'module', '*',
+})
+
+
+class Token(NamedTuple):
+    kind: str   # name, number, string, template, regex, punct, jsx_text, comment
+    start: int
+    end: int
+    depth: int  # 0 at module top level; braces, ${...} and JSX all nest
+
+
+class Declaration(NamedTuple):
+    kind: str                               # 'import', 'reexport' or 'export'
+    start: int
+    end: int                                # past the terminating ';' when there is one
+    clause: Tuple[int, int]                 # what is imported/exported, between keyword and `from`
+    module: Optional[str] = None            # module specifier without quotes
+    module_span: Optional[Tuple[int, int]] = None  # the specifier string including quotes
+    name: Optional[str] = None              # declared name of an 'export' declaration
+
+
+def tokenize(source: str, jsx: bool = True, comments: bool = False,
+             nested: bool = True) -> Iterator[Token]:
+    """Yield the tokens of `source`; whitespace is dropped and comments unless asked for.
+
+    With jsx=False (plain .ts), `<` is always an operator or type bracket.
+    With nested=False, ordinary tokens inside braces, ${...} and JSX are
+    skipped in bulk rather than yielded - much faster when only top-level
+    tokens matter. Brackets and template/JSX delimiters are still yielded.
+    """
+    pos = 0
+    length = len(source)
+    # Each frame is [kind, open braces]; the bottom frame is the module itself
+    stack = [[_JS, 0]]
+    depth = 0
+    expression_start = True
+
+    while pos < length:
+        frame = stack[-1]
+        mode = frame[0]
+
+        if mode == _JS:
+            if depth and not nested:
+                run = _JS_RUN.match(source, pos)
+                if run.end() > pos:
+                    # lastgroup is the group of the run's final token
+                    last = run.lastgroup
+                    if last is not None:
+                        value = run.group(last)
+                        if last == 'name':
+                            expression_start = value in _EXPRESSION_KEYWORDS
+                        elif last == 'punct':
+                            expression_start = value not in _OPERAND_END
+                        else:
+                            expression_start = False
+                    pos = run.end()
+                    if pos >= length:
+                        break
+
+            m = _JS_TOKEN.match(source, pos)
+            group = m.lastgroup
+            pos = m.start(group)
+            end = m.end()
+
+            if group == 'eof':
+                break
+            if group == 'comment':
+                if comments:
+                    yield Token('comment', pos, end, depth)
+                pos = end
+                continue
+            if group == 'name':
+                yield Token('name', pos, end, depth)
+                expression_start = source[pos:end] in _EXPRESSION_KEYWORDS
+            elif group in ('number', 'string'):
+                yield Token(group, pos, end, depth)
+                expression_start = False
+            elif group == 'open':
+                yield Token('punct', pos, end, depth)
+                frame[1] += 1
+                depth += 1
+                expression_start = True
+            elif group == 'close':
+                if frame[1] == 0 and len(stack) > 1:
+                    # End of a ${...} or JSX {...} expression
+                    stack.pop()
+                    depth -= 1
+                    if stack[-1][0] == _TEMPLATE:
+                        pos = _template_chunk(source, end, stack)
+                        yield Token('template', end - 1, pos, depth)
+                        if stack[-1][0] == _TEMPLATE:
+                            # The chunk closed the template
+                            stack.pop()
+                        else:
+                            depth += 1
+                        expression_start = False
+                        continue
+                    yield Token('punct', pos, end, depth)
+                    pos = end
+                    continue
+                if frame[1]:
+                    frame[1] -= 1
+                    depth -= 1
+                yield Token('punct', pos, end, depth)
+                expression_start = True
+            elif group == 'template':
+                stack.append([_TEMPLATE, 0])
+                end = _template_chunk(source, end, stack)
+                yield Token('template', pos, end, depth)
+                if stack[-1][0] == _TEMPLATE:
+                    stack.pop()
+                else:
+                    depth += 1
+                expression_start = False
+            elif group == 'slash':
+                regex = _REGEX_LITERAL.match(source, pos) if expression_start else None
+                if regex:
+                    end = regex.end()
+                    yield Token('regex', pos, end, depth)
+                    expression_start = False
+                else:
+                    if source.startswith('/=', pos):
+                        end = pos + 2
+                    yield Token('punct', pos, end, depth)
+                    expression_start = True
+            elif group == 'lt':
+                start = _JSX_START.match(source, end) if jsx and expression_start else None
+                if start and not _is_type_parameters(source, start):
+                    stack.append([_JSX_TAG, 0])
+                    depth += 1
+                    end = _skip_tag_name(source, start)
+                    yield Token('punct', pos, end, depth - 1)
+                    expression_start = False
+                else:
+                    end = _LT_OPERATOR.match(source, pos).end()
+                    yield Token('punct', pos, end, depth)
+                    expression_start = True
+            else:
+                yield Token('punct', pos, end, depth)
+                expression_start = source[pos:end] not in _OPERAND_END
+            pos = end
+
+        elif mode == _JSX_TAG:
+            if not nested:
+                pos = _JSX_TAG_RUN.match(source, pos).end()
+                if pos >= length:
+                    break
+            m = _JSX_TAG_TOKEN.match(source, pos)
+            group = m.lastgroup
+            end = m.end()
+            if group == 'ws' or group == 'typeargs':
+                pass
+            elif group == 'comment':
+                if comments:
+                    yield Token('comment', pos, end, depth)
+            elif group == 'end':
+                frame[0] = _JSX_CHILDREN
+                yield Token('punct', pos, end, depth)
+            elif group == 'selfclose':
+                stack.pop()
+                depth -= 1
+                yield Token('punct', pos, end, depth)
+                expression_start = False
+            elif group == 'open':
+                yield Token('punct', pos, end, depth)
+                stack.append([_JS, 0])
+                depth += 1
+                expression_start = True
+            else:
+                yield Token(group, pos, end, depth)
+            pos = end
+
+        elif mode == _JSX_CHILDREN:
+            ch = source[pos]
+            if ch == '{':
+                yield Token('punct', pos, pos + 1, depth)
+                stack.append([_JS, 0])
+                depth += 1
+                expression_start = True
+                pos += 1
+            elif ch == '<':
+                closing = _JSX_CLOSING.match(source, pos)
+                if closing:
+                    stack.pop()
+                    depth -= 1
+                    yield Token('punct', pos, closing.end(), depth)
+                    expression_start = False
+                    pos = closing.end()
+                else:
+                    start = _JSX_START.match(source, pos + 1)
+                    if not start:
+                        yield Token('jsx_text', pos, pos + 1, depth)
+                        pos += 1
+                        continue
+                    end = _skip_tag_name(source, start)
+                    stack.append([_JSX_TAG, 0])
+                    yield Token('punct', pos, end, depth)
+                    depth += 1
+                    pos = end
+            else:
+                end = _JSX_TEXT.match(source, pos).end()
+                yield Token('jsx_text', pos, end, depth)
+                pos = end
+
+        else:  # pragma: no cover - template frames are consumed eagerly
+            stack.pop()
+
+
+def _template_chunk(source: str, pos: int, stack: list) -> int:
+    """Consume template text from `pos`; on `${` push a JS frame. Returns the chunk end."""
+    m = _TEMPLATE_CHUNK.match(source, pos)
+    if m.group('stop') == '${':
+        stack.append([_JS, 0])
+    return m.end()
+
+
+def _is_type_parameters(source: str, start: re.Match) -> bool:
+    """`<T,>`, `<T extends U>`, `<T = U>` and single-letter `<T>` are type parameters, not JSX"""
+    if start.group('generic'):
+        return True
+    name = start.group('name')
+    return (name is not None and len(name) == 1 and name.isupper()
+            and source.startswith('>', start.end()))
+
+
+def _skip_tag_name(source: str, start: re.Match) -> int:
+    """End of a JSX opening `<Name` (or fragment `<`) whose rest matched _JSX_START"""
+    if start.group('name') is None:
+        # Fragment: leave the `>` for the tag frame
+        return start.end() - 1
+    return start.end('name')
+
+
+def module_declarations(source: str, jsx: bool = True) -> List[Declaration]:
+    """Top-level import and export declarations of `source`, in order.
+
+    Dynamic import(...) and import.meta are not declarations and are skipped.
+    """
+    tokens = list(tokenize(source, jsx, nested=False))
+    declarations = []
+    i = 0
+    count = len(tokens)
+
+    def text(index):
+        token = tokens[index]
+        return source[token.start:token.end]
+
+    while i < count:
+        token = tokens[i]
+        if token.depth or token.kind != 'name':
+            i += 1
+            continue
+        keyword = source[token.start:token.end]
+        if keyword not in ('import', 'export'):
+            i += 1
+            continue
+        if keyword == 'import' and i + 1 < count and text(i + 1) in ('(', '.'):
+            i += 1
+            continue
+
+        j = i + 1
+        if keyword == 'export' and j < count and text(j) not in ('{', '*', 'type'):
+            declarations.append(_export_declaration(source, tokens, i))
+            i += 1
+            continue
+        if keyword == 'export' and text(j) == 'type' and j + 1 < count and text(j + 1) != '{':
+            declarations.append(_export_declaration(source, tokens, i))
+            i += 1
+            continue
+
+        # import ... from 'x'; import 'x'; export { ... } [from 'x']; export * from 'x'
+        clause_start = tokens[j].start if j < count else token.end
+        clause_end = clause_start
+        module = module_span = None
+        while j < count:
+            t = tokens[j]
+            value = source[t.start:t.end]
+            if t.depth == 0 and value == ';':
+                break
+            if t.kind == 'string' and t.depth == 0:
+                previous = text(j - 1)
+                if previous in ('from', 'import'):
+                    module_span = (t.start, t.end)
+                    module = source[t.start + 1:t.end - 1]
+                    if previous == 'from':
+                        clause_end = tokens[j - 2].end if j - 2 > i else clause_start
+                    j += 1
+                    break
+            if t.depth == 0 and t.kind == 'name' and value in ('import', 'export') and j > i + 1:
+                # Missing terminator: stop before the next declaration
+                break
+            clause_end = t.end
+            j += 1
+            if value == '}' and t.depth == 0 and (j >= count or text(j) != 'from'):
+                # `export { a, b }` with no `from` and no ';'
+                break
+
+        end = tokens[j - 1].end if j > i + 1 else token.end
+        if j < count and text(j) == ';' and tokens[j].depth == 0:
+            end = tokens[j].end
+            j += 1
+        kind = keyword if module is None or keyword == 'import' else 'reexport'
+        declarations.append(Declaration(kind, token.start, end, (clause_start, clause_end),
+                                        module, module_span))
+        i = j
+
+    return declarations
+
+
+def _export_declaration(source: str, tokens: Sequence[Token], i: int) -> Declaration:
+    """`export const x`, `export default function f`, ...: the span covers the header only"""
+    j = i + 1
+    end = tokens[i].end
+    name = None
+    while j < len(tokens) and tokens[j].depth == 0:
+        token = tokens[j]
+        value = source[token.start:token.end]
+        if value in _EXPORT_MODIFIERS:
+            end = token.end
+            j += 1
+            continue
+        if token.kind == 'name':
+            name = value
+            end = token.end
+        break
+    return Declaration('export', tokens[i].start, end, (tokens[i].end, end), name=name)
+
+
+def imports(source: str, jsx: bool = True) -> List[Declaration]:
+    return [d for d in module_declarations(source, jsx) if d.kind == 'import']
+
+
+def clause_text(source: str, decl: Declaration) -> str:
+    return source[decl.clause[0]:decl.clause[1]].strip()
+
+
+def apply_edits(source: str, edits: Iterable[Tuple[int, int, str]]) -> str:
+    """Replace each (start, end) span with its text; spans must not overlap"""
+    parts = []
+    pos = 0
+    for start, end, replacement in sorted(edits, key=lambda e: (e[0], e[1])):
+        if start < pos:
+            raise ValueError(f"Overlapping edit at {start}")
+        parts.append(source[pos:start])
+        parts.append(replacement)
+        pos = end
+    parts.append(source[pos:])
+    return ''.join(parts)
+
+
+def is_jsx_path(path: str) -> bool:
+    return path.endswith(('.tsx', '.jsx', '.js'))